@@ -10,68 +10,177 @@ import os
 import sys
 import warnings
 
-from config import Config
-from license import SpdxLicenseList
-from news import NewsSection
+from build import LICENSES, NEWS, STATE, build_graph
 from project import ProjectSection
-from pydantic import ValidationError
-from redirect import RedirectSection
+from redirect import RedirectMap
+from search import check_indexes
+from serve import Refresher, WebhookServer
+from stages import load_config
+
+# Seconds, generous for projects on slow hosts.
+PROJECT_TIMEOUT = 300
+# Environment variable of the webhook secret.
+SECRET = 'COMPOSE_WEBHOOK_SECRET'
 
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',  # noqa: WPS323
 )
+# Warnings are logged when raised, since catching them is not thread-safe.
+warnings.simplefilter('always')
+warnings.showwarning = lambda message, *_: logging.warning(
+    'Warning: {0}'.format(message),
+)
 
 parser = argparse.ArgumentParser()
 parser.add_argument('config', type=str)
-args = parser.parse_args()
-
-logging.info("Loading configuration from '{0}'...".format(args.config))
-try:
-    with open(args.config, 'r') as config_file:
-        with warnings.catch_warnings(record=True) as warns:
-            warnings.simplefilter('always')
-            config = Config.from_yaml(config_file.read())
-            if warns:
-                for warn in warns:
-                    logging.warning('Warning: {0}'.format(warn.message))
-except (ValidationError, ValueError) as config_error:
-    logging.error('Failed to load configuration:\n{0}'.format(config_error))
-    sys.exit(1)
-
-logging.info("Loading SPDX license list from '{0}'...".format(config.licenses))
-try:
-    SpdxLicenseList.from_file(config.licenses)
-except (ValidationError, ValueError) as spdx_error:
-    logging.error('Failed to load SPDX license list:\n{0}'.format(spdx_error))
-    sys.exit(1)
-
-logging.info("Generating 'redirects' section...")
-redirects = RedirectSection.from_config(config.redirects)
-
-logging.info("Writing 'redirects' section...")
-redirects.write(os.path.join(config.sources, 'content/redirects'))
-
-logging.info("Generating 'projects' section...")
-with warnings.catch_warnings(record=True) as warns:
-    warnings.simplefilter('always')
-    projects = ProjectSection.from_config(config.projects)
-    if warns:
-        for warn in warns:
-            logging.warning('Warning: {0}'.format(
-                warn.message,
+parser.add_argument(
+    '--jobs',
+    type=int,
+    default=1,
+    help=(
+        'number of project worker processes, and of threads writing the '
+        'pages of a section and storing images'
+    ),
+)
+parser.add_argument(
+    '--processes',
+    action='store_true',
+    help=(
+        'with more than one job, also render pages in that many worker '
+        'processes before the threads write them'
+    ),
+)
+parser.add_argument(
+    '--front-matter',
+    choices=ProjectSection.front_matter_formats,
+    default='yaml',
+    help='front matter format of the pages, JSON being the fastest',
+)
+parser.add_argument(
+    '--content',
+    choices=('files', 'adapters'),
+    default='files',
+    help='write sections as a file per page or as Hugo content adapters',
+)
+parser.add_argument(
+    '--redirects',
+    choices=('pages', *RedirectMap.formats),
+    default='pages',
+    help='write redirects as Hugo pages or as a single compiled map',
+)
+parser.add_argument(
+    '--max-redirect-hops',
+    type=int,
+    default=3,
+    help='report redirect targets with longer redirect chains',
+)
+parser.add_argument(
+    '--collapse-redirects',
+    action='store_true',
+    help='redirect straight to the end of the redirect chains',
+)
+parser.add_argument(
+    '--related',
+    type=int,
+    default=3,
+    help='number of related projects listed by each project',
+)
+parser.add_argument(
+    '--news-retention',
+    type=int,
+    default=0,
+    help='number of newest news kept per project, all if 0',
+)
+parser.add_argument(
+    '--project-timeout',
+    type=float,
+    default=PROJECT_TIMEOUT,
+    help='seconds after which the worker of a project is killed',
+)
+parser.add_argument(
+    '--project-memory',
+    type=int,
+    default=1024,
+    help='MiB of memory the worker of a project may allocate',
+)
+parser.add_argument(
+    '--state',
+    metavar='PATH',
+    help='build state file, to only generate the pages of changed projects',
+)
+parser.add_argument(
+    '--remote-images',
+    action='store_true',
+    help='link images from their hosts instead of storing resized copies',
+)
+parser.add_argument(
+    '--check-search',
+    metavar='PUBLIC',
+    help='check the search indexes of a Hugo build and exit',
+)
+parser.add_argument(
+    '--serve',
+    metavar='[HOST]:PORT',
+    help='after the build, refresh projects on webhooks until interrupted',
+)
+parser.add_argument(
+    '--hugo',
+    metavar='PUBLIC',
+    help='in serve mode, build the site with Hugo after each refresh',
+)
+
+
+def main() -> None:
+    """Generate the content, then serve webhooks if requested."""
+    args = parser.parse_args()
+    if args.check_search:
+        _check_search(args.check_search)
+    refresher = _build(args)
+    if args.serve:
+        _serve(args.serve, refresher)
+
+
+def _check_search(public: str) -> None:
+    for index in (public, os.path.join(public, NEWS)):
+        logging.info("Checking '{0}' search index...".format(index))
+        try:
+            check_indexes(index)
+        except (KeyError, ValueError) as check_error:
+            logging.error('Search index check failed:\n{0}'.format(
+                check_error,
             ))
+            sys.exit(1)
+    sys.exit(0)
+
+
+def _build(args: argparse.Namespace) -> Refresher:
+    # The refresher keeps the configuration, build state and license list of
+    # the build.
+    try:
+        config = load_config(args.config)
+    except ValueError as config_error:
+        logging.error(config_error)
+        sys.exit(1)
+    graph = build_graph(config, args)
+    try:
+        outputs = graph.run()
+    except ValueError as build_error:
+        logging.error(build_error)
+        sys.exit(1)
+    logging.info('Build timing:\n{0}'.format(graph.summary()))
+    return Refresher(config, args, outputs[STATE], outputs[LICENSES])
+
 
-logging.info("Writing 'projects' section...")
-projects.write(os.path.join(config.sources, 'content/projects'))
+def _serve(address: str, refresher: Refresher) -> None:
+    try:
+        server = WebhookServer(address, refresher, os.environ.get(SECRET, ''))
+    except (OSError, ValueError) as serve_error:
+        logging.error('Failed to serve webhooks:\n{0}'.format(serve_error))
+        sys.exit(1)
+    server.serve_forever()
 
-logging.info("Generating 'news' section...")
-with warnings.catch_warnings(record=True) as warns:
-    warnings.simplefilter('always')
-    news = NewsSection.from_config(config.projects)
-    if warns:
-        for warn in warns:
-            logging.warning('Warning: {0}'.format(warn.message))
 
-logging.info("Writing 'news' section...")
-news.write(os.path.join(config.sources, 'content/news'))
+# Worker processes which do not fork import this module without running it.
+if __name__ == '__main__':
+    main()
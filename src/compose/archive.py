@@ -0,0 +1,157 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Write time-ordered archive shards."""
+
+import datetime
+import heapq
+import itertools
+import logging
+import operator
+import os
+import re
+from typing import Callable, Iterable, Iterator
+
+from files import read_json, write_json
+
+# Number of newest records in the shard loaded with the page, one page of
+# search results.
+LATEST = 9
+# Hugo's summaryLength, for summaries set in the front matter, which Hugo
+# then shows instead of its own.
+SUMMARY_WORDS = 30
+MARKDOWN_IMAGE = re.compile(r'!\[[^\]]*\]\([^)]*\)')
+MARKDOWN_LINK = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+MARKUP = re.compile(r'<[^>]*>|[#*_>`|~]')
+
+# Date and name of a page.
+Dated = tuple[datetime.date, str]
+
+
+def summary(markdown: str, words: int = SUMMARY_WORDS) -> str:
+    """
+    Summarize Markdown as plain text.
+
+    Parameters:
+        markdown: Markdown text.
+        words: Maximum number of words.
+
+    Returns:
+        First words of the text, without images, links and markup.
+    """
+    text = MARKDOWN_IMAGE.sub('', markdown)
+    text = MARKUP.sub('', MARKDOWN_LINK.sub(r'\1', text))
+    return ' '.join(text.split()[:words])
+
+
+def newest(timelines: Iterable[Iterable[Dated]]) -> Iterator[Dated]:
+    """
+    Merge timelines into one, newest first.
+
+    The timelines are merged lazily with a heap, so each page taken costs
+    the logarithm of the number of timelines, and pages past those taken
+    are not compared. The timelines themselves must be sorted first.
+
+    Parameters:
+        timelines: Dated page names, each ordered newest first.
+
+    Returns:
+        Dated page names, newest first, then by name in reverse.
+    """
+    return heapq.merge(*timelines, reverse=True)
+
+
+def write_archive(
+    path: str,
+    timeline: Iterable[Dated],
+    record: Callable[[str], dict],
+    latest: int = LATEST,
+) -> None:
+    """
+    Write a timeline as a latest shard and yearly archive shards.
+
+    The manifest 'latest.json' holds the records of the newest pages, the
+    number of pages and the years of the archive shards, newest first.
+    Each shard 'archive/<year>.json' holds the records of the older pages
+    of its year, so a page first loads the manifest alone and then the
+    shards it scrolls to. The timeline is consumed one year at a time.
+    Stale shards are removed.
+
+    Parameters:
+        path: Static files directory of the section page.
+        timeline: Dated page names, newest first.
+        record: Get the record of a page by name.
+        latest: Number of records in the manifest.
+    """
+    # Year and name of each page.
+    pages = ((str(date.year), name) for date, name in timeline)
+    index = [record(name) for _, name in itertools.islice(pages, latest)]
+    logging.info("Writing '{0}' archive...".format(path))
+    try:
+        _write(path, index, pages, record)
+    except (OSError, ValueError) as write_error:
+        logging.error("Failed to write '{0}' archive:\n{1}".format(
+            path, write_error,
+        ))
+
+
+def read_archive(path: str) -> list[dict]:
+    """
+    Read the records of an archive.
+
+    Parameters:
+        path: Manifest file path.
+
+    Returns:
+        Records, newest first.
+
+    Raises:
+        ValueError: If the files can not be read.
+        KeyError: If the manifest misses a field.
+    """
+    manifest = read_json(path)
+    records = list(manifest['index'])
+    for shard in manifest['shards']:
+        records.extend(read_json(os.path.join(
+            os.path.dirname(path), 'archive', _shard_file(shard),
+        )))
+    return records
+
+
+def _write(
+    path: str,
+    index: list[dict],
+    pages: Iterator[tuple[str, str]],
+    record: Callable[[str], dict],
+) -> None:
+    shard_path = os.path.join(path, 'archive')
+    os.makedirs(shard_path, exist_ok=True)
+    counts = _write_shards(shard_path, pages, record)
+    files = {_shard_file(year) for year in counts}
+    for stale in set(os.listdir(shard_path)) - files:
+        os.remove(os.path.join(shard_path, stale))
+    write_json(os.path.join(path, 'latest.json'), {
+        'index': index,
+        'shards': list(counts),
+        'total': len(index) + sum(counts.values()),
+    }, compact=True)
+
+
+def _write_shards(
+    path: str,
+    pages: Iterator[tuple[str, str]],
+    record: Callable[[str], dict],
+) -> dict[str, int]:
+    counts = {}
+    for year, shard in itertools.groupby(pages, key=operator.itemgetter(0)):
+        records = [record(name) for _, name in shard]
+        write_json(
+            os.path.join(path, _shard_file(year)), records, compact=True,
+        )
+        counts[year] = len(records)
+    return counts
+
+
+def _shard_file(shard: str) -> str:
+    return '{0}.json'.format(shard)
@@ -0,0 +1,218 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Build the content as a graph of tasks."""
+
+import argparse
+import os
+from contextlib import ExitStack
+from typing import Collection, Optional
+
+from config import Config
+from files import StagedDirectory
+from license import License
+from probe import ImageUrl
+from search import write_indexes
+from stages import (
+    generate_redirects,
+    generate_sections,
+    load_licenses,
+    store_images,
+    write_section,
+)
+from state import BuildState
+from tasks import TaskGraph
+
+LICENSES = 'licenses'
+NEWS = 'news'
+NEWS_IMAGES = 'news images'
+PROJECTS = 'projects'
+PROJECT_IMAGES = 'project images'
+SECTIONS = 'sections'
+STAGE = 'stage'
+STATE = 'state'
+SWAP = 'swap'
+WRITE_NEWS = 'write news'
+WRITE_PROJECTS = 'write projects'
+
+
+def build_graph(
+    config: Config,
+    args: argparse.Namespace,
+    build_state: Optional[BuildState] = None,
+    refresh: Optional[Collection[str]] = None,
+    licenses: Optional[list[License]] = None,
+) -> TaskGraph:
+    """
+    Create the task graph of a build.
+
+    A full build checks the SPDX license list, loads the build state and
+    checks and generates the redirects, all concurrently. The project
+    workers load the license list on their own, so the sections do not
+    wait for the check. A refresh only generates the pages of the given
+    projects again, and keeps the build state and the parsed license list
+    of the last build, which its workers get rather than parse again.
+
+    The content and static directories of the Hugo sources are staged
+    before any task writes to them, and swapped in once all writes are
+    done, so Hugo sees a single change of the sources rather than one per
+    section. Each directory is exchanged atomically, right after the
+    other, as two directories can not be exchanged at once. A failed build
+    leaves both untouched, and its stages are discarded by the next build.
+
+    Parameters:
+        config: Configuration.
+        args: Command line arguments.
+        build_state: State of the last build, loaded by a full build.
+        refresh: IDs of the projects to refresh, all if None.
+        licenses: License data of the SPDX license list, parsed by a full
+            build.
+
+    Returns:
+        TaskGraph: Build tasks, ready to run.
+    """
+    directories = [
+        StagedDirectory(os.path.join(config.sources, directory))
+        for directory in ('content', 'static')
+    ]
+    staging = ExitStack()
+    graph = TaskGraph()
+    graph.add(STAGE, lambda: _stage(staging, directories))
+    if refresh is None:
+        _add_full(graph, config, args)
+    else:
+        _add_refresh(graph, build_state)
+    graph.add(
+        SECTIONS,
+        lambda loaded: generate_sections(
+            config, args, loaded, refresh, licenses,
+        ),
+        STATE,
+    )
+    _add_writes(graph, config, args)
+    graph.add(SWAP, lambda *_: _swap(staging), *graph.tasks)
+    graph.add(
+        'save state',
+        lambda build_state, _: build_state.save(ImageUrl.probes),
+        STATE,
+        SWAP,
+    )
+    return graph
+
+
+def _add_full(
+    graph: TaskGraph, config: Config, args: argparse.Namespace,
+) -> None:
+    content_path, static = _staged(config)
+    graph.add(LICENSES, lambda: load_licenses(config))
+    graph.add(
+        'redirects',
+        lambda _: generate_redirects(config, args, static),
+        STAGE,
+    )
+    graph.add(
+        'write redirects',
+        lambda redirects: write_section(
+            config, args, 'redirects', redirects, content_path,
+        ),
+        'redirects',
+    )
+    graph.add(STATE, lambda: BuildState.from_config(
+        args.state, config, args.news_retention,
+    ))
+
+
+def _add_refresh(
+    graph: TaskGraph, build_state: Optional[BuildState],
+) -> None:
+    # URLs are checked and image probes revalidated again by each refresh,
+    # so the caches, shared by all URLs, do not grow with a long running
+    # process.
+    ImageUrl.heads.clear()
+    ImageUrl.probes.clear()
+    graph.add(STATE, lambda: build_state)
+
+
+def _add_writes(
+    graph: TaskGraph, config: Config, args: argparse.Namespace,
+) -> None:
+    content_path, static = _staged(config)
+    news_static = os.path.join(static, NEWS)
+    # Each section stores its images in its own store, so the tasks of a
+    # section do not wait for the images of the other.
+    graph.add(
+        PROJECT_IMAGES,
+        lambda sections, _: store_images(
+            config, args, PROJECTS, sections[0], static,
+        ),
+        SECTIONS,
+        STAGE,
+    )
+    graph.add(
+        NEWS_IMAGES,
+        lambda sections, _: store_images(
+            config, args, NEWS, sections[1], static,
+        ),
+        SECTIONS,
+        STAGE,
+    )
+    graph.add(
+        WRITE_PROJECTS,
+        lambda projects: write_section(
+            config, args, PROJECTS, projects, content_path,
+        ),
+        PROJECT_IMAGES,
+    )
+    graph.add(
+        'index projects',
+        lambda projects: write_indexes(projects, static, config.tags),
+        PROJECT_IMAGES,
+    )
+    graph.add(
+        WRITE_NEWS,
+        lambda news: write_section(config, args, NEWS, news, content_path),
+        NEWS_IMAGES,
+    )
+    graph.add(
+        'index news',
+        lambda news: write_indexes(news, news_static),
+        NEWS_IMAGES,
+    )
+    graph.add(
+        'archive news',
+        lambda news: news.write_archive(news_static),
+        NEWS_IMAGES,
+    )
+    graph.add(
+        'news feeds',
+        lambda news: news.write_feeds(news_static, config.sources),
+        NEWS_IMAGES,
+    )
+
+
+def _staged(config: Config) -> tuple[str, ...]:
+    # Staging directories of the content and static directories.
+    return tuple(
+        StagedDirectory(os.path.join(config.sources, directory)).stage
+        for directory in ('content', 'static')
+    )
+
+
+def _stage(staging: ExitStack, directories: list[StagedDirectory]) -> None:
+    try:
+        for directory in directories:
+            staging.enter_context(directory)
+    except OSError as stage_error:
+        raise ValueError('Failed to stage the sources:\n{0}'.format(
+            stage_error,
+        ))
+
+
+def _swap(staging: ExitStack) -> None:
+    try:
+        staging.close()
+    except OSError as swap_error:
+        raise ValueError('Failed to swap the sources:\n{0}'.format(
+            swap_error,
+        ))
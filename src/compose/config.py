@@ -7,6 +7,7 @@
 
 import datetime
 import re
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
 from typing import Annotated, Optional
 
@@ -24,7 +25,8 @@ from pydantic import (
 )
 from repository import Repository
 from schema import AnnotatedStr, AnnotatedStrList, BaseModelForbidExtra, Schema
-from url import Url, UrlList
+from trie import RedirectTrie
+from url import Url
 
 
 class Contact(BaseModelForbidExtra):
@@ -39,7 +41,8 @@ class News(BaseModelForbidExtra):
 
     title: AnnotatedStr
     date: datetime.date
-    images: Optional[UrlList] = None
+    # Probed once the news is retained, see NewsPage.
+    images: Optional[AnnotatedStrList] = None
     project: Optional['Project'] = Field(default=None, exclude=True)
     description: Optional[AnnotatedStr] = Field(default=None, exclude=True)
 
@@ -120,26 +123,38 @@ class Project(BaseModelForbidExtra):
     compatibles: Optional[AnnotatedStrList] = None
 
     @cached_property
-    def manifest(self) -> Manifest:
+    def manifest_yaml(self) -> str:
         """
-        Get manifest.
+        Get manifest YAML.
 
         Returns:
-            Manifest: project manifest.
+            str: project manifest, as fetched from the repository.
 
         Raises:
-            ValueError: If loading the manifest fails.
+            ValueError: If fetching the manifest fails.
         """
         try:
-            manifest_yaml = self.repository.fetch('.ohwr.yaml')
+            return self.repository.fetch('.ohwr.yaml')
         except ValueError as fetch_error:
             raise ValueError(
                 "Failed to fetch '.ohwr.yaml' from '{0}':\n{1}".format(
                     self.repository.url, fetch_error,
                 ),
             )
+
+    @cached_property
+    def manifest(self) -> Manifest:
+        """
+        Get manifest.
+
+        Returns:
+            Manifest: project manifest.
+
+        Raises:
+            ValueError: If loading the manifest fails.
+        """
         try:
-            return Manifest.from_yaml(manifest_yaml)
+            return Manifest.from_yaml(self.manifest_yaml)
         except (ValidationError, ValueError) as manifest_error:
             raise ValueError("Failed to load manifest from '{0}':\n{1}".format(
                 self.repository.url, manifest_error,
@@ -253,15 +268,71 @@ class Redirect(BaseModelForbidExtra):
     target: Url
 
 
+class RedirectRule(BaseModelForbidExtra):
+    """Redirect rule configuration."""
+
+    url: AnnotatedStr
+    target: AnnotatedStr
+    paths: Optional[AnnotatedStrList] = None
+
+    def match_paths(self, rule_trie: RedirectTrie) -> list[str]:
+        """
+        Expand the target of each path.
+
+        Parameters:
+            rule_trie: Trie of all the redirect rules.
+
+        Returns:
+            list[str]: target of each path.
+
+        Raises:
+            ValueError: If a path does not match the rule, or another rule
+                takes precedence over it.
+        """
+        trie = RedirectTrie.from_rules([(self.url, self.target)])
+        targets = []
+        for path in self.paths or []:
+            target = trie.match(path)
+            if target is None or rule_trie.match(path) != target:
+                raise ValueError("Path '{0}' does not match '{1}'.".format(
+                    path, self.url,
+                ))
+            targets.append(target)
+        return targets
+
+
 class Config(Schema):
     """Configuration schema."""
 
     sources: DirectoryPath
     licenses: FilePath
     redirects: Annotated[list[Redirect], Field(min_length=1)]
+    redirect_rules: Optional[list[RedirectRule]] = None
     tags: AnnotatedStrList
     projects: Annotated[list[Project], Field(min_length=1)]
 
+    @classmethod
+    def from_yaml(cls, yaml_str: str, deferred: bool = False) -> 'Config':
+        """
+        Load the configuration from YAML.
+
+        Parameters:
+            yaml_str: YAML string.
+            deferred: Leave the redirect targets to check_targets, so the
+                configuration loads without waiting for HEAD requests.
+
+        Returns:
+            Config: The configuration object.
+
+        Raises:
+            ValueError: If loading the configuration from YAML fails.
+        """
+        Url.deferred = deferred
+        try:
+            return super().from_yaml(yaml_str)
+        finally:
+            Url.deferred = False
+
     @model_validator(mode='after')
     def check_tags_match(self) -> 'Config':
         """
@@ -284,6 +355,66 @@ class Config(Schema):
                     )
         return self
 
+    @model_validator(mode='after')
+    def check_redirect_rules(self) -> 'Config':
+        """
+        Check if the redirect rules are valid and match their paths.
+
+        Only the target of the first path of each rule is validated, as the
+        targets of the other paths share its host and are expansions of the
+        same template, and only if URL checks are not deferred to
+        check_targets. Every path must still match its rule and no other
+        rule. A path can not be both a redirect and a path of a rule, since
+        its target would then depend on their precedence.
+
+        Returns:
+            Config: The configuration object with validated redirect rules.
+
+        Raises:
+            ValueError: If a rule is not valid, or a path does not match it
+                or is a redirect.
+        """
+        rules = self.redirect_rules or []
+        rule_trie = RedirectTrie.from_rules(
+            (rule.url, rule.target) for rule in rules
+        )
+        _check_rule_paths(self.redirects, rules)
+        for rule in rules:
+            targets = rule.match_paths(rule_trie)
+            if targets:
+                Redirect(url=rule.paths[0], target=targets[0])
+        return self
+
+    def check_targets(self, jobs: int = 1) -> None:
+        """
+        Check the redirect targets, warning about unreachable ones.
+
+        Loading the configuration with deferred URL checks leaves them to
+        this method, so they run with the other build tasks, several at a
+        time. Like check_redirect_rules, only the target of the first path
+        of each rule is checked.
+
+        Parameters:
+            jobs: Number of targets checked at a time.
+        """
+        rules = self.redirect_rules or []
+        rule_trie = RedirectTrie.from_rules(
+            (rule.url, rule.target) for rule in rules
+        )
+        redirects = [
+            (redirect.url, redirect.target.url) for redirect in self.redirects
+        ]
+        redirects.extend(
+            (rule.paths[0], rule.match_paths(rule_trie)[0])
+            for rule in rules
+            if rule.paths
+        )
+        with ThreadPoolExecutor(max(jobs, 1)) as pool:
+            list(pool.map(
+                lambda redirect: Redirect(url=redirect[0], target=redirect[1]),
+                redirects,
+            ))
+
     @model_validator(mode='after')
     def check_compatibles_match(self) -> 'Config':
         """
@@ -309,3 +440,15 @@ class Config(Schema):
                         ).format(project.id, unknown),
                     )
         return self
+
+
+def _check_rule_paths(
+    redirects: list[Redirect], rules: list[RedirectRule],
+) -> None:
+    urls = {redirect.url.strip('/') for redirect in redirects}
+    for rule in rules:
+        paths = {path.strip('/') for path in rule.paths or []}
+        if paths & urls:
+            raise ValueError("Path '{0}' of '{1}' is a redirect.".format(
+                sorted(paths & urls)[0], rule.url,
+            ))
@@ -0,0 +1,239 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Build facet indexes."""
+
+import logging
+import os
+from collections import UserDict
+from functools import partial
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from files import write_json
+from hugo import Section
+
+WORD_BITS = 32
+TOP_FACETS = 8
+
+
+class FacetIndex(UserDict[str, int]):
+    """
+    Bitsets of the pages of a section by facet.
+
+    Pages are numbered in listing order, by descending weight, then by
+    descending date, then by name. Bit n of the bitset of a facet is set
+    if page n has that facet, so the browser intersects filters and counts
+    facets with bitwise operations on 32-bit words.
+    """
+
+    def __init__(
+        self,
+        docs: Optional[list[str]] = None,
+        bitsets: Optional[dict[str, int]] = None,
+    ) -> None:
+        """
+        Initialize the facet index.
+
+        Parameters:
+            docs: Page names by ordinal.
+            bitsets: Page ordinal bitsets by facet.
+        """
+        super().__init__(bitsets or {})
+        self.docs = docs or []
+
+    @classmethod
+    def from_section(
+        cls, section: Section, facets: Iterable[str] = (),
+    ) -> 'FacetIndex':
+        """
+        Index the facets of the pages of a section.
+
+        The facets of a page are the 'filter' field of its search record.
+
+        Parameters:
+            section: Section whose pages have search records.
+            facets: Known facets, indexed even if no page has them.
+
+        Returns:
+            FacetIndex: Instance of FacetIndex class.
+        """
+        facet_index = cls(_order(section), dict.fromkeys(facets, 0))
+        for ordinal, name in enumerate(facet_index.docs):
+            facet_index.add(ordinal, section[name].search_record())
+        return facet_index
+
+    def add(self, ordinal: int, record: dict) -> None:
+        """
+        Add the facets of a page.
+
+        Parameters:
+            ordinal: Page ordinal.
+            record: Page search record.
+        """
+        for facet in _listify(record.get('filter', [])):
+            bitset = self.data.get(facet, 0)
+            self.data[facet] = bitset | 1 << ordinal
+
+    def words(self, bitset: int) -> list[int]:
+        """
+        Split a bitset into 32-bit words, least significant first.
+
+        Parameters:
+            bitset: Page ordinal bitset.
+
+        Returns:
+            One word per 32 pages of the section.
+        """
+        mask = (1 << WORD_BITS) - 1
+        return [
+            bitset >> offset & mask
+            for offset in range(0, len(self.docs), WORD_BITS)
+        ]
+
+    def write(self, path: str) -> None:
+        """
+        Write the index to 'facets.json'.
+
+        Besides the pages and bitsets, the file holds the page count of
+        each facet, for the facets of the unfiltered listing.
+
+        Parameters:
+            path: Static files directory of the section page.
+        """
+        facets_file = os.path.join(path, 'facets.json')
+        logging.info("Writing '{0}'...".format(facets_file))
+        try:
+            write_json(facets_file, {
+                'docs': self.docs,
+                'facets': {
+                    facet: self.words(bitset)
+                    for facet, bitset in self.data.items()
+                },
+                'counts': {
+                    facet: bitset.bit_count()
+                    for facet, bitset in self.data.items()
+                },
+            }, compact=True)
+        except ValueError as write_error:
+            logging.error("Failed to write '{0}':\n{1}".format(
+                facets_file, write_error,
+            ))
+
+
+class FacetCooccurrence:
+    """
+    Facet by facet co-occurrence counts of the pages of a section.
+
+    Entry (i, j) of the matrix counts the pages with both facets i and j,
+    so the diagonal counts the pages of each facet. The browser suggests
+    facets and counts the pages left by narrowing a facet with a row
+    lookup instead of a pass over the pages.
+    """
+
+    def __init__(self, facets: list[str], matrix: np.ndarray) -> None:
+        """
+        Initialize the co-occurrence counts.
+
+        Parameters:
+            facets: Facets by row and column.
+            matrix: Square matrix of co-occurrence counts.
+        """
+        self.facets = facets
+        self.matrix = matrix
+
+    @classmethod
+    def from_section(
+        cls, section: Section, facets: Iterable[str],
+    ) -> 'FacetCooccurrence':
+        """
+        Count the co-occurrences of the facets of the pages of a section.
+
+        The facets of a page are the 'filter' field of its search record.
+        Facets which are not known are ignored.
+
+        Parameters:
+            section: Section whose pages have search records.
+            facets: Known facets.
+
+        Returns:
+            FacetCooccurrence: Instance of FacetCooccurrence class.
+        """
+        columns = {facet: column for column, facet in enumerate(facets)}
+        incidence = _incidence(section, columns)
+        return cls(list(columns), incidence.T @ incidence)
+
+    def top(self, count: int = TOP_FACETS) -> dict[str, list[str]]:
+        """
+        Find the facets co-occurring most with each facet.
+
+        Parameters:
+            count: Maximum number of facets per facet.
+
+        Returns:
+            Co-occurring facets by descending count, then in facet order,
+            by facet.
+        """
+        counts = self.matrix.copy()
+        np.fill_diagonal(counts, 0)
+        order = np.argsort(-counts, axis=1, kind='stable')
+        return {
+            facet: [
+                self.facets[column]
+                for column in order[row, :count]
+                if counts[row, column]
+            ]
+            for row, facet in enumerate(self.facets)
+        }
+
+    def write(self, path: str) -> None:
+        """
+        Write the counts to 'cooccurrence.json'.
+
+        Besides the facets and matrix, the file holds the top co-occurring
+        facets of each facet.
+
+        Parameters:
+            path: Static files directory of the section page.
+        """
+        cooccurrence_file = os.path.join(path, 'cooccurrence.json')
+        logging.info("Writing '{0}'...".format(cooccurrence_file))
+        try:
+            write_json(cooccurrence_file, {
+                'facets': self.facets,
+                'matrix': self.matrix.tolist(),
+                'top': self.top(),
+            }, compact=True)
+        except ValueError as write_error:
+            logging.error("Failed to write '{0}':\n{1}".format(
+                cooccurrence_file, write_error,
+            ))
+
+
+def _incidence(section: Section, columns: dict[str, int]) -> np.ndarray:
+    shape = (len(section), len(columns))
+    incidence = np.zeros(shape, dtype=np.int32)
+    for row, page in enumerate(section.values()):
+        facets = _listify(page.search_record().get('filter', []))
+        incidence[row, [
+            columns[facet] for facet in facets if facet in columns
+        ]] = 1
+    return incidence
+
+
+def _listify(facet_field: Any) -> list[str]:
+    return [facet_field] if isinstance(facet_field, str) else facet_field
+
+
+def _order(section: Section) -> list[str]:
+    names = sorted(section)
+    names.sort(key=partial(_sort_key, section, 'date', ''), reverse=True)
+    names.sort(key=partial(_sort_key, section, 'weight', 0), reverse=True)
+    return names
+
+
+def _sort_key(section: Section, key: str, default: Any, name: str) -> Any:
+    field = section[name].front_matter.get(key)
+    return default if field is None else type(default)(field)
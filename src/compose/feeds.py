@@ -0,0 +1,271 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Write Atom feeds."""
+
+import datetime
+import itertools
+import logging
+import os
+from dataclasses import asdict, dataclass
+from typing import Optional
+from xml.etree import ElementTree  # noqa: S405
+
+import yaml
+
+from archive import Dated, newest
+from files import digest, read_json, write_json, write_text
+from hugo import Page
+
+ATOM = 'http://www.w3.org/2005/Atom'
+# Hugo configuration, which sets the site URL.
+HUGO_CONFIG = 'config.yaml'
+# Environment variable from which Hugo takes the site URL first.
+HUGO_BASE_URL = 'HUGO_BASEURL'
+# State file, in the Hugo sources out of the static files.
+STATE = '.feeds.json'
+TITLE = 'Open Hardware Repository news'
+FEED = 'feed.xml'
+# Number of newest entries in each feed.
+ENTRIES = 20
+TIMESTAMP = '%Y-%m-%dT%H:%M:%SZ'
+
+
+@dataclass
+class FeedEntry:
+    """Atom entry of a news page."""
+
+    project: str
+    updated: str
+    digest: str
+    xml: str
+
+
+class AtomFeeds:
+    """
+    Atom feeds of news, one for all news and one per project.
+
+    Only the newest pages of each feed are rendered, as found by merging
+    the project timelines. Entries are kept across runs in a state file,
+    with a digest of their page. Only new and changed pages are rendered
+    again, and only changed pages get a new 'updated' timestamp, so the
+    feeds of an unchanged section are written byte for byte as before and
+    their files are left untouched, which keeps the ETags of the static
+    host.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        state: str,
+        section: str,
+        base_url: str,
+        entries: int = ENTRIES,
+    ) -> None:
+        """
+        Initialize the feeds.
+
+        Entries link to the URL in the front matter of their page.
+
+        Parameters:
+            path: Static files directory of the news page.
+            state: State file path, out of the static files.
+            section: Site path of the news page.
+            base_url: Site URL, without trailing slash.
+            entries: Number of newest entries in each feed.
+        """
+        self.path = path
+        self.state = state
+        self.section = section
+        self.base_url = base_url
+        self.size = entries
+        self.entries: dict[str, FeedEntry] = {}
+
+    @classmethod
+    def from_hugo(cls, path: str, sources: str, section: str) -> 'AtomFeeds':
+        """
+        Initialize the feeds of a Hugo site.
+
+        The site URL is the one Hugo uses: that of the HUGO_BASEURL
+        environment variable if set, the baseURL of the Hugo configuration
+        otherwise. The state file is kept in the Hugo sources, so it is not
+        published.
+
+        Parameters:
+            path: Static files directory of the news page.
+            sources: Hugo sources directory.
+            section: Site path of the news page.
+
+        Returns:
+            AtomFeeds: Instance of AtomFeeds class.
+
+        Raises:
+            ValueError: If the site URL can not be read.
+        """
+        state = os.path.join(sources, STATE)
+        base_url = os.environ.get(HUGO_BASE_URL)
+        if base_url:
+            return cls(path, state, section, base_url.rstrip('/'))
+        config_file = os.path.join(sources, HUGO_CONFIG)
+        try:
+            with open(config_file, 'r') as hugo_config:
+                hugo = yaml.safe_load(hugo_config)
+        except (OSError, yaml.YAMLError) as read_error:
+            raise ValueError("Failed to read '{0}':\n{1}".format(
+                config_file, read_error,
+            ))
+        base_url = hugo.get('baseURL') if isinstance(hugo, dict) else None
+        if not isinstance(base_url, str):
+            raise ValueError("No site URL in '{0}'.".format(config_file))
+        return cls(path, state, section, base_url.rstrip('/'))
+
+    def update(
+        self,
+        pages: dict[str, Page],
+        timelines: dict[str, list[Dated]],
+        now: Optional[datetime.datetime] = None,
+    ) -> None:
+        """
+        Update the feeds with the news pages.
+
+        The global feed is written to 'feed.xml' and the feed of each
+        project to 'feeds/<project id>.xml'. Feeds of projects without
+        news, and the global feed if there are no news, are removed.
+
+        Parameters:
+            pages: News pages by name.
+            timelines: Dated page names, newest first, by project ID.
+            now: Time of the update, the current time if None.
+        """
+        windows = _windows(timelines, self.size)
+        self.entries = self._entries(pages, windows, now)
+        logging.info("Writing '{0}' feeds...".format(self.path))
+        try:
+            self._write(windows)
+        except (OSError, ValueError) as write_error:
+            logging.error("Failed to write '{0}' feeds:\n{1}".format(
+                self.path, write_error,
+            ))
+
+    def _entries(
+        self,
+        pages: dict[str, Page],
+        windows: dict[str, list[str]],
+        now: Optional[datetime.datetime],
+    ) -> dict[str, FeedEntry]:
+        previous = _read_state(self.state)
+        timestamp = (
+            now or datetime.datetime.now(datetime.timezone.utc)
+        ).strftime(TIMESTAMP)
+        names = set(itertools.chain.from_iterable(windows.values()))
+        return {
+            name: self._entry(pages[name], previous.get(name), timestamp)
+            for name in sorted(names)
+        }
+
+    def _entry(
+        self, page: Page, previous: Optional[FeedEntry], now: str,
+    ) -> FeedEntry:
+        page_digest = digest(page.render())
+        if previous and previous.digest == page_digest:
+            return previous
+        published = '{0}T00:00:00Z'.format(page.front_matter['date'])
+        updated = now if previous else published
+        return FeedEntry(
+            project=page.front_matter['project'],
+            updated=updated,
+            digest=page_digest,
+            xml=_render(
+                page,
+                '{0}{1}'.format(self.base_url, page.front_matter['url']),
+                published,
+                updated,
+            ),
+        )
+
+    def _feed(self, feed_file: str, entries: list[FeedEntry]) -> str:
+        feed = ElementTree.Element('feed', xmlns=ATOM)
+        url = '{0}{1}{2}'.format(self.base_url, self.section, feed_file)
+        ElementTree.SubElement(feed, 'id').text = url
+        ElementTree.SubElement(feed, 'title').text = (
+            TITLE if feed_file == FEED
+            else '{0} news'.format(entries[0].project)
+        )
+        ElementTree.SubElement(feed, 'link', rel='self', href=url)
+        ElementTree.SubElement(
+            feed, 'link', href='{0}{1}'.format(self.base_url, self.section),
+        )
+        ElementTree.SubElement(feed, 'updated').text = max(
+            entry.updated for entry in entries
+        )
+        feed.extend(
+            ElementTree.fromstring(entry.xml)  # noqa: S314
+            for entry in entries
+        )
+        return ElementTree.tostring(
+            feed, encoding='unicode', xml_declaration=True,
+        )
+
+    def _write(self, windows: dict[str, list[str]]) -> None:
+        feeds_path = os.path.join(self.path, 'feeds')
+        os.makedirs(feeds_path, exist_ok=True)
+        for feed_file, names in windows.items():
+            write_text(os.path.join(self.path, feed_file), self._feed(
+                feed_file, [self.entries[name] for name in names],
+            ))
+        stale = {'feeds/{0}'.format(name) for name in os.listdir(feeds_path)}
+        for stale_file in (stale | {FEED}) - windows.keys():
+            if os.path.isfile(os.path.join(self.path, stale_file)):
+                os.remove(os.path.join(self.path, stale_file))
+        _write_state(self.state, self.entries)
+
+
+def _windows(
+    timelines: dict[str, list[Dated]], size: int,
+) -> dict[str, list[str]]:
+    windows = {
+        'feeds/{0}.xml'.format(project): [name for _, name in timeline[:size]]
+        for project, timeline in timelines.items()
+    }
+    if timelines:
+        windows[FEED] = [
+            name for _, name in itertools.islice(
+                newest(timelines.values()), size,
+            )
+        ]
+    return windows
+
+
+def _read_state(path: str) -> dict[str, FeedEntry]:
+    if not os.path.isfile(path):
+        return {}
+    try:
+        return {
+            name: FeedEntry(**entry) for name, entry in read_json(path).items()
+        }
+    except (TypeError, ValueError) as read_error:
+        logging.warning(read_error)
+        return {}
+
+
+def _write_state(path: str, entries: dict[str, FeedEntry]) -> None:
+    write_json(path, {
+        name: asdict(entry) for name, entry in entries.items()
+    })
+
+
+def _render(page: Page, url: str, published: str, updated: str) -> str:
+    entry = ElementTree.Element('entry')
+    for tag, text in (
+        ('id', url),
+        ('title', page.front_matter['title']),
+        ('published', published),
+        ('updated', updated),
+        ('summary', page.front_matter['summary']),
+    ):
+        ElementTree.SubElement(entry, tag).text = text
+    ElementTree.SubElement(entry, 'link', href=url)
+    author = ElementTree.SubElement(entry, 'author')
+    ElementTree.SubElement(author, 'name').text = page.front_matter['project']
+    return ElementTree.tostring(entry, encoding='unicode')
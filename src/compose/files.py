@@ -0,0 +1,262 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Write generated files."""
+
+import ctypes
+import errno
+import hashlib
+import json
+import logging
+import os
+import shutil
+from typing import Any, Optional, Union
+
+# Flag of the Linux renameat2 call exchanging two paths atomically.
+RENAME_EXCHANGE = 2
+AT_FDCWD = -100
+# Errors of the platforms and file systems which can not exchange paths.
+UNSUPPORTED = frozenset((errno.ENOSYS, errno.EINVAL, errno.ENOTSUP))
+
+
+def digest(text: Union[str, bytes]) -> str:
+    """
+    Hash a string.
+
+    Parameters:
+        text: String or bytes to hash.
+
+    Returns:
+        SHA-256 hex digest.
+    """
+    if isinstance(text, str):
+        text = text.encode()
+    return hashlib.sha256(text).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """
+    Hash a text file.
+
+    Parameters:
+        path: File path.
+
+    Returns:
+        SHA-256 hex digest, or an empty string if the file can not be read.
+    """
+    if not os.path.isfile(path):
+        return ''
+    try:
+        with open(path, 'r') as text_file:
+            return digest(text_file.read())
+    except (OSError, UnicodeDecodeError):
+        return ''
+
+
+def write_text(path: str, text: str) -> bool:
+    """
+    Write a string to a file unless the file already holds it.
+
+    The file is replaced rather than written in place, so other hard links
+    to it, such as those of a staged directory, keep their content.
+
+    Parameters:
+        path: File path.
+        text: File content.
+
+    Returns:
+        True if the file was written, False if it was unchanged.
+
+    Raises:
+        OSError: If writing the file fails.
+    """
+    if digest(text) == file_digest(path):
+        return False
+    directory, name = os.path.split(path)
+    temporary = os.path.join(directory, '.{0}.tmp'.format(name))
+    with open(temporary, 'w') as text_file:
+        text_file.write(text)
+    os.replace(temporary, path)
+    return True
+
+
+def read_json(path: str) -> Any:
+    """
+    Read a JSON file.
+
+    Parameters:
+        path: File path.
+
+    Returns:
+        Decoded JSON data.
+
+    Raises:
+        ValueError: If reading or decoding the file fails.
+    """
+    try:
+        with open(path, 'r') as json_file:
+            return json.load(json_file)
+    except (OSError, json.JSONDecodeError) as json_error:
+        raise ValueError("Failed to read '{0}':\n{1}".format(
+            path, json_error,
+        ))
+
+
+def read_manifest(path: str) -> set[str]:
+    """
+    Read a manifest, the JSON list of the files written by the last run.
+
+    Parameters:
+        path: Manifest file path.
+
+    Returns:
+        File names, empty if the manifest is missing or invalid.
+    """
+    if not os.path.isfile(path):
+        return set()
+    try:
+        return set(read_json(path))
+    except (TypeError, ValueError) as read_error:
+        logging.warning(read_error)
+        return set()
+
+
+def write_json(path: str, json_data: Any, compact: bool = False) -> bool:
+    """
+    Write data to a JSON file unless the file already holds it.
+
+    Keys are sorted so the same data always produces the same bytes.
+
+    Parameters:
+        path: File path.
+        json_data: Data to encode.
+        compact: Leave out all optional whitespace, for files served to
+            browsers.
+
+    Returns:
+        True if the file was written, False if it was unchanged.
+
+    Raises:
+        ValueError: If encoding or writing the file fails.
+    """
+    indent, separators = (None, (',', ':')) if compact else (2, None)
+    try:
+        text = json.dumps(
+            json_data,
+            indent=indent,
+            separators=separators,
+            sort_keys=True,
+            default=str,
+        )
+    except (TypeError, ValueError) as encode_error:
+        raise ValueError('Failed to encode JSON:\n{0}'.format(encode_error))
+    try:
+        return write_text(path, text)
+    except OSError as write_error:
+        raise ValueError("Failed to write '{0}':\n{1}".format(
+            path, write_error,
+        ))
+
+
+class StagedDirectory:
+    """
+    Directory whose changes are staged and swapped in once complete.
+
+    The staging directory lives next to the target directory, and starts
+    with hard links to its files. Since files are replaced rather than
+    written in place, unchanged files keep their inode and modification
+    time. Once complete, the stage and the target are exchanged atomically,
+    so the target never goes missing. Where the exchange is not supported,
+    the target is swapped with two renames instead, and a swap interrupted
+    between them is rolled back on the next use. If the block fails, the
+    staging directory is discarded and the target is left untouched.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the staged directory.
+
+        Parameters:
+            path: Target directory path.
+        """
+        parent, name = os.path.split(os.path.normpath(path))
+        self.path = path
+        self.stage = os.path.join(parent, '.{0}.staging'.format(name))
+        self.backup = os.path.join(parent, '.{0}.backup'.format(name))
+
+    def __enter__(self) -> str:
+        """
+        Create the staging directory.
+
+        Returns:
+            Staging directory path.
+
+        Raises:
+            OSError: If creating the staging directory fails.
+        """
+        interrupted = os.path.isdir(self.backup)
+        if interrupted and not os.path.isdir(self.path):
+            os.rename(self.backup, self.path)
+        shutil.rmtree(self.stage, ignore_errors=True)
+        shutil.rmtree(self.backup, ignore_errors=True)
+        if os.path.isdir(self.path):
+            shutil.copytree(self.path, self.stage, copy_function=self._link)
+        else:
+            os.makedirs(self.stage)
+        return self.stage
+
+    def __exit__(self, exc_type: Optional[type], *exc_info: Any) -> None:
+        """
+        Swap the staging directory in, or discard it on failure.
+
+        Parameters:
+            exc_type: Exception type raised by the block, if any.
+            exc_info: Exception value and traceback.
+
+        Raises:
+            OSError: If swapping the directories fails.
+        """
+        if exc_type:
+            shutil.rmtree(self.stage, ignore_errors=True)
+            return
+        if not os.path.isdir(self.path):
+            os.rename(self.stage, self.path)
+            return
+        try:
+            self._exchange()
+        except OSError as exchange_error:
+            if exchange_error.errno not in UNSUPPORTED:
+                raise
+            os.rename(self.path, self.backup)
+            os.rename(self.stage, self.path)
+            shutil.rmtree(self.backup, ignore_errors=True)
+            return
+        # The stage now holds the previous target.
+        shutil.rmtree(self.stage, ignore_errors=True)
+
+    def _link(self, source: str, target: str) -> None:
+        # Files which can not be linked, e.g. on some network file systems,
+        # are copied with their modification time.
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copy2(source, target)
+
+    def _exchange(self) -> None:
+        libc = ctypes.CDLL(None, use_errno=True)
+        renameat2 = getattr(libc, 'renameat2', None)
+        if renameat2 is None:
+            raise OSError(errno.ENOSYS, 'Exchanging paths is not supported.')
+        exchanged = renameat2(
+            AT_FDCWD,
+            os.fsencode(self.stage),
+            AT_FDCWD,
+            os.fsencode(self.path),
+            RENAME_EXCHANGE,
+        )
+        if exchanged != 0:
+            exchange_errno = ctypes.get_errno()
+            raise OSError(
+                exchange_errno, os.strerror(exchange_errno), self.path,
+            )
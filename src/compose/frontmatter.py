@@ -0,0 +1,194 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Serialize Hugo front matter."""
+
+import datetime
+import json
+import types
+from abc import ABC, abstractmethod
+from typing import Any
+
+import yaml
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import tomli_w
+except ImportError:
+    tomli_w = None
+
+
+class FrontMatterSerializer(ABC):
+    """
+    Abstract Hugo front matter serializer.
+
+    Keys are sorted, so serializing the same front matter twice always
+    produces the same string.
+    """
+
+    name = ''
+    opening = ''
+    closing = ''
+
+    @abstractmethod
+    def dump(self, front_matter: dict) -> str:
+        """
+        Abstract method to serialize front matter.
+
+        Parameters:
+            front_matter: Front matter.
+
+        Returns:
+            Front matter string, ending with a new line.
+        """
+
+    def render(self, front_matter: dict, markdown: str) -> str:
+        """
+        Render a Hugo page.
+
+        Parameters:
+            front_matter: Front matter.
+            markdown: Page content.
+
+        Returns:
+            Hugo page string.
+
+        Raises:
+            ValueError: If serializing the front matter fails.
+        """
+        return '{0}{1}{2}{3}'.format(
+            self.opening, self.dump(front_matter), self.closing, markdown,
+        )
+
+
+class YamlSerializer(FrontMatterSerializer):
+    """YAML front matter serializer."""
+
+    name = 'yaml'
+    opening = '---\n'
+    closing = '---\n'
+
+    def dump(self, front_matter: dict) -> str:
+        """
+        Serialize front matter to YAML.
+
+        Parameters:
+            front_matter: Front matter.
+
+        Returns:
+            YAML front matter.
+
+        Raises:
+            ValueError: If creating the YAML front matter fails.
+        """
+        try:
+            return yaml.safe_dump(front_matter)
+        except yaml.YAMLError as yaml_error:
+            raise ValueError(
+                'Failed to create YAML front matter:\n{0}'.format(yaml_error),
+            )
+
+
+class TomlSerializer(FrontMatterSerializer):
+    """TOML front matter serializer, if tomli-w is installed."""
+
+    name = 'toml'
+    opening = '+++\n'
+    closing = '+++\n'
+
+    def dump(self, front_matter: dict) -> str:
+        """
+        Serialize front matter to TOML.
+
+        Parameters:
+            front_matter: Front matter.
+
+        Returns:
+            TOML front matter.
+
+        Raises:
+            ValueError: If tomli-w is not installed or creating the TOML
+                front matter fails.
+        """
+        if tomli_w is None:
+            raise ValueError('TOML front matter needs tomli-w.')
+        try:
+            return tomli_w.dumps(_sorted(front_matter))
+        except TypeError as toml_error:
+            raise ValueError(
+                'Failed to create TOML front matter:\n{0}'.format(toml_error),
+            )
+
+
+class JsonSerializer(FrontMatterSerializer):
+    """
+    JSON front matter serializer.
+
+    Hugo reads a front matter which is a JSON object natively. It is
+    encoded with orjson if installed, the standard library otherwise.
+    """
+
+    name = 'json'
+    closing = '\n'
+
+    def dump(self, front_matter: dict) -> str:
+        """
+        Serialize front matter to JSON.
+
+        Parameters:
+            front_matter: Front matter.
+
+        Returns:
+            JSON front matter.
+
+        Raises:
+            ValueError: If creating the JSON front matter fails.
+        """
+        try:
+            return _json(front_matter)
+        except (TypeError, ValueError) as json_error:
+            raise ValueError(
+                'Failed to create JSON front matter:\n{0}'.format(json_error),
+            )
+
+
+SERIALIZERS = types.MappingProxyType({
+    serializer.name: serializer
+    for serializer in (YamlSerializer(), TomlSerializer(), JsonSerializer())
+})
+
+
+def _sorted(front_matter_value: Any) -> Any:
+    if isinstance(front_matter_value, dict):
+        return {
+            key: _sorted(front_matter_value[key])
+            for key in sorted(front_matter_value)
+        }
+    if isinstance(front_matter_value, list):
+        return [_sorted(element) for element in front_matter_value]
+    return front_matter_value
+
+
+def _json(front_matter: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(
+            front_matter, default=str, option=orjson.OPT_SORT_KEYS,
+        ).decode()
+    return json.dumps(
+        front_matter,
+        ensure_ascii=False,
+        separators=(',', ':'),
+        sort_keys=True,
+        default=_default,
+    )
+
+
+def _default(front_matter_value: Any) -> str:
+    # Dates and times are written in ISO 8601, like orjson does.
+    if isinstance(front_matter_value, (datetime.date, datetime.time)):
+        return front_matter_value.isoformat()
+    return str(front_matter_value)
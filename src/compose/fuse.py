@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Serialize Fuse.js search indexes."""
+
+import logging
+import math
+import os
+import re
+from dataclasses import asdict, dataclass
+from typing import Any, Union
+
+from files import write_json
+from hugo import Section
+
+# Fuse.js counts the tokens of a field as runs of non-space characters.
+SPACE = re.compile('[^ ]+')
+
+FuseKeys = tuple[tuple[str, int], ...]
+
+
+@dataclass
+class FuseIndex:
+    """
+    Fuse.js search index, as serialized by Fuse.createIndex.
+
+    The browser loads it with Fuse.parseIndex instead of tokenizing and
+    normalizing every record of index.json on each visit. Records refer to
+    the pages in name order, the same order as the search.json manifest.
+    """
+
+    keys: list[dict[str, Any]]
+    records: list[dict[str, Any]]
+
+    @classmethod
+    def from_docs(cls, keys: FuseKeys, docs: list[dict]) -> 'FuseIndex':
+        """
+        Index search documents.
+
+        Parameters:
+            keys: Names and weights of the Fuse keys.
+            docs: Search documents.
+
+        Returns:
+            FuseIndex: Instance of FuseIndex class.
+        """
+        return cls(
+            keys=[
+                {
+                    'path': [name],
+                    'id': name,
+                    'weight': weight,
+                    'src': name,
+                    'getFn': None,
+                }
+                for name, weight in keys
+            ],
+            records=[
+                {'i': index, '$': _fields(doc, keys)}
+                for index, doc in enumerate(docs)
+            ],
+        )
+
+    @classmethod
+    def from_section(cls, section: Section) -> 'FuseIndex':
+        """
+        Index the pages of a section.
+
+        Parameters:
+            section: Section whose pages have search records and which
+                defines its Fuse keys.
+
+        Returns:
+            FuseIndex: Instance of FuseIndex class.
+        """
+        return cls.from_docs(section.fuse_keys, [
+            section[name].search_record() for name in sorted(section)
+        ])
+
+    def write(self, path: str) -> None:
+        """
+        Write the index to 'fuse.json'.
+
+        Parameters:
+            path: Static files directory of the section page.
+        """
+        index_file = os.path.join(path, 'fuse.json')
+        logging.info("Writing '{0}'...".format(index_file))
+        try:
+            write_json(index_file, asdict(self), compact=True)
+        except ValueError as write_error:
+            logging.error("Failed to write '{0}':\n{1}".format(
+                index_file, write_error,
+            ))
+
+
+def _fields(doc: dict, keys: FuseKeys) -> dict[str, Any]:
+    fields: dict[str, Any] = {}
+    for index, (name, _) in enumerate(keys):
+        field = doc.get(name)
+        if isinstance(field, list):
+            # Fuse.createIndex keeps empty lists as empty subrecords.
+            fields[str(index)] = _subrecords(field)
+        elif not _blank(field):
+            fields[str(index)] = {'v': field, 'n': _norm(field)}
+    return fields
+
+
+def _subrecords(field: list) -> list[dict[str, Any]]:
+    # Fuse.js walks arrays with a stack, so items come out last first.
+    return [
+        {'v': text, 'i': position, 'n': _norm(text)}
+        for position, text in reversed(list(enumerate(field)))
+        if not _blank(text)
+    ]
+
+
+def _blank(field: Any) -> bool:
+    return not isinstance(field, str) or not field.strip()
+
+
+def _norm(text: str) -> Union[int, float]:
+    norm = 1 / math.sqrt(len(SPACE.findall(text)))
+    rounded = math.floor(norm * 1000 + 0.5) / 1000
+    return int(rounded) if rounded.is_integer() else rounded
@@ -5,11 +5,54 @@
 """Generate Hugo content."""
 
 from collections import UserDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+from functools import partial
 import logging
+import multiprocessing
 import os
+from typing import Callable, Optional
 
-import yaml
+from files import read_manifest, write_json, write_text
+from frontmatter import SERIALIZERS
+
+# Content adapter of a section and its data file, hidden from Hugo.
+ADAPTER = '_content.gotmpl'
+ADAPTER_DATA = '.content.json'
+ADAPTER_TEMPLATE = """{{{{/* Pages of the section, written by compose. */}}}}
+{{{{ range os.ReadFile "content/{0}/{1}" | transform.Unmarshal }}}}
+  {{{{ $.AddPage . }}}}
+{{{{ end }}}}
+"""
+PAGE_FILE = '{0}.md'
+# Front matter fields which Hugo sets on the page itself, not only in its
+# parameters, and the dates among them.
+ADAPTER_FIELDS = (
+    'aliases',
+    'build',
+    'cascade',
+    'description',
+    'draft',
+    'keywords',
+    'layout',
+    'linkTitle',
+    'markup',
+    'menus',
+    'outputs',
+    'resources',
+    'sitemap',
+    'slug',
+    'summary',
+    'title',
+    'type',
+    'url',
+    'weight',
+)
+ADAPTER_DATES = ('date', 'expiryDate', 'lastmod', 'publishDate')
+# Renderers are forked from a server process started without threads, as
+# sections are written from the threads of the build.
+RENDER_CONTEXT = multiprocessing.get_context('forkserver')
 
 
 @dataclass
@@ -19,50 +62,229 @@ class Page:
     front_matter: dict
     markdown: str
 
-    def write(self, path: str) -> None:
+    def render(self, front_matter_format: str = 'yaml') -> str:
+        """
+        Render Hugo page.
+
+        The front matter keys are sorted, so rendering the same page twice
+        always produces the same string.
+
+        Parameters:
+            front_matter_format: Front matter format, 'yaml', 'toml' or
+                'json'.
+
+        Returns:
+            Hugo page string.
+
+        Raises:
+            ValueError: If creating the front matter fails.
+        """
+        return SERIALIZERS[front_matter_format].render(
+            self.front_matter, self.markdown,
+        )
+
+    def write(
+        self,
+        path: str,
+        front_matter_format: str = 'yaml',
+        rendered: Optional[str] = None,
+    ) -> bool:
         """
         Write Hugo page to a file.
 
+        The file is left untouched if it already holds the rendered page.
+
         Parameters:
             path: File path.
+            front_matter_format: Front matter format, if not yet rendered.
+            rendered: Page already rendered, e.g. by a worker process.
+
+        Returns:
+            True if the file was written, False if it was unchanged.
 
         Raises:
             ValueError: If writing the Hugo page to a file fails.
         """
+        page = rendered or self.render(front_matter_format)
         try:
-            front_matter = yaml.safe_dump(self.front_matter)
-        except yaml.YAMLError as yaml_error:
-            raise ValueError(
-                'Failed to create YAML front matter:\n{0}'.format(yaml_error),
-            )
-        page = '---\n{0}---\n{1}'.format(front_matter, self.markdown)
-        try:
-            with open(path, 'w') as hugo_file:
-                hugo_file.write(page)
+            return write_text(path, page)
         except OSError as write_error:
             raise ValueError("Failed to write Hugo page to '{0}':\n{1}".format(
                 path, write_error,
             ))
 
+    def adapter_record(self, name: str) -> dict:
+        """
+        Get the page as a page of a Hugo content adapter.
+
+        All the front matter is kept in the page parameters, and the fields
+        and dates Hugo reads from a front matter are also set on the page,
+        so the page is the same as if written to a file.
+
+        Parameters:
+            name: Page name, its path in the section.
+
+        Returns:
+            Content adapter page.
+        """
+        record = {
+            'path': name,
+            'params': self.front_matter,
+            'content': {
+                'mediaType': 'text/markdown',
+                'value': self.markdown or '',
+            },
+        }
+        record.update({
+            field: self.front_matter[field]
+            for field in self.front_matter.keys() & ADAPTER_FIELDS
+        })
+        dates = {
+            field: self.front_matter[field]
+            for field in self.front_matter.keys() & ADAPTER_DATES
+        }
+        if dates:
+            record['dates'] = dates
+        return record
+
+
+@dataclass
+class SectionStats:
+    """Hugo section write statistics."""
+
+    written: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+    def __str__(self) -> str:
+        """
+        Format the statistics.
+
+        Returns:
+            Statistics string.
+        """
+        return '{0} written, {1} unchanged, {2} removed'.format(
+            self.written, self.unchanged, self.removed,
+        )
+
 
 class Section(UserDict[str, Page]):
-    """Hugo section."""
+    """
+    Hugo section.
+
+    Pages are written with YAML front matter, unless another of the
+    front matter formats is set. JSON front matter is the fastest to
+    write, and Hugo reads all of them alike.
 
-    def write(self, path: str) -> None:
+    With a content adapter, the section is written as a single data file
+    instead, from which Hugo creates the pages, so neither compose nor Hugo
+    go through a file per page. The content adapter is set to the section
+    directory in the Hugo content, where the adapter reads its data.
+    """
+
+    manifest = '.section.json'
+    front_matter_formats = tuple(SERIALIZERS)
+    front_matter_format = 'yaml'
+    content_adapter: Optional[str] = None
+
+    def write(
+        self,
+        path: str,
+        jobs: int = 1,
+        processes: bool = False,
+    ) -> SectionStats:
         """
         Write the section to files.
 
+        Pages written by the previous run that are no longer part of the
+        section are removed.
+
+        With more than one job, pages are written by a pool of threads and,
+        if requested, rendered by a pool of processes. Pages are logged as
+        their writes start, and counted in section order.
+
         Parameters:
             path: Content directory path.
+            jobs: Number of workers.
+            processes: Render the pages in worker processes.
+
+        Returns:
+            Section write statistics.
         """
-        for name, page in self.data.items():
-            logging.info("Writing '{0}' page...".format(name))
-            try:
-                page.write(self._page_path(path, name))
-            except ValueError as write_error:
-                logging.error("Failed to write '{0}' page:\n{1}".format(
-                    name, write_error,
-                ))
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError as directory_error:
+            logging.error("Failed to create '{0}':\n{1}".format(
+                path, directory_error,
+            ))
+            return SectionStats()
+        stats = SectionStats()
+        for name, write in self._writes(path, jobs, processes).items():
+            self._count(name, write, stats)
+        stats.removed = self._prune(path)
+        logging.info("Wrote '{0}': {1}.".format(path, stats))
+        return stats
+
+    def _writes(
+        self, path: str, jobs: int, processes: bool,
+    ) -> dict[str, Callable[[], bool]]:
+        if self.content_adapter:
+            logging.info("Writing '{0}' content adapter...".format(path))
+            return {ADAPTER: partial(
+                _write_adapter, path, self.content_adapter, self.data,
+            )}
+        if jobs > 1:
+            return {
+                name: future.result
+                for name, future in self._write_parallel(
+                    path, jobs, processes,
+                ).items()
+            }
+        return {
+            name: partial(self._write_page, path, name)
+            for name in self.data
+        }
+
+    def _write_parallel(
+        self, path: str, jobs: int, processes: bool,
+    ) -> dict[str, Future]:
+        rendered = (
+            _render(self.data, self.front_matter_format, jobs)
+            if processes else {}
+        )
+        futures = {}
+        with ThreadPoolExecutor(jobs) as threads:
+            for name, page in self.data.items():
+                logging.info("Writing '{0}' page...".format(name))
+                futures[name] = threads.submit(
+                    page.write,
+                    self._page_path(path, name),
+                    self.front_matter_format,
+                    rendered.get(name),
+                )
+        return futures
+
+    def _write_page(self, path: str, name: str) -> bool:
+        logging.info("Writing '{0}' page...".format(name))
+        return self.data[name].write(
+            self._page_path(path, name),
+            front_matter_format=self.front_matter_format,
+        )
+
+    def _count(
+        self, name: str, write: Callable[[], bool], stats: SectionStats,
+    ) -> None:
+        try:
+            written = write()
+        except ValueError as write_error:
+            logging.error("Failed to write '{0}' page:\n{1}".format(
+                name, write_error,
+            ))
+            return
+        if written:
+            stats.written += 1
+        else:
+            stats.unchanged += 1
 
     def _page_path(self, path: str, name: str) -> str:
         """
@@ -75,4 +297,82 @@ class Section(UserDict[str, Page]):
         Returns:
             Page path.
         """
-        return os.path.join(path, '{0}.md'.format(name))
+        return os.path.join(path, PAGE_FILE.format(name))
+
+    def _prune(self, path: str) -> int:
+        manifest = os.path.join(path, self.manifest)
+        previous = read_manifest(manifest)
+        files = (
+            {ADAPTER, ADAPTER_DATA} if self.content_adapter
+            else {PAGE_FILE.format(name) for name in self.data}
+        )
+        removed = sum(
+            _remove(path, orphan) for orphan in sorted(previous - files)
+        )
+        try:
+            write_json(manifest, sorted(files))
+        except ValueError as write_error:
+            logging.error(write_error)
+        return removed
+
+
+def _render(
+    pages: dict[str, Page], front_matter_format: str, jobs: int,
+) -> dict[str, str]:
+    # Pages which fail to render in a worker are left out, and rendered
+    # again when written, which reports their error.
+    try:
+        with ProcessPoolExecutor(jobs, mp_context=RENDER_CONTEXT) as renderer:
+            renders = {
+                name: renderer.submit(page.render, front_matter_format)
+                for name, page in pages.items()
+            }
+    except (OSError, BrokenProcessPool) as pool_error:
+        logging.warning('Failed to render pages in workers:\n{0}'.format(
+            pool_error,
+        ))
+        return {}
+    return {
+        name: render.result()
+        for name, render in renders.items()
+        if _rendered(name, render)
+    }
+
+
+def _rendered(name: str, render: Future) -> bool:
+    render_error = render.exception()
+    if render_error and not isinstance(render_error, ValueError):
+        # The page failed to pickle or its worker died.
+        logging.warning("Failed to render '{0}' page in a worker:\n{1}".format(
+            name, render_error,
+        ))
+    return render_error is None
+
+
+def _remove(path: str, name: str) -> int:
+    logging.info("Removing '{0}' file...".format(name))
+    try:
+        os.remove(os.path.join(path, name))
+    except FileNotFoundError:
+        return 0
+    except OSError as remove_error:
+        logging.error("Failed to remove '{0}' file:\n{1}".format(
+            name, remove_error,
+        ))
+        return 0
+    return 1
+
+
+def _write_adapter(path: str, section: str, pages: dict[str, Page]) -> bool:
+    written = write_json(os.path.join(path, ADAPTER_DATA), [
+        page.adapter_record(name) for name, page in pages.items()
+    ], compact=True)
+    adapter = ADAPTER_TEMPLATE.format(section, ADAPTER_DATA)
+    try:
+        return write_text(os.path.join(path, ADAPTER), adapter) or written
+    except OSError as write_error:
+        raise ValueError(
+            "Failed to write content adapter to '{0}':\n{1}".format(
+                path, write_error,
+            ),
+        )
@@ -0,0 +1,288 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Localize images."""
+
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import types
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from files import digest, read_json, write_json
+from probe import ImageUrl
+
+IMAGES = 'images'
+WEBP = 'webp'
+WIDTHS = (320, 640, 1280)
+QUALITIES = types.MappingProxyType({WEBP: 80, 'avif': 60})
+# Seconds after which images without entity tag are downloaded again,
+# thirty days.
+MAX_AGE = 2592000
+
+
+@dataclass
+class LocalImage:
+    """Resized variants of a stored image."""
+
+    src: str
+    thumbnail: str
+    srcsets: dict[str, str]
+    width: int
+    height: int
+    etag: str = ''
+    # Seconds since the epoch when the image was stored.
+    stored: float = 0
+
+    @property
+    def name(self) -> str:
+        """
+        Get the name of the stored image, shared by its variants.
+
+        Returns:
+            SHA-256 hex digest of the image bytes.
+        """
+        return os.path.basename(self.src).split('-')[0]
+
+    def fresh(self, url: str) -> bool:
+        """
+        Check if the stored image is still the image at its URL.
+
+        Images are checked with their entity tag or modification date, or
+        expire after MAX_AGE seconds if their host sends neither. Images
+        not probed by this run, such as those of reused pages, are probed
+        for their entity tag.
+
+        Parameters:
+            url: Image URL.
+
+        Returns:
+            True if the stored image can be reused.
+        """
+        if self.etag:
+            return not ImageUrl.changed(url, self.etag)
+        return time.time() - self.stored < MAX_AGE
+
+
+class ImageStore:
+    """
+    Content-addressed store of images and their resized variants.
+
+    Images are named by the SHA-256 digest of their bytes, so an image used
+    by several pages, or found at several URLs, is stored and resized only
+    once. Each image is resized to every width up to its own, in WebP and,
+    if Pillow supports it, AVIF. SVG images are never stored, since they
+    come from project repositories and may carry scripts which would run
+    on the site origin: they stay remote, with their probed dimensions. The
+    store remembers the image of each URL in a manifest kept out of the
+    published files, so images are only downloaded once across runs.
+    Images no longer used by any page are removed from the store.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        manifest: str,
+        prefix: str = '/images',
+        widths: tuple = WIDTHS,
+    ) -> None:
+        """
+        Initialize the image store.
+
+        Parameters:
+            path: Directory of the stored images.
+            manifest: Path of the manifest of the stored images.
+            prefix: Site path of the directory.
+            widths: Widths of the resized variants.
+        """
+        self.path = path
+        self.manifest = manifest
+        self.prefix = prefix
+        self.widths = widths
+        self.images: dict[str, LocalImage] = {}
+
+    def localize(self, front_matters: list[dict], jobs: int = 1) -> None:
+        """
+        Replace the images of pages with stored images.
+
+        The 'images' field of each front matter is rewritten to the largest
+        WebP variants, with the matching 'thumbnails', 'srcsets' and
+        'dimensions' fields. Thumbnails are the middle WebP variants, for
+        cards and listings. Images which can not be stored are left as they
+        are. Stored images are downloaded again if their entity tag changed,
+        or if they expired. The front matters are those of all the pages
+        using the store, since the images of no other page are kept.
+
+        Parameters:
+            front_matters: Front matters of the pages.
+            jobs: Number of images stored at a time.
+        """
+        with ThreadPoolExecutor(max(jobs, 1)) as pool:
+            urls = self._load(front_matters, pool)
+            os.makedirs(self.path, exist_ok=True)
+            for url, image in zip(urls, pool.map(self._store, urls)):
+                if image:
+                    self.images[url] = image
+        for front_matter in front_matters:
+            if front_matter.get(IMAGES):
+                _rewrite(front_matter, self.images)
+        self._save()
+
+    def _store(self, url: str) -> Optional[LocalImage]:
+        try:
+            probe = ImageUrl.probe(url)
+        except ValueError:
+            probe = None
+        if probe and probe.vector:
+            logging.info("Keeping '{0}' SVG image remote...".format(url))
+            return None
+        logging.info("Storing '{0}' image...".format(url))
+        try:
+            return self._variants(
+                ImageUrl(url).download(), probe.etag if probe else '',
+            )
+        except (OSError, ValueError, Image.DecompressionBombError) as error:
+            logging.error("Failed to store '{0}' image:\n{1}".format(
+                url, error,
+            ))
+            return None
+
+    def _variants(self, image_bytes: bytes, etag: str) -> LocalImage:
+        name = digest(image_bytes)
+        try:
+            image = Image.open(io.BytesIO(image_bytes))
+        except UnidentifiedImageError:
+            raise ValueError('Unsupported image format.')
+        image = ImageOps.exif_transpose(image)
+        widths = _widths(image.width, self.widths)
+        srcsets = {
+            image_format: self._srcset(image, name, widths, image_format)
+            for image_format in QUALITIES
+            if features.check(image_format)
+        }
+        return LocalImage(
+            src='{0}/{1}'.format(
+                self.prefix, _file_name(name, widths[-1], WEBP),
+            ),
+            thumbnail='{0}/{1}'.format(
+                self.prefix, _file_name(name, widths[len(widths) // 2], WEBP),
+            ),
+            srcsets=srcsets,
+            width=widths[-1],
+            height=image.height * widths[-1] // image.width or 1,
+            etag=etag,
+            stored=time.time(),
+        )
+
+    def _srcset(
+        self, image: Image.Image, name: str, widths: list, image_format: str,
+    ) -> str:
+        return ', '.join(
+            '{0}/{1} {2}w'.format(
+                self.prefix,
+                _encode(image, self.path, name, width, image_format),
+                width,
+            )
+            for width in widths
+        )
+
+    def _load(
+        self, front_matters: list[dict], pool: ThreadPoolExecutor,
+    ) -> list[str]:
+        used = {
+            url
+            for front_matter in front_matters
+            for url in front_matter.get(IMAGES, [])
+        }
+        images = {}
+        if os.path.isfile(self.manifest):
+            try:
+                images = {
+                    url: LocalImage(**image)
+                    for url, image in read_json(self.manifest).items()
+                    if url in used and not image['src'].endswith('.svg')
+                }
+            except (TypeError, ValueError) as read_error:
+                logging.warning(read_error)
+        # Images are probed for their entity tag at the same time.
+        self.images = {
+            url: image
+            for (url, image), fresh in zip(images.items(), pool.map(
+                LocalImage.fresh, images.values(), images.keys(),
+            ))
+            if fresh and os.path.isfile(os.path.join(
+                self.path, os.path.basename(image.src),
+            ))
+        }
+        return sorted(used - self.images.keys())
+
+    def _save(self) -> None:
+        try:
+            write_json(self.manifest, {
+                url: asdict(image) for url, image in self.images.items()
+            })
+        except ValueError as write_error:
+            logging.error(write_error)
+            return
+        names = {image.name for image in self.images.values()}
+        for file_name in sorted(os.listdir(self.path)):
+            if file_name.split('-')[0] in names:
+                continue
+            logging.info("Removing '{0}' image...".format(file_name))
+            try:
+                os.remove(os.path.join(self.path, file_name))
+            except OSError as remove_error:
+                logging.error(remove_error)
+
+
+def _widths(width: int, widths: tuple) -> list[int]:
+    # Never upscale: variants wider than the image are stored at its width.
+    return sorted({min(variant, width) for variant in widths})
+
+
+def _file_name(name: str, width: int, image_format: str) -> str:
+    return '{0}-{1}.{2}'.format(name, width, image_format)
+
+
+def _encode(
+    image: Image.Image, path: str, name: str, width: int, image_format: str,
+) -> str:
+    file_name = _file_name(name, width, image_format)
+    target = os.path.join(path, file_name)
+    if os.path.isfile(target):
+        return file_name
+    if image.mode not in {'RGB', 'RGBA'}:
+        image = image.convert('RGBA')
+    height = image.height * width // image.width or 1
+    # Identical images at other URLs may be written concurrently.
+    temporary = '{0}.{1}.tmp'.format(target, threading.get_ident())
+    image.resize((width, height), Image.Resampling.LANCZOS).save(
+        temporary, image_format, quality=QUALITIES[image_format],
+    )
+    os.replace(temporary, target)
+    return file_name
+
+
+def _rewrite(front_matter: dict, stored: dict[str, LocalImage]) -> None:
+    urls = front_matter[IMAGES]
+    images = [stored.get(url) for url in urls]
+    front_matter[IMAGES] = [
+        image.src if image else url for url, image in zip(urls, images)
+    ]
+    front_matter['thumbnails'] = [
+        image.thumbnail if image else url for url, image in zip(urls, images)
+    ]
+    front_matter['srcsets'] = [
+        image.srcsets if image else {} for image in images
+    ]
+    front_matter['dimensions'] = [
+        {'width': image.width, 'height': image.height} if image else probed
+        for image, probed in zip(images, ImageUrl.dimensions(urls))
+    ]
@@ -0,0 +1,209 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Run work in isolated worker processes."""
+
+import logging
+import multiprocessing
+import os
+import resource
+import time
+import warnings
+from dataclasses import dataclass
+from logging.handlers import QueueHandler
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Optional
+
+MIB = 1024 * 1024
+# Workers are forked from a server process started without threads, so
+# they never inherit a lock held by a thread of the build. Work functions
+# and their arguments are pickled, and workers load anything else they
+# need themselves. Neither do they inherit the logging configuration, so
+# they send their log records to the build, which handles them.
+CONTEXT = multiprocessing.get_context('forkserver')
+
+
+@dataclass
+class _Worker:
+    name: str
+    process: Any
+    deadline: float
+
+    def stop(self) -> None:
+        self.process.kill()
+        self.process.join()
+
+
+@dataclass
+class Isolation:
+    """
+    Isolated worker processes with hard limits.
+
+    A worker that runs out of time is killed, and one that runs out of
+    memory fails, while the other workers keep going.
+    """
+
+    # Number of workers at a time.
+    jobs: int = 1
+    # Wall-clock time of a worker, in seconds.
+    timeout: Optional[float] = None
+    # Memory a worker may allocate on top of what it starts with, in MiB.
+    memory: Optional[int] = None
+
+    def run(
+        self,
+        work: Callable[..., Any],
+        inputs: dict[str, Any],
+        *args: Any,
+    ) -> dict[str, Any]:
+        """
+        Run work on each input in its own worker.
+
+        Failed workers are logged and left out. Records logged by the
+        workers, and their warnings, go to the handlers of the build as
+        they are received. The module of the work function is imported by
+        the server the workers are forked from, if not yet started, so
+        workers do not import it again.
+
+        Parameters:
+            work: Work function, which may raise ValueError. It must be
+                picklable, as must its arguments.
+            inputs: Work inputs by name, passed as first argument.
+            args: Other arguments of the work function.
+
+        Returns:
+            Results of the workers which succeeded, in input order.
+        """
+        CONTEXT.set_forkserver_preload([work.__module__])
+        outcomes: dict[str, Any] = {}
+        waiting = list(inputs.items())
+        running: dict[Connection, _Worker] = {}
+        while waiting or running:
+            while waiting and len(running) < max(self.jobs, 1):
+                receiver, worker = self._start(work, args, *waiting.pop(0))
+                running[receiver] = worker
+            self._receive(running, outcomes)
+            self._expire(running, outcomes)
+        return {
+            name: outcomes[name]
+            for name in inputs
+            if not _failed(name, outcomes[name])
+        }
+
+    def _start(
+        self,
+        work: Callable[..., Any],
+        args: tuple[Any, ...],
+        name: str,
+        argument: Any,
+    ) -> tuple[Connection, _Worker]:
+        receiver, sender = CONTEXT.Pipe(duplex=False)
+        process = CONTEXT.Process(
+            target=_work,
+            args=(
+                sender,
+                work,
+                (argument, *args),
+                self.memory,
+                logging.getLogger().getEffectiveLevel(),
+            ),
+        )
+        process.start()
+        sender.close()
+        deadline = time.monotonic() + (self.timeout or float('inf'))
+        return receiver, _Worker(name, process, deadline)
+
+    def _receive(
+        self,
+        running: dict[Connection, _Worker],
+        outcomes: dict[str, Any],
+    ) -> None:
+        # Workers send their log records, then their outcome.
+        deadline = min(worker.deadline for worker in running.values())
+        for receiver in wait(list(running), _timeout(deadline)):
+            try:
+                message = receiver.recv()
+            except EOFError:
+                message = ValueError('Worker exited without a result.')
+            if isinstance(message, logging.LogRecord):
+                logging.getLogger(message.name).handle(message)
+                continue
+            outcomes[running[receiver].name] = message
+            running.pop(receiver).stop()
+
+    def _expire(
+        self,
+        running: dict[Connection, _Worker],
+        outcomes: dict[str, Any],
+    ) -> None:
+        for receiver, worker in list(running.items()):
+            if worker.deadline <= time.monotonic():
+                outcomes[worker.name] = ValueError(
+                    'Timed out after {0} s.'.format(self.timeout),
+                )
+                running.pop(receiver).stop()
+
+
+class _RecordHandler(QueueHandler):
+    # Sends log records through the pipe of the worker outcome, so a killed
+    # worker can not leave a lock or a partial record shared with others.
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.queue.send(record)
+
+
+def _work(
+    sender: Connection,
+    work: Callable[..., Any],
+    args: tuple[Any, ...],
+    memory: Optional[int],
+    level: int,
+) -> None:
+    records = _RecordHandler(sender)
+    # The handlers of the build format the records, once received.
+    logging.basicConfig(
+        level=level, format='%(message)s', handlers=[records], force=True,
+    )
+    # Warnings are logged like in the build.
+    warnings.simplefilter('always')
+    warnings.showwarning = lambda message, *_: logging.warning(
+        'Warning: {0}'.format(message),
+    )
+    if memory:
+        limit = _address_space() + memory * MIB
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    try:
+        outcome = work(*args)
+    except MemoryError:
+        outcome = ValueError(
+            'Exceeded the memory limit of {0} MiB.'.format(memory),
+        )
+    except ValueError as work_error:
+        # Errors such as validation errors may not pickle.
+        outcome = ValueError(str(work_error))
+    # Threads left by the work may still log.
+    with records.lock:
+        sender.send(outcome)
+
+
+def _timeout(deadline: float) -> Optional[float]:
+    if deadline == float('inf'):
+        return None
+    return max(deadline - time.monotonic(), 0)
+
+
+def _failed(name: str, outcome: Any) -> bool:
+    if isinstance(outcome, ValueError):
+        logging.error("Failed to run '{0}' worker:\n{1}".format(name, outcome))
+        return True
+    return False
+
+
+def _address_space() -> int:
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[0]) * page_size
+    except (OSError, ValueError):
+        return 0
@@ -73,6 +73,26 @@ class SpdxLicenseList:
                 path, file_error,
             ))
 
+    @classmethod
+    def from_list(cls, licenses: list[License]):
+        """
+        Load SPDX license list data already parsed, e.g. by another process.
+
+        Parameters:
+            licenses: License data.
+        """
+        cls._spdx_license_list = list(licenses)
+
+    @classmethod
+    def licenses(cls) -> list[License]:
+        """
+        Get the loaded SPDX license list data.
+
+        Returns:
+            License data.
+        """
+        return list(cls._spdx_license_list)
+
     @classmethod
     @validate_call
     def get_license(cls, license_id: AnnotatedStr) -> License:
@@ -7,9 +7,10 @@
 
 from typing import Annotated, Literal, Optional
 
+from probe import ImageUrlList
 from pydantic import Field
 from schema import AnnotatedStr, AnnotatedStrList, BaseModelForbidExtra, Schema
-from url import Url, UrlContent, UrlList
+from url import Url, UrlContent
 
 
 class Link(BaseModelForbidExtra):
@@ -30,7 +31,7 @@ class Manifest(Schema):
     description: UrlContent = Field(exclude=True)
     website: Url
     licenses: Optional[AnnotatedStrList] = Field(default=None, exclude=True)
-    images: Optional[UrlList] = None
+    images: Optional[ImageUrlList] = None
     documentation: Optional[Url] = None
     issues: Optional[Url] = None
     latest_release: Optional[Url] = None
@@ -4,41 +4,129 @@
 
 """Load news."""
 
+import datetime
 import logging
+import re
+import unicodedata
+from typing import Sequence
 
+from archive import LATEST, Dated, newest, summary, write_archive
 from config import News, Project
+from feeds import AtomFeeds
+from files import digest
 from hugo import Page, Section
+from probe import ImageUrl
+from search import SearchRecord
+
+# Site path of the news section, which sets the URL of the news pages.
+URL = '/news/'
+SLUG_LENGTH = 48
+# Hex digits of the content digest telling apart news of the same name.
+HASH_LENGTH = 7
 
 
 class NewsPage(Page):
     """News Hugo page."""
 
     @classmethod
-    def from_config(cls, config: News) -> 'NewsPage':
+    def from_config(
+        cls, config: News, name: str, aliases: Sequence[str] = (),
+    ) -> 'NewsPage':
         """
         Create a news page from a configuration.
 
+        The URL and summary of the page are set in its front matter, so
+        Hugo, the archive and the feeds all use the same ones. The images
+        of the news are probed for their dimensions here rather than when
+        the news are loaded, so only retained news are probed.
+
         Parameters:
             config: News configuration.
+            name: Page name.
+            aliases: Other paths of the page, redirected to it.
 
         Returns:
             NewsPage: Instance of NewsPage class.
         """
         front_matter = config.model_dump(exclude_none=True)
         front_matter['project'] = config.project.manifest.name
+        front_matter['project_id'] = config.project.id
+        front_matter['url'] = '{0}{1}/'.format(URL, name)
+        front_matter['summary'] = summary(config.description or '')
+        images = front_matter.get('images')
+        if images:
+            front_matter['dimensions'] = _probe(images)
+        if aliases:
+            front_matter['aliases'] = list(aliases)
         return cls(front_matter=front_matter, markdown=config.description)
 
+    def search_record(self) -> SearchRecord:
+        """
+        Get the searchable fields of the page.
+
+        Returns:
+            Field values by search key.
+        """
+        return {
+            'title': self.front_matter['title'],
+            'filter': self.front_matter['project'],
+            'content': self.markdown or '',
+        }
+
+    def archive_record(self, name: str) -> dict:
+        """
+        Get the fields of the page listed by the news page.
+
+        The fields are those of the items of Hugo's index.json, which
+        leaves the news to the archive.
+
+        Parameters:
+            name: Page name.
+
+        Returns:
+            Field values by key.
+        """
+        record = self.search_record()
+        record.pop('content')
+        record.update(
+            name=name,
+            text=self.front_matter['summary'],
+            url=self.front_matter['url'],
+            date='{0:%b} {0.day}, {0.year}'.format(_date(self.front_matter)),
+        )
+        images = self.front_matter.get(
+            'thumbnails', self.front_matter.get('images'),
+        )
+        if images:
+            record['image'] = images[0]
+        return record
+
 
 class NewsSection(Section):
     """News Hugo section."""
 
+    search_keys = (('title', 3), ('filter', 2), ('content', 1))
+    # index.json leaves the page content to the search shards.
+    fuse_keys = search_keys[:-1]
+
     @classmethod
-    def from_config(cls, configs: list[Project]) -> 'NewsSection':
+    def from_config(
+        cls, configs: list[Project], retention: int = 0,
+    ) -> 'NewsSection':
         """
         Create a news section from a list of configurations.
 
+        Older news past the retention are dropped before their pages are
+        created, so their descriptions are neither summarized nor their
+        images probed. The retained news are not narrowed further to the
+        newest ones: each is a Hugo page of its own, whose front matter
+        holds its summary and image dimensions, and the archive shards list
+        all of them. Only the latest shard and the feeds are bounded to the
+        newest pages.
+
         Parameters:
             configs: Project configurations.
+            retention: Number of newest news kept per project, all if 0.
 
         Returns:
             NewsSection: Instance of NewsSection class.
@@ -52,19 +140,143 @@ class NewsSection(Section):
                     project.id, enumerate_error,
                 ))
                 continue
-            news_section.update(cls._from_config(news))
+            news_section.update(cls._from_config(news, retention))
         return cls(news_section)
 
+    def timelines(self) -> dict[str, list[Dated]]:
+        """
+        Get the timeline of each project.
+
+        News of a project are already ordered by date, so sorting them is
+        linear.
+
+        Returns:
+            Dated page names, newest first, by project ID.
+        """
+        timelines: dict[str, list[Dated]] = {}
+        for name, page in self.data.items():
+            timelines.setdefault(page.front_matter['project_id'], []).append(
+                (_date(page.front_matter), name),
+            )
+        return {
+            project: sorted(timeline, reverse=True)
+            for project, timeline in timelines.items()
+        }
+
+    def write_archive(self, path: str, latest: int = LATEST) -> None:
+        """
+        Write the pages as time-ordered archive shards.
+
+        The news page loads the newest pages with the page and older pages
+        by year, so its first paint does not depend on the news history.
+        The project timelines are merged as the shards are written.
+
+        Parameters:
+            path: Static files directory of the section page.
+            latest: Number of pages loaded with the page.
+        """
+        write_archive(
+            path,
+            newest(self.timelines().values()),
+            lambda name: self.data[name].archive_record(name),
+            latest,
+        )
+
+    def write_feeds(self, path: str, sources: str) -> None:
+        """
+        Update the Atom feeds of the news.
+
+        Parameters:
+            path: Static files directory of the section page.
+            sources: Hugo sources directory, with the site URL.
+        """
+        try:
+            feeds = AtomFeeds.from_hugo(path, sources, URL)
+        except ValueError as feeds_error:
+            logging.error(feeds_error)
+            return
+        feeds.update(self.data, self.timelines())
+
     @classmethod
-    def _from_config(cls, config: list[News]):
+    def _from_config(cls, config: list[News], retention: int = 0):
         news_section = {}
-        for index, news in enumerate(config):
-            page = '{0}-{1}'.format(news.project.id, index + 1)
-            logging.info("Generating '{0}' page...".format(page))
+        names = _names(config)
+        for index in _retained(len(config), retention):
+            news = config[index]
+            logging.info("Generating '{0}' page...".format(names[index]))
             try:
-                news_section[page] = NewsPage.from_config(news)
+                news_section[names[index]] = NewsPage.from_config(
+                    news, names[index], [
+                        # News used to be numbered from the oldest.
+                        '{0}{1}-{2}/'.format(
+                            URL, news.project.id, index + 1,
+                        ),
+                    ],
+                )
             except ValueError as news_error:
                 logging.error("Failed to generate '{0}' page:\n{1}".format(
-                    page, news_error,
+                    names[index], news_error,
                 ))
         return news_section
+
+
+def _probe(images: list[str]) -> list[dict[str, int]]:
+    for url in images:
+        try:
+            ImageUrl.probe(url)
+        except ValueError as probe_error:
+            logging.warning(probe_error)
+    return ImageUrl.dimensions(images)
+
+
+def _date(front_matter: dict) -> datetime.date:
+    return datetime.date.fromisoformat(str(front_matter['date']))
+
+
+def _names(config: list[News]) -> list[str]:
+    """
+    Name news pages after their project, date and title.
+
+    Names do not depend on the later news, so adding or removing a news
+    keeps the names of the others. News of the same project, date and title
+    are told apart by a digest of their content, and then by a counter, but
+    the oldest of them keeps the bare name, so it is not renamed once a
+    newer one arrives.
+
+    Parameters:
+        config: News of a project, oldest first.
+
+    Returns:
+        Page name of each news.
+    """
+    names = []
+    # Uses of each name, or of each name before its counter.
+    counts: dict[str, int] = {}
+    for news in config:
+        name = '-'.join(filter(None, (
+            news.project.id, str(news.date), _slug(news.title),
+        )))
+        if counts.get(name):
+            name = '{0}-{1}'.format(name, digest('{0}\n{1}'.format(
+                news.title, news.description or '',
+            ))[:HASH_LENGTH])
+        key = name
+        if counts.get(key):
+            name = '{0}-{1}'.format(key, counts[key] + 1)
+        counts[key] = counts.get(key, 0) + 1
+        counts.setdefault(name, 1)
+        names.append(name)
+    return names
+
+
+def _slug(title: str) -> str:
+    ascii_title = unicodedata.normalize('NFKD', title).encode(
+        'ascii', 'ignore',
+    ).decode()
+    slug = re.sub('[^a-z0-9]+', '-', ascii_title.lower())
+    return slug[:SLUG_LENGTH].strip('-')
+
+
+def _retained(count: int, retention: int) -> range:
+    # News are ordered oldest first.
+    return range(max(count - retention, 0) if retention else 0, count)
@@ -0,0 +1,344 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Probe images."""
+
+import logging
+import re
+import struct
+import warnings
+from dataclasses import dataclass
+from functools import partial
+from typing import Annotated, Any, ClassVar, Optional
+
+import requests
+from pydantic import Field
+
+from url import Url
+
+Size = tuple[int, int]
+
+SVG_TAG = re.compile(rb'<svg\b[^>]*>', re.IGNORECASE)
+SVG_LENGTH = r'\b{0}\s*=\s*["\']\s*([0-9.]+)\s*(?:px)?\s*["\']'
+SVG_VIEW_BOX = re.compile(
+    r'\bviewBox\s*=\s*["\']\s*[-0-9.]+[\s,]+[-0-9.]+[\s,]+([0-9.]+)' +
+    r'[\s,]+([0-9.]+)',
+)
+JPEG_MARKER = 0xFF
+# Start of frame markers, which hold the dimensions of a JPEG image.
+JPEG_FRAMES = b'\xc0\xc1\xc2\xc3\xc5\xc6\xc7\xc9\xca\xcb\xcd\xce\xcf'
+PNG_SIZE = 16
+GIF_SIZE = 6
+WEBP_FORMAT = 8
+VP8_SIZE = 26
+VP8_MASK = 0x3FFF
+VP8L_SIZE = 21
+VP8L_HEIGHT = 14
+VP8X_SIZE = 24
+VP8X_HIGH = 16
+# Bytes fetched to probe an image, then more if its size was not found.
+HEADER_SIZES = (4096, 65536)
+PARTIAL_CONTENT = 206
+NOT_MODIFIED = 304
+
+
+@dataclass
+class ImageProbe:
+    """Dimensions of an image, as probed from its first bytes."""
+
+    width: int
+    height: int
+    # Entity tag, or last modification date if the host sends no tag.
+    etag: str = ''
+    # SVG image, which may carry scripts and is never stored locally.
+    vector: bool = False
+
+    def dimensions(self) -> dict[str, int]:
+        """
+        Get the dimensions, as front matter.
+
+        Returns:
+            Width and height.
+        """
+        return {'width': self.width, 'height': self.height}
+
+    def conditions(self) -> dict[str, str]:
+        """
+        Get the headers requesting the image only if it changed.
+
+        Returns:
+            Conditional request headers, none if the image had neither an
+            entity tag nor a modification date.
+        """
+        if not self.etag:
+            return {}
+        if self.etag.startswith(('"', 'W/"')):
+            return {'If-None-Match': self.etag}
+        return {'If-Modified-Since': self.etag}
+
+    @classmethod
+    def load(cls, probes: dict[str, dict]) -> dict[str, 'ImageProbe']:
+        """
+        Load probes, as saved by the build state.
+
+        Parameters:
+            probes: Probe fields, by URL.
+
+        Returns:
+            Probes by URL, none if they are not valid.
+        """
+        try:
+            return {url: cls(**probe) for url, probe in probes.items()}
+        except (AttributeError, TypeError) as load_error:
+            logging.warning('Invalid image probes:\n{0}'.format(load_error))
+            return {}
+
+
+class ImageUrl(Url):
+    """
+    Represent an image URL.
+
+    Instead of a HEAD request, validation fetches the first bytes of the
+    image with a range request, which both checks the URL and gives the
+    image dimensions. Only those bytes are read, even from hosts which
+    ignore the range and send the whole image.
+
+    Probes of the last build, kept by the build state, are revalidated
+    with a conditional range request: a host which answers that the image
+    is unchanged sends no bytes, and one which does not sends the first
+    bytes of the changed image, so an image takes one request either way.
+    Images whose host sends neither an entity tag nor a modification date
+    are probed again by every build.
+    """
+
+    # Probed images, so each image is only probed once per run.
+    probes: ClassVar[dict[str, ImageProbe]] = {}
+    # Probes of the last build, revalidated before they are reused.
+    stored: ClassVar[dict[str, ImageProbe]] = {}
+
+    @classmethod
+    def dimensions(cls, urls: list[str]) -> list[dict[str, int]]:
+        """
+        Get the probed dimensions of images.
+
+        Parameters:
+            urls: Image URLs.
+
+        Returns:
+            Width and height of each image, empty if it was not probed.
+        """
+        return [
+            cls.probes[url].dimensions() if url in cls.probes else {}
+            for url in urls
+        ]
+
+    @classmethod
+    def changed(cls, url: str, etag: str) -> bool:
+        """
+        Check if an image changed since it had an entity tag.
+
+        The image is probed unless it already was. An image which fails to
+        probe is taken as unchanged, so its stored copy is kept while its
+        host is down.
+
+        Parameters:
+            url: Image URL.
+            etag: Previous entity tag of the image.
+
+        Returns:
+            True if the image was probed with another entity tag.
+        """
+        try:
+            probe = cls.probe(url)
+        except ValueError:
+            return False
+        return bool(probe.etag and etag) and probe.etag != etag
+
+    @classmethod
+    def probe(cls, url: str) -> ImageProbe:
+        """
+        Probe the dimensions of an image.
+
+        Parameters:
+            url: Image URL.
+
+        Returns:
+            Image dimensions and entity tag.
+
+        Raises:
+            ValueError: If the request fails or the dimensions are not found.
+        """
+        if url not in ImageUrl.probes:
+            ImageUrl.probes[url] = cls._probe_uncached(url)
+        return ImageUrl.probes[url]
+
+    def download(self) -> bytes:
+        """
+        Download the image.
+
+        Returns:
+            Image bytes.
+
+        Raises:
+            ValueError: If the request fails.
+        """
+        return self._get(self.url).content
+
+    @classmethod
+    def _validate(cls, input_value: Any) -> 'ImageUrl':
+        """
+        Validate input value.
+
+        Parameters:
+            input_value: Value to validate.
+
+        Returns:
+            An ImageUrl instance.
+        """
+        if isinstance(input_value, cls):
+            return input_value
+        if isinstance(input_value, str):
+            try:
+                cls.probe(input_value)
+            except ValueError as probe_error:
+                warnings.warn(str(probe_error))
+            return cls(input_value)
+        warnings.warn("Invalid value: '{0}'".format(input_value))
+
+    @classmethod
+    def _probe_uncached(cls, url: str) -> ImageProbe:
+        # Only images stored with an entity tag or modification date are
+        # requested conditionally, and can be answered as not modified.
+        stored = ImageUrl.stored.get(url, ImageProbe(0, 0))
+        for header_size in HEADER_SIZES:
+            response = cls._get(url, headers={
+                'Range': 'bytes=0-{0}'.format(header_size - 1),
+                **stored.conditions(),
+            }, stream=True)
+            if response.status_code == NOT_MODIFIED:
+                response.close()
+                return stored
+            header = cls._read_header(response, header_size)
+            size = image_size(header)
+            if size:
+                return ImageProbe(
+                    *size,
+                    etag=response.headers.get('ETag') or response.headers.get(
+                        'Last-Modified', '',
+                    ),
+                    vector=_svg(header) == size,
+                )
+            if response.status_code != PARTIAL_CONTENT:
+                break
+        raise ValueError("Failed to find the size of '{0}' image.".format(url))
+
+    @classmethod
+    def _read_header(cls, response: requests.Response, size: int) -> bytes:
+        # The connection is closed once the bytes are read, so the rest of
+        # the image is never downloaded. A host which ignores the range
+        # sends the whole image, which is read up to the largest header size
+        # rather than requested again. Reading stops once the dimensions
+        # are found.
+        if response.status_code != PARTIAL_CONTENT:
+            size = HEADER_SIZES[-1]
+        header = b''
+        try:
+            for chunk in response.iter_content(HEADER_SIZES[0]):
+                header += chunk
+                if len(header) >= size or image_size(header):
+                    break
+        except requests.exceptions.RequestException as read_error:
+            raise ValueError("Failed to read '{0}' image:\n{1}".format(
+                response.url, read_error,
+            ))
+        finally:
+            response.close()
+        return header[:size]
+
+
+ImageUrlList = Annotated[list[ImageUrl], Field(min_length=1)]
+
+
+def image_size(header: bytes) -> Optional[Size]:
+    """
+    Parse the dimensions of an image from its first bytes.
+
+    PNG, GIF, JPEG, WebP and SVG images are supported. JPEG images need
+    the bytes up to their start of frame, the others only a few bytes.
+
+    Parameters:
+        header: First bytes of the image.
+
+    Returns:
+        Width and height, or None if they are not in the bytes.
+    """
+    parsers = (
+        (
+            b'\x89PNG\r\n\x1a\n',
+            partial(struct.unpack_from, '>II', offset=PNG_SIZE),
+        ),
+        (b'GIF8', partial(struct.unpack_from, '<HH', offset=GIF_SIZE)),
+        (b'\xff\xd8', _jpeg),
+        (b'RIFF', _webp),
+    )
+    parser = next(
+        (parse for start, parse in parsers if header.startswith(start)),
+        _svg,
+    )
+    try:
+        return parser(header)
+    except (IndexError, ValueError, struct.error):
+        return None
+
+
+def _jpeg(header: bytes) -> Optional[Size]:
+    offset = 2
+    while header[offset] == JPEG_MARKER:
+        marker = header[offset + 1]
+        if marker in JPEG_FRAMES:
+            height, width = struct.unpack_from('>HH', header, offset + 5)
+            return width, height
+        if marker == JPEG_MARKER:
+            # Markers may be preceded by fill bytes.
+            offset += 1
+            continue
+        offset += 2 + struct.unpack_from('>H', header, offset + 2)[0]
+    return None
+
+
+def _webp(header: bytes) -> Optional[Size]:
+    if header.startswith(b'WEBPVP8 ', WEBP_FORMAT):
+        width, height = struct.unpack_from('<HH', header, VP8_SIZE)
+        return width & VP8_MASK, height & VP8_MASK
+    if header.startswith(b'WEBPVP8L', WEBP_FORMAT):
+        bits = struct.unpack_from('<I', header, VP8L_SIZE)[0]
+        return (bits & VP8_MASK) + 1, (bits >> VP8L_HEIGHT & VP8_MASK) + 1
+    if header.startswith(b'WEBPVP8X', WEBP_FORMAT):
+        width, high_width, height, high_height = struct.unpack_from(
+            '<HBHB', header, VP8X_SIZE,
+        )
+        return (
+            (width | high_width << VP8X_HIGH) + 1,
+            (height | high_height << VP8X_HIGH) + 1,
+        )
+    return None
+
+
+def _svg(header: bytes) -> Optional[Size]:
+    tag = SVG_TAG.search(header)
+    if not tag:
+        return None
+    attributes = tag.group().decode('utf-8', 'replace')
+    width = re.search(SVG_LENGTH.format('width'), attributes)
+    height = re.search(SVG_LENGTH.format('height'), attributes)
+    if width and height:
+        return _round(width.group(1)), _round(height.group(1))
+    view_box = SVG_VIEW_BOX.search(attributes)
+    if view_box:
+        return _round(view_box.group(1)), _round(view_box.group(2))
+    return None
+
+
+def _round(length: str) -> int:
+    return round(float(length))
@@ -9,6 +9,9 @@ import logging
 
 from config import Project
 from hugo import Page, Section
+from probe import ImageUrl
+from related import related_pages
+from search import SearchRecord
 
 
 class ProjectPage(Page):
@@ -30,19 +33,48 @@ class ProjectPage(Page):
             exclude_none=True,
             by_alias=True,
         ))
+        images = front_matter.get('images')
+        if images:
+            front_matter['dimensions'] = ImageUrl.dimensions(images)
         return cls(front_matter=front_matter, markdown=config.description)
 
+    def search_record(self) -> SearchRecord:
+        """
+        Get the searchable fields of the page.
+
+        Returns:
+            Field values by search key.
+        """
+        return {
+            'title': self.front_matter['title'],
+            'id': self.front_matter['id'],
+            'filter': self.front_matter.get('tags', []),
+            'content': self.markdown,
+        }
+
 
 class ProjectSection(Section):
     """Projects Hugo section."""
 
+    search_keys = (
+        ('title', 3),
+        ('id', 3),
+        ('filter', 2),
+        ('content', 1),
+    )
+    # index.json leaves the page content to the search shards.
+    fuse_keys = search_keys[:-1]
+
     @classmethod
-    def from_config(cls, configs: list[Project]) -> 'ProjectSection':
+    def from_config(
+        cls, configs: list[Project], related: int = 0,
+    ) -> 'ProjectSection':
         """
         Create a projects section from a list of configurations.
 
         Parameters:
             configs: Project configurations.
+            related: Maximum number of related projects per project.
 
         Returns:
             ProjectSection: Instance of ProjectSection class.
@@ -58,4 +90,23 @@ class ProjectSection(Section):
                 ))
                 continue
             projects[config.id] = project
-        return cls(projects)
+        section = cls(projects)
+        if related:
+            section.relate(related)
+        return section
+
+    def relate(self, count: int) -> None:
+        """
+        List the most similar projects of each project.
+
+        Projects are compared by the TF-IDF weights of their search tokens,
+        and the related projects are set as the 'related' front matter
+        field of the pages that have any.
+
+        Parameters:
+            count: Maximum number of related projects per project.
+        """
+        logging.info('Finding related projects...')
+        for name, names in related_pages(self, count).items():
+            if names:
+                self.data[name].front_matter['related'] = names
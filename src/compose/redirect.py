@@ -4,29 +4,57 @@
 
 """Load news."""
 
+import json
 import logging
 import os
+import re
+from collections import UserDict
+from typing import Optional, Sequence
+from urllib.parse import urlsplit
 
-from config import Redirect
+from config import Redirect, RedirectRule
+from files import write_text
 from hugo import Page, Section
+from trie import PLACEHOLDER, RedirectTrie
+from url import Url
 
 
 class RedirectPage(Page):
     """Redirect Hugo page."""
 
     @classmethod
-    def from_config(cls, config: Redirect) -> 'RedirectPage':
+    def from_config(
+        cls,
+        config: Redirect,
+        aliases: Sequence[Redirect] = (),
+        max_hops: Optional[int] = None,
+        collapse: bool = False,
+    ) -> 'RedirectPage':
         """
         Create a redirect page from a configuration.
 
         Parameters:
             config: Redirect configuration.
+            aliases: Other redirect configurations with the same target.
+            max_hops: Longest accepted redirect chain of the target, or None
+                to leave the target unresolved.
+            collapse: Redirect straight to the end of the chain.
 
         Returns:
             RedirectPage: Instance of RedirectPage class.
         """
         front_matter = config.model_dump()
         front_matter['url'] = os.path.join(config.url, 'index.html')
+        resolution = _resolve(config.target, max_hops)
+        if resolution:
+            front_matter.update(zip(('resolved', 'hops'), resolution))
+        if resolution and collapse:
+            front_matter['target'] = front_matter['resolved']
+        if aliases:
+            front_matter['aliases'] = [
+                '/{0}'.format(os.path.join(alias.url.strip('/'), 'index.html'))
+                for alias in aliases
+            ]
         return cls(front_matter=front_matter, markdown='')
 
 
@@ -34,25 +62,282 @@ class RedirectSection(Section):
     """Redirect Hugo section."""
 
     @classmethod
-    def from_config(cls, configs: list[Redirect]) -> 'RedirectSection':
+    def from_config(
+        cls,
+        configs: list[Redirect],
+        rules: Optional[list[RedirectRule]] = None,
+        max_hops: Optional[int] = None,
+        collapse: bool = False,
+    ) -> 'RedirectSection':
         """
         Create a redirect section from a list of configurations.
 
+        Redirects sharing a target are grouped into a single page, whose
+        other paths are Hugo aliases. Static hosts can not match rules, so
+        the paths listed by each rule are expanded to redirects first. Their
+        targets are not resolved, since the configuration already validated
+        the target of each rule once.
+
         Parameters:
             configs: Redirect configurations.
+            rules: Redirect rule configurations.
+            max_hops: Longest accepted redirect chain of a target, or None
+                to leave the targets unresolved.
+            collapse: Redirect straight to the end of the chains.
 
         Returns:
             RedirectSection: Instance of RedirectSection class.
         """
         redirect_section = {}
-        for index, config in enumerate(configs):
+        # Redirects are told apart from the rule paths by identity, as they
+        # may be equal.
+        configured = {id(config) for config in configs}
+        for name, (config, *aliases) in cls._group(configs, rules).items():
             logging.info("Generating '{0}' page...".format(config.url))
             try:
-                redirect = RedirectPage.from_config(config)
+                redirect_section[name] = RedirectPage.from_config(
+                    config,
+                    aliases,
+                    max_hops if id(config) in configured else None,
+                    collapse,
+                )
             except ValueError as redirect_error:
                 logging.error("Failed to generate '{0}' page:\n{1}".format(
                     config.url, redirect_error,
                 ))
-                continue
-            redirect_section[str(index)] = redirect
         return cls(redirect_section)
+
+    @classmethod
+    def _expand(cls, rules: list[RedirectRule]) -> list[Redirect]:
+        trie = RedirectTrie.from_rules(
+            (rule.url, rule.target) for rule in rules
+        )
+        return [
+            Redirect.model_construct(url=path, target=Url(trie.match(path)))
+            for rule in rules
+            for path in rule.paths or []
+        ]
+
+    @classmethod
+    def _group(
+        cls, configs: list[Redirect], rules: Optional[list[RedirectRule]],
+    ) -> dict[str, list[Redirect]]:
+        groups: dict[str, list[Redirect]] = {}
+        for config in configs + cls._expand(rules or []):
+            groups.setdefault(config.target.url, []).append(config)
+        return {
+            str(index): group for index, group in enumerate(groups.values())
+        }
+
+
+class RedirectMap(UserDict[str, str]):
+    """
+    Redirects compiled into a single map from site paths to targets.
+
+    Rules are kept as rules, since the map formats match them natively.
+    Redirects take precedence over rules.
+    """
+
+    formats = ('json', 'netlify', 'nginx')
+    files = ('redirects.json', '_redirects', 'redirects.conf')
+
+    def __init__(
+        self,
+        redirects: Optional[dict[str, str]] = None,
+        rules: Optional[RedirectTrie] = None,
+    ) -> None:
+        """
+        Initialize the redirect map.
+
+        Parameters:
+            redirects: Site paths and their targets.
+            rules: Redirect rules.
+        """
+        super().__init__(redirects or {})
+        self.rules = rules or RedirectTrie()
+
+    @classmethod
+    def from_config(
+        cls,
+        configs: list[Redirect],
+        rules: Optional[list[RedirectRule]] = None,
+        max_hops: Optional[int] = None,
+        collapse: bool = False,
+    ) -> 'RedirectMap':
+        """
+        Create a redirect map from a list of configurations.
+
+        The redirects are validated together: malformed paths and targets
+        are dropped, duplicates and redirects already covered by a rule are
+        merged and a path redirected to different targets keeps its first
+        target.
+
+        Parameters:
+            configs: Redirect configurations.
+            rules: Redirect rule configurations.
+            max_hops: Longest accepted redirect chain of a target, or None
+                to leave the targets unresolved.
+            collapse: Redirect straight to the end of the chains. Rule
+                targets are templates and are never collapsed.
+
+        Returns:
+            RedirectMap: Instance of RedirectMap class.
+        """
+        redirect_map = cls(rules=RedirectTrie.from_rules(
+            (rule.url, rule.target) for rule in rules or []
+        ))
+        for config in configs:
+            logging.info("Compiling '{0}' redirect...".format(config.url))
+            resolution = _resolve(config.target, max_hops)
+            target = resolution[0] if resolution and collapse else None
+            try:
+                redirect_map.add(config.url, target or config.target.url)
+            except ValueError as redirect_error:
+                logging.error("Failed to compile '{0}' redirect:\n{1}".format(
+                    config.url, redirect_error,
+                ))
+        return redirect_map
+
+    def add(self, url: str, target: str) -> None:
+        """
+        Add a redirect to the map.
+
+        Parameters:
+            url: Site path to redirect.
+            target: Absolute target URL.
+
+        Raises:
+            ValueError: If the redirect is not valid or conflicts with an
+                existing one.
+        """
+        path = self._path(url)
+        if urlsplit(target).scheme not in {'http', 'https'}:
+            raise ValueError("Invalid target '{0}'.".format(target))
+        if self.data.get(path, target) != target:
+            raise ValueError("Conflicting targets '{0}' and '{1}'.".format(
+                self.data[path], target,
+            ))
+        if self.rules.match(path) == target:
+            logging.info("Redirect '{0}' is covered by a rule.".format(path))
+            return
+        self.data[path] = target
+
+    def render(self, map_format: str) -> str:
+        """
+        Render the redirect map.
+
+        Parameters:
+            map_format: One of 'json', 'netlify' or 'nginx'.
+
+        Returns:
+            Redirect map string.
+
+        Raises:
+            ValueError: If the format is not supported.
+        """
+        redirects = sorted(self.data.items())
+        if map_format == 'json':
+            return json.dumps({
+                'redirects': dict(redirects),
+                'rules': [
+                    {'url': path, 'target': target}
+                    for path, target in self.rules.rules
+                ],
+            }, indent=2)
+        if map_format == 'netlify':
+            return ''.join(
+                '{0} {1} 301\n'.format(path, target)
+                for path, target in redirects + self.rules.rules
+            )
+        if map_format == 'nginx':
+            # Paths are stored without their trailing slash, which nginx
+            # keeps in $uri, so each redirect is also mapped with it. nginx
+            # tries exact keys before the rule regexes, which would
+            # otherwise match the slash path.
+            redirects = [
+                (key, redirect[1])
+                for redirect in redirects
+                for key in sorted({
+                    redirect[0], '{0}/'.format(redirect[0].rstrip('/')),
+                })
+            ]
+            return 'map $uri $redirect_target {{\n{0}}}\n'.format(''.join(
+                '    {0} {1};\n'.format(_quote(path), _quote(target))
+                for path, target in redirects + [
+                    _nginx_rule(path, target)
+                    for path, target in self.rules.rules
+                ]
+            ))
+        raise ValueError("Unsupported format '{0}'.".format(map_format))
+
+    def write(self, path: str, map_format: str) -> None:
+        """
+        Write the redirect map to a file.
+
+        Parameters:
+            path: Static files directory path.
+            map_format: One of 'json', 'netlify' or 'nginx'.
+        """
+        try:
+            map_file = os.path.join(
+                path, self.files[self.formats.index(map_format)],
+            )
+        except ValueError:
+            logging.error("Unsupported format '{0}'.".format(map_format))
+            return
+        logging.info("Writing '{0}'...".format(map_file))
+        try:
+            self._write(map_file, self.render(map_format))
+        except OSError as write_error:
+            logging.error("Failed to write '{0}':\n{1}".format(
+                map_file, write_error,
+            ))
+
+    def _path(self, url: str) -> str:
+        source = urlsplit(url)
+        segments = source.path.strip('/').split('/')
+        invalid = source.scheme or source.netloc or '..' in segments
+        if invalid or any(char.isspace() for char in url):
+            raise ValueError("Invalid path '{0}'.".format(url))
+        return '/{0}'.format('/'.join(segments))
+
+    def _write(self, map_file: str, text: str) -> None:
+        os.makedirs(os.path.dirname(map_file), exist_ok=True)
+        write_text(map_file, text)
+
+
+def _quote(nginx_str: str) -> str:
+    return json.dumps(nginx_str, ensure_ascii=False)
+
+
+def _nginx_rule(pattern: str, target: str) -> tuple[str, str]:
+    regex = ''.join(
+        '/{0}'.format(_nginx_segment(segment))
+        for segment in pattern.strip('/').split('/')
+    )
+    # Like the trie, match paths with a trailing slash, which a final splat
+    # already captures.
+    slash = '' if pattern.endswith('*') else '/?'
+    return '~^{0}{1}$'.format(regex, slash), PLACEHOLDER.sub(r'$\1', target)
+
+
+def _nginx_segment(segment: str) -> str:
+    if segment == '*':
+        return '(?<splat>.+)'
+    if segment.startswith(':'):
+        return '(?<{0}>[^/]+)'.format(segment[1:])
+    return re.escape(segment)
+
+
+def _resolve(
+    target: Url, max_hops: Optional[int],
+) -> Optional[tuple[str, int]]:
+    if max_hops is None:
+        return None
+    try:
+        return target.resolve(max_hops)
+    except ValueError as resolve_error:
+        logging.warning("Failed to resolve '{0}':\n{1}".format(
+            target.url, resolve_error,
+        ))
+    return None
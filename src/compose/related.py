@@ -0,0 +1,154 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Find related pages."""
+
+import numpy as np
+from scipy import sparse
+
+from hugo import Section
+from search import SearchIndex
+
+BLOCK_SIZE = 256
+TERMS = 32
+TINY = 1e-12
+
+
+def tfidf(
+    search_index: SearchIndex, terms: int = TERMS,
+) -> sparse.csr_matrix:
+    """
+    Weight the tokens of the pages of an inverted search index.
+
+    Term frequencies are the sublinear token scores of the index, so the
+    tokens of heavier search keys weigh more. Only the heaviest tokens of
+    each page are kept, which bounds the cost of comparing pages, and rows
+    are normalized to unit length, so their dot products are cosine
+    similarities.
+
+    Parameters:
+        search_index: Inverted search index of a section.
+        terms: Maximum number of tokens per page.
+
+    Returns:
+        Page by token TF-IDF matrix, with pages in index order.
+    """
+    frequencies = _frequencies(search_index)
+    documents = 1 + np.bincount(
+        frequencies.indices, minlength=len(search_index),
+    )
+    pages = 1 + len(search_index.docs)
+    weights = _prune(sparse.csr_matrix(frequencies.multiply(
+        np.log(pages / documents) + 1,
+    )), terms)
+    norms = np.maximum(sparse.linalg.norm(weights, axis=1), TINY)
+    return sparse.diags(1 / norms) @ weights
+
+
+def neighbours(
+    vectors: sparse.csr_matrix, count: int, block_size: int = BLOCK_SIZE,
+) -> list[list[int]]:
+    """
+    Find the nearest neighbours of each row by cosine similarity.
+
+    Rows are compared a block at a time, so memory grows with the block
+    size times the number of rows, not with the square of the rows.
+
+    Parameters:
+        vectors: Row vectors of unit length.
+        count: Maximum number of neighbours per row.
+        block_size: Number of rows compared at a time.
+
+    Returns:
+        Neighbour row indexes of each row, by descending similarity, then
+        by index, without rows of zero similarity.
+    """
+    found: list[list[int]] = []
+    for start in range(0, vectors.shape[0], block_size):
+        found.extend(_block_neighbours(vectors, start, block_size, count))
+    return found
+
+
+def related_pages(
+    section: Section, count: int, block_size: int = BLOCK_SIZE,
+) -> dict[str, list[str]]:
+    """
+    Find the pages of a section most similar to each page.
+
+    Pages are compared by the TF-IDF weights of their search tokens.
+
+    Parameters:
+        section: Section whose pages have search records and which
+            defines the weights of its search keys.
+        count: Maximum number of related pages per page.
+        block_size: Number of pages compared at a time.
+
+    Returns:
+        Names of the related pages, most similar first, by page name.
+    """
+    search_index = SearchIndex.from_section(section)
+    if not search_index or count < 1:
+        return {name: [] for name in search_index.docs}
+    found = neighbours(tfidf(search_index), count, block_size)
+    return {
+        name: [search_index.docs[ordinal] for ordinal in found[row]]
+        for row, name in enumerate(search_index.docs)
+    }
+
+
+def _frequencies(search_index: SearchIndex) -> sparse.csr_matrix:
+    postings = np.array([
+        (ordinal, column, score)
+        for column, token_postings in enumerate(search_index.values())
+        for ordinal, score in token_postings.items()
+    ]).reshape(-1, 3)
+    return sparse.csr_matrix(
+        (
+            1 + np.log(postings[..., 2]),
+            (postings[..., 0], postings[..., 1]),
+        ),
+        shape=(len(search_index.docs), len(search_index)),
+    )
+
+
+def _prune(weights: sparse.csr_matrix, terms: int) -> sparse.csr_matrix:
+    # Rank the entries of each row by descending weight, then keep the
+    # first ones, with no loop over the rows.
+    lengths = np.diff(weights.indptr)
+    rows = np.repeat(np.arange(lengths.size), lengths)
+    order = np.lexsort((-weights.data, rows))
+    starts = weights.indptr[rows[order]]
+    kept = order[np.arange(order.size) - starts < terms]
+    return sparse.csr_matrix(
+        (weights.data[kept], (rows[kept], weights.indices[kept])),
+        shape=weights.shape,
+    )
+
+
+def _block_neighbours(
+    vectors: sparse.csr_matrix, start: int, block_size: int, count: int,
+) -> list[list[int]]:
+    block = vectors[start:start + block_size]
+    similarity = (block @ vectors.T).toarray()
+    rows = np.arange(similarity.shape[0])
+    similarity[rows, rows + start] = 0
+    partition = np.argpartition(
+        -similarity, min(count, similarity.shape[1] - 1), axis=1,
+    )
+    return _top(similarity, partition[..., :count])
+
+
+def _top(similarity: np.ndarray, partition: np.ndarray) -> list[list[int]]:
+    # Sort the top columns by descending score, ties in column order, so
+    # the order does not depend on the partition.
+    candidates = np.sort(partition, axis=1)
+    scores = np.take_along_axis(similarity, candidates, axis=1)
+    order = np.argsort(-scores, axis=1, kind='stable')
+    return [
+        row_candidates[row_scores > 0].tolist()
+        for row_candidates, row_scores in zip(
+            np.take_along_axis(candidates, order, axis=1),
+            np.take_along_axis(scores, order, axis=1),
+        )
+    ]
@@ -49,6 +49,15 @@ class Repository(StrictUrl, ABC):
             path: Path to the file to fetch from the Git repository.
         """
 
+    @abstractmethod
+    def revision(self) -> str:
+        """
+        Abstract method to get the revision of the default branch.
+
+        Returns:
+            Commit hash of the default branch.
+        """
+
     @classmethod
     def _validate(cls, input_value: Any) -> 'Repository':
         """
@@ -84,12 +93,27 @@ class GitHubRepository(Repository):
             File contents.
         """
         url = 'https://api.github.com/repos/{0}/contents/{1}'.format(
-            re.search(r'^https://github\.com/(.+?)\.git', self.url).group(1),
-            path,
+            self._name(), path,
         )
         headers = {'Accept': 'application/vnd.github.v3.raw'}
         return self._get(url, headers=headers).text
 
+    def revision(self) -> str:
+        """
+        Get the revision of the default branch of the GitHub repository.
+
+        Returns:
+            Commit hash of the default branch.
+        """
+        url = 'https://api.github.com/repos/{0}/commits/HEAD'.format(
+            self._name(),
+        )
+        headers = {'Accept': 'application/vnd.github.sha'}
+        return self._get(url, headers=headers).text.strip()
+
+    def _name(self) -> str:
+        return re.search(r'^https://github\.com/(.+?)\.git', self.url).group(1)
+
 
 class GitLabRepository(Repository):
     """GitLab repository."""
@@ -107,19 +131,43 @@ class GitLabRepository(Repository):
         Raises:
             ValueError: If requesting the file fails.
         """
-        match = re.search(
-            r'^https://((?:gitlab\.com|gitlab\.cern\.ch))/(.+?)\.git',
-            self.url,
-        )
-        url = 'https://{0}/api/v4/projects/{1}'.format(
-            match.group(1),
-            quote(match.group(2), safe=''),
-        )
+        match = self._match()
         try:
-            default_branch = self._get(url).json()['default_branch']
+            default_branch = self._get(self._api_url()).json()[
+                'default_branch'
+            ]
         except (TypeError, json.JSONDecodeError, KeyError) as json_error:
             raise ValueError('Failed to load JSON:\n{0}'.format(json_error))
         url = 'https://{0}/{1}/-/raw/{2}/{3}'.format(
             match.group(1), match.group(2), default_branch, path,
         )
         return self._get(url).text
+
+    def revision(self) -> str:
+        """
+        Get the revision of the default branch of the GitLab repository.
+
+        Returns:
+            Commit hash of the default branch.
+
+        Raises:
+            ValueError: If requesting the revision fails.
+        """
+        url = '{0}/repository/commits?per_page=1'.format(self._api_url())
+        try:
+            return self._get(url).json()[0]['id']
+        except (TypeError, json.JSONDecodeError, LookupError) as json_error:
+            raise ValueError('Failed to load JSON:\n{0}'.format(json_error))
+
+    def _match(self) -> re.Match:
+        return re.search(
+            r'^https://((?:gitlab\.com|gitlab\.cern\.ch))/(.+?)\.git',
+            self.url,
+        )
+
+    def _api_url(self) -> str:
+        match = self._match()
+        return 'https://{0}/api/v4/projects/{1}'.format(
+            match.group(1),
+            quote(match.group(2), safe=''),
+        )
@@ -0,0 +1,212 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Build search indexes."""
+
+import logging
+import os
+import re
+from collections import Counter, UserDict
+from dataclasses import asdict
+from typing import Iterable, Optional, Union
+
+from archive import read_archive
+from facets import FacetCooccurrence, FacetIndex
+from files import read_json, write_json
+from fuse import FuseIndex
+from hugo import Page, Section
+
+TOKEN = re.compile(r'\w+')
+
+SearchRecord = dict[str, Union[str, list[str]]]
+Postings = dict[str, dict[int, int]]
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into search tokens.
+
+    The browser splits queries the same way, on runs of Unicode letters,
+    digits and underscores, after lowercasing them.
+
+    Parameters:
+        text: Text to split.
+
+    Returns:
+        Lowercase tokens.
+    """
+    return TOKEN.findall(text.lower())
+
+
+class SearchIndex(UserDict[str, dict[int, int]]):
+    """
+    Inverted search index of a Hugo section.
+
+    Maps each token to the ordinals of the pages containing it and their
+    scores. A score sums the weights of the search keys whose fields hold
+    the token, once per occurrence. Pages are ordered by name, which is
+    also the content file base name Hugo exposes to the search page.
+    """
+
+    def __init__(
+        self,
+        docs: Optional[list[str]] = None,
+        postings: Optional[Postings] = None,
+    ) -> None:
+        """
+        Initialize the search index.
+
+        Parameters:
+            docs: Page names by ordinal.
+            postings: Page ordinals and scores by token.
+        """
+        super().__init__(postings or {})
+        self.docs = docs or []
+
+    @classmethod
+    def from_section(cls, section: Section) -> 'SearchIndex':
+        """
+        Index the pages of a section.
+
+        Parameters:
+            section: Section whose pages have search records and which
+                defines the weights of its search keys.
+
+        Returns:
+            SearchIndex: Instance of SearchIndex class.
+        """
+        search_index = cls(sorted(section))
+        for ordinal, name in enumerate(search_index.docs):
+            for token, score in _scores(section[name], section).items():
+                search_index.data.setdefault(token, {})[ordinal] = score
+        return search_index
+
+    def shards(self, prefix_length: int) -> dict[str, dict[str, list]]:
+        """
+        Split the postings by token prefix.
+
+        Parameters:
+            prefix_length: Number of leading token characters naming the
+                shard of a token.
+
+        Returns:
+            Token postings, as pairs of page ordinal and score, by prefix.
+        """
+        shards: dict[str, dict[str, list]] = {}
+        for token, postings in self.data.items():
+            shards.setdefault(token[:prefix_length], {})[token] = sorted(
+                postings.items(),
+            )
+        return shards
+
+    def write(self, path: str, prefix_length: int = 2) -> None:
+        """
+        Write the index as a manifest and prefix shards.
+
+        The manifest 'search.json' lists the pages and shard prefixes, and
+        each shard 'search/<prefix>.json' holds the postings of the tokens
+        starting with its prefix, so a query only fetches the shards of
+        its terms. Stale shards are removed.
+
+        Parameters:
+            path: Static files directory of the section page.
+            prefix_length: Number of leading token characters naming the
+                shard of a token.
+        """
+        shards = self.shards(prefix_length)
+        logging.info("Writing '{0}' search index...".format(path))
+        try:
+            self._write(path, shards, prefix_length)
+        except (OSError, ValueError) as write_error:
+            logging.error("Failed to write '{0}' search index:\n{1}".format(
+                path, write_error,
+            ))
+
+    def _write(
+        self, path: str, shards: dict[str, dict], prefix_length: int,
+    ) -> None:
+        shard_path = os.path.join(path, 'search')
+        os.makedirs(shard_path, exist_ok=True)
+        files = {'{0}.json'.format(prefix) for prefix in shards}
+        for prefix, shard in shards.items():
+            write_json(
+                os.path.join(shard_path, '{0}.json'.format(prefix)),
+                shard,
+                compact=True,
+            )
+        for stale in set(os.listdir(shard_path)) - files:
+            os.remove(os.path.join(shard_path, stale))
+        write_json(os.path.join(path, 'search.json'), {
+            'docs': self.docs,
+            'prefix': prefix_length,
+            'shards': sorted(shards),
+        }, compact=True)
+
+
+def write_indexes(
+    section: Section, path: str, facets: Iterable[str] = (),
+) -> None:
+    """
+    Write the inverted, Fuse.js and facet search indexes of a section.
+
+    Facet co-occurrence counts are written too if known facets are given.
+
+    Parameters:
+        section: Section to index.
+        path: Static files directory of the section page.
+        facets: Known facets, indexed even if no page has them.
+    """
+    SearchIndex.from_section(section).write(path)
+    FuseIndex.from_section(section).write(path)
+    FacetIndex.from_section(section, facets).write(path)
+    if facets:
+        FacetCooccurrence.from_section(section, facets).write(path)
+
+
+def check_indexes(path: str) -> None:
+    """
+    Check the search indexes of a section against Hugo's index.json.
+
+    Both indexes list the pages in name order, which index.json exposes
+    as the 'name' of each page. If index.json names an archive instead of
+    listing the pages, the pages of the archive are checked.
+
+    Parameters:
+        path: Published directory of the section page.
+
+    Raises:
+        ValueError: If the files can not be read or the indexes do not
+            match the pages and keys published by Hugo.
+    """
+    hugo_index = read_json(os.path.join(path, 'index.json'))
+    docs = {doc.get('name'): doc for doc in _pages(path, hugo_index)}
+    names = read_json(os.path.join(path, 'search.json'))['docs']
+    if sorted(docs) != names:
+        raise ValueError("Pages of '{0}' differ from index.json.".format(path))
+    expected = FuseIndex.from_docs(
+        tuple((key['name'], key['weight']) for key in hugo_index['keys']),
+        [docs[name] for name in names],
+    )
+    if read_json(os.path.join(path, 'fuse.json')) != asdict(expected):
+        raise ValueError("Fuse index of '{0}' is stale.".format(path))
+
+
+def _pages(path: str, hugo_index: dict) -> list[dict]:
+    archive = hugo_index.get('archive')
+    if archive:
+        return read_archive(os.path.join(path, archive))
+    return hugo_index['index']
+
+
+def _scores(page: Page, section: Section) -> Counter:
+    record = page.search_record()
+    scores: Counter = Counter()
+    for key, weight in section.search_keys:
+        for token in tokenize(_text(record.get(key, ''))):
+            scores[token] += weight
+    return scores
+
+
+def _text(field: Union[str, list[str]]) -> str:
+    return field if isinstance(field, str) else ' '.join(field)
@@ -0,0 +1,320 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Refresh projects when their repositories are pushed."""
+
+import argparse
+import hmac
+import json
+import logging
+import subprocess  # noqa: S404
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from build import build_graph
+from config import Config
+from license import License
+from state import BuildState
+
+REFRESH = '/refresh/'
+GITHUB_EVENT = 'X-GitHub-Event'
+GITHUB_SIGNATURE = 'X-Hub-Signature-256'
+GITLAB_EVENT = 'X-Gitlab-Event'
+GITLAB_TOKEN = 'X-Gitlab-Token'
+GITHUB_PUSH = 'push'
+GITLAB_PUSH = 'Push Hook'
+# Bytes of the largest payload, the limit of GitHub webhooks (25 MiB).
+MAX_PAYLOAD = 26214400
+
+
+class Refresher:
+    """
+    Refresh the pages of projects in the background.
+
+    The configuration, the build state and the parsed SPDX license list stay
+    in memory, so a refresh only generates the pages of the refreshed
+    projects and writes the sections again, which leaves the files of
+    unchanged pages untouched. Project workers get the parsed license list,
+    but open their own HTTP connections, as connections can not be passed
+    to another process: only the requests of the server itself, e.g. those
+    storing images, reuse the connections of the previous refreshes.
+    Refreshes requested while another one runs are merged into the next
+    one.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        args: argparse.Namespace,
+        build_state: BuildState,
+        licenses: list[License],
+    ) -> None:
+        """
+        Initialize the refresher.
+
+        Parameters:
+            config: Configuration.
+            args: Command line arguments.
+            build_state: State of the last build.
+            licenses: License data of the SPDX license list.
+        """
+        self.config = config
+        self.args = args
+        self.build_state = build_state
+        self.licenses = licenses
+        self.pending: set[str] = set()
+        self.condition = threading.Condition()
+
+    def projects(self, repository: str) -> set[str]:
+        """
+        Find the projects of a repository.
+
+        Repository URLs are compared regardless of their scheme, case,
+        trailing slash and '.git' suffix, which webhooks and configurations
+        may write differently.
+
+        Parameters:
+            repository: Git repository URL.
+
+        Returns:
+            IDs of the projects.
+        """
+        return {
+            project.id for project in self.config.projects
+            if _repository_key(project.repository.url) == _repository_key(
+                repository,
+            )
+        }
+
+    def request(self, project_ids: set[str]) -> None:
+        """
+        Request a refresh of projects.
+
+        Parameters:
+            project_ids: IDs of the projects.
+        """
+        with self.condition:
+            self.pending.update(project_ids)
+            self.condition.notify()
+
+    def run(self) -> None:
+        """
+        Run the requested refreshes, one at a time, forever.
+
+        A refresh which fails unexpectedly is logged, and the next one runs
+        anyway.
+        """
+        while True:  # noqa: WPS457
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                project_ids = self.pending
+                self.pending = set()
+            try:
+                self.refresh(project_ids)
+            except Exception:  # noqa: B902, WPS424
+                logging.exception('Failed to refresh {0}:'.format(
+                    ', '.join(sorted(project_ids)),
+                ))
+
+    def refresh(self, project_ids: set[str]) -> None:
+        """
+        Refresh projects, then run Hugo if requested.
+
+        Parameters:
+            project_ids: IDs of the projects.
+        """
+        logging.info('Refreshing {0}...'.format(', '.join(sorted(
+            project_ids,
+        ))))
+        graph = build_graph(
+            self.config,
+            self.args,
+            self.build_state,
+            project_ids,
+            self.licenses,
+        )
+        try:
+            graph.run()
+        except ValueError as refresh_error:
+            logging.error('Failed to refresh:\n{0}'.format(refresh_error))
+            return
+        logging.info('Refresh timing:\n{0}'.format(graph.summary()))
+        if self.args.hugo:
+            self._hugo()
+
+    def _hugo(self) -> None:
+        logging.info("Running Hugo to '{0}'...".format(self.args.hugo))
+        try:
+            subprocess.run(  # noqa: S603, S607
+                [
+                    'hugo', '--gc', '--minify',
+                    '--source', str(self.config.sources),
+                    '--destination', self.args.hugo,
+                ],
+                check=True,
+                capture_output=True,
+            )
+        except (OSError, subprocess.CalledProcessError) as hugo_error:
+            logging.error('Failed to run Hugo:\n{0}'.format(hugo_error))
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """
+    Handle webhooks of GitHub and GitLab.
+
+    Webhooks of pushes to the default branch name the pushed repository,
+    whose projects are refreshed, and other webhooks refresh nothing. A POST to
+    '/refresh/<project ID>' refreshes a project directly. If the server has
+    a secret, GitHub webhooks must be signed with it, and other requests
+    must send it as GitLab token.
+    """
+
+    server: 'WebhookServer'
+    # Seconds a client may take to send a request.
+    timeout = 30
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Request a refresh of the projects named by the request."""
+        length = self.headers.get('Content-Length', '0')
+        if not length.isdigit():
+            self._respond(HTTPStatus.BAD_REQUEST, 'Invalid Content-Length.')
+            return
+        if int(length) > MAX_PAYLOAD:
+            self._respond(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, 'Payload too large.',
+            )
+            return
+        body = self.rfile.read(int(length))
+        if not self._authorized(body):
+            self._respond(
+                HTTPStatus.UNAUTHORIZED, 'Invalid signature or token.',
+            )
+            return
+        try:
+            project_ids = self._projects(body)
+        except ValueError as payload_error:
+            self._respond(HTTPStatus.BAD_REQUEST, str(payload_error))
+            return
+        if not project_ids:
+            self._respond(HTTPStatus.NOT_FOUND, 'No project to refresh.')
+            return
+        self.server.refresher.request(project_ids)
+        self._respond(HTTPStatus.ACCEPTED, 'Refreshing {0}.'.format(
+            ', '.join(sorted(project_ids)),
+        ))
+
+    def log_message(self, message_format: str, *args: object) -> None:
+        """
+        Log a request.
+
+        Parameters:
+            message_format: Message format string.
+            args: Message arguments.
+        """
+        logging.info(message_format % args)  # noqa: WPS323
+
+    def _authorized(self, body: bytes) -> bool:
+        secret = self.server.secret
+        if not secret:
+            return True
+        signature = self.headers.get(GITHUB_SIGNATURE)
+        if signature:
+            return hmac.compare_digest(signature, 'sha256={0}'.format(
+                hmac.new(secret.encode(), body, 'sha256').hexdigest(),
+            ))
+        return hmac.compare_digest(self.headers.get(GITLAB_TOKEN, ''), secret)
+
+    def _projects(self, body: bytes) -> set[str]:
+        refresher = self.server.refresher
+        if self.path.startswith(REFRESH):
+            project_ids = {project.id for project in refresher.config.projects}
+            return project_ids & {self.path[len(REFRESH):]}
+        try:
+            repository = self._repository(json.loads(body))
+        except (TypeError, KeyError, json.JSONDecodeError) as json_error:
+            raise ValueError('Invalid webhook payload:\n{0}'.format(
+                json_error,
+            ))
+        return refresher.projects(repository) if repository else set()
+
+    def _repository(self, payload: dict) -> str:
+        # Only pushes to the default branch change the manifest and news,
+        # so other webhooks name no repository.
+        if self.headers.get(GITHUB_EVENT):
+            push = self.headers[GITHUB_EVENT] == GITHUB_PUSH
+            repository, url = payload['repository'], 'clone_url'
+        else:
+            push = self.headers.get(GITLAB_EVENT) == GITLAB_PUSH
+            repository, url = payload['project'], 'git_http_url'
+        if push and payload['ref'] == 'refs/heads/{0}'.format(
+            repository['default_branch'],
+        ):
+            return repository[url]
+        return ''
+
+    def _respond(self, status: HTTPStatus, message: str) -> None:
+        body = '{0}\n'.format(message).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _repository_key(url: str) -> str:
+    path = url.strip().lower().split('://')[-1]
+    return path.rstrip('/').removesuffix('.git')
+
+
+class WebhookServer(ThreadingHTTPServer):
+    """HTTP server of the webhooks."""
+
+    def __init__(
+        self, address: str, refresher: Refresher, secret: str = '',
+    ) -> None:
+        """
+        Initialize the server.
+
+        Without a secret, anyone who reaches the server can request
+        refreshes, so the server only listens on a loopback address then.
+
+        Parameters:
+            address: Address to listen on, as '[host]:port'.
+            refresher: Refresher of the projects.
+            secret: Secret of the webhooks, none if empty.
+
+        Raises:
+            ValueError: If the address is invalid, or not a loopback
+                address while there is no secret.
+            OSError: If listening on the address fails.
+        """
+        host, _, port = address.rpartition(':')
+        if not port.isdigit():
+            raise ValueError("Invalid address '{0}'.".format(address))
+        super().__init__((host, int(port)), WebhookHandler)
+        self.refresher = refresher
+        self.secret = secret
+        if secret:
+            return
+        if not self.server_address[0].startswith('127.'):
+            self.server_close()
+            raise ValueError(
+                "No webhook secret to serve on '{0}'.".format(address),
+            )
+        logging.warning('Serving webhooks without a secret.')
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        """
+        Serve webhooks and run the refreshes they request.
+
+        Parameters:
+            poll_interval: Seconds between checks for a shutdown.
+        """
+        threading.Thread(target=self.refresher.run, daemon=True).start()
+        logging.info("Serving webhooks on '{0}:{1}'...".format(
+            *self.server_address[:2],
+        ))
+        super().serve_forever(poll_interval)
@@ -0,0 +1,258 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Stages of the content build."""
+
+import argparse
+import logging
+import os
+from typing import Collection, Optional, Union
+
+from config import Config, Project
+from hugo import Section
+from images import ImageStore
+from isolation import Isolation
+from license import License, SpdxLicenseList
+from probe import ImageProbe, ImageUrl
+from redirect import RedirectMap, RedirectSection
+from state import BuildState, ProjectState
+
+IMAGES = 'images'
+# Manifest of the stored images of a section.
+IMAGES_MANIFEST = '.images-{0}.json'
+
+
+def load_config(path: str) -> Config:
+    """
+    Load the configuration.
+
+    The redirect targets are not checked yet, so the build does not wait
+    for their HEAD requests before it starts: the redirects task checks
+    them, concurrently with the other tasks.
+
+    Parameters:
+        path: Configuration file path.
+
+    Returns:
+        Config: Instance of Config class.
+
+    Raises:
+        ValueError: If loading the configuration fails.
+    """
+    logging.info("Loading configuration from '{0}'...".format(path))
+    try:
+        with open(path, 'r') as config_file:
+            return Config.from_yaml(config_file.read(), deferred=True)
+    except ValueError as config_error:
+        raise ValueError(
+            'Failed to load configuration:\n{0}'.format(config_error),
+        )
+
+
+def load_licenses(config: Config) -> list[License]:
+    """
+    Load the SPDX license list.
+
+    Parameters:
+        config: Configuration.
+
+    Returns:
+        License data of the list.
+
+    Raises:
+        ValueError: If loading the SPDX license list fails.
+    """
+    logging.info("Loading SPDX license list from '{0}'...".format(
+        config.licenses,
+    ))
+    try:
+        SpdxLicenseList.from_file(config.licenses)
+    except ValueError as spdx_error:
+        raise ValueError(
+            'Failed to load SPDX license list:\n{0}'.format(spdx_error),
+        )
+    return SpdxLicenseList.licenses()
+
+
+def generate_sections(
+    config: Config,
+    args: argparse.Namespace,
+    build_state: BuildState,
+    refresh: Optional[Collection[str]] = None,
+    licenses: Optional[list[License]] = None,
+) -> tuple[Section, Section]:
+    """
+    Generate the projects and news sections.
+
+    The pipeline of each project, from fetching its manifest to rendering
+    its pages, runs in an isolated worker, so a project which takes too
+    long or too much memory is reported without holding up the others. In
+    an incremental build, projects whose inputs are unchanged reuse the
+    pages of the last build instead. A refresh only generates the pages of
+    the refreshed projects, and reuses the pages of the others. The image
+    probes of the last build are revalidated rather than probed again.
+    Workers get the SPDX license list already parsed if given, and parse
+    its file otherwise.
+
+    Parameters:
+        config: Configuration.
+        args: Command line arguments.
+        build_state: State of the last build, updated with this build.
+        refresh: IDs of the projects to refresh, all if None.
+        licenses: License data of the SPDX license list, if parsed.
+
+    Returns:
+        Projects and news sections.
+    """
+    previous = build_state.previous(refresh or ())
+    ImageUrl.stored = ImageProbe.load(build_state.probes)
+    pipelines = Isolation(
+        args.jobs, args.project_timeout, args.project_memory,
+    ).run(
+        _pipeline,
+        {
+            project.id: (project, previous and previous.get(project.id))
+            for project in config.projects
+            if refresh is None or project.id in refresh
+        },
+        args.news_retention,
+        licenses or str(config.licenses),
+        previous is not None,
+        ImageUrl.stored,
+    )
+    build_state.update({
+        name: pipeline[0] for name, pipeline in pipelines.items()
+    }, refresh)
+    for pipeline in pipelines.values():
+        ImageUrl.probes.update(pipeline[1])
+    sections = build_state.sections()
+    if args.related:
+        sections[0].relate(args.related)
+    return sections
+
+
+def generate_redirects(
+    config: Config, args: argparse.Namespace, static: Optional[str] = None,
+) -> RedirectSection:
+    """
+    Generate the redirects, as pages or as a compiled map.
+
+    The redirect targets are checked first, as loading the configuration
+    left them unchecked.
+
+    Parameters:
+        config: Configuration.
+        args: Command line arguments.
+        static: Static files directory, that of the Hugo sources if None.
+
+    Returns:
+        RedirectSection: Redirect pages, empty if written as a map.
+    """
+    logging.info('Checking redirect targets...')
+    config.check_targets(args.jobs)
+    redirect_args = (
+        config.redirects,
+        config.redirect_rules,
+        args.max_redirect_hops,
+        args.collapse_redirects,
+    )
+    if args.redirects == 'pages':
+        return RedirectSection.from_config(*redirect_args)
+    RedirectMap.from_config(*redirect_args).write(
+        static or os.path.join(config.sources, 'static'), args.redirects,
+    )
+    return RedirectSection()
+
+
+def store_images(
+    config: Config,
+    args: argparse.Namespace,
+    name: str,
+    section: Section,
+    static: Optional[str] = None,
+) -> Section:
+    """
+    Store the images of a section, unless linked from their hosts.
+
+    Each section has its own store, in its own directory of the static
+    images, so it is written as soon as its own images are stored. The
+    manifest of the stored images is kept in the Hugo sources, out of the
+    static files, so it is not published.
+
+    Parameters:
+        config: Configuration.
+        args: Command line arguments.
+        name: Section directory in the Hugo content.
+        section: Hugo section.
+        static: Static files directory, that of the Hugo sources if None.
+
+    Returns:
+        Section: The section, with localized images.
+    """
+    static = static or os.path.join(config.sources, 'static')
+    if not args.remote_images:
+        ImageStore(
+            os.path.join(static, IMAGES, name),
+            os.path.join(config.sources, IMAGES_MANIFEST.format(name)),
+            '/{0}/{1}'.format(IMAGES, name),
+        ).localize(
+            [page.front_matter for page in section.values()], args.jobs,
+        )
+    return section
+
+
+def write_section(
+    config: Config,
+    args: argparse.Namespace,
+    name: str,
+    section: Section,
+    content_path: Optional[str] = None,
+) -> Section:
+    """
+    Write a section to its content directory.
+
+    Parameters:
+        config: Configuration.
+        args: Command line arguments.
+        name: Section directory in the Hugo content.
+        section: Hugo section.
+        content_path: Content directory, that of the Hugo sources if None.
+
+    Returns:
+        Section: The written section.
+    """
+    section.front_matter_format = args.front_matter
+    if args.content == 'adapters':
+        section.content_adapter = name
+    content_path = content_path or os.path.join(config.sources, 'content')
+    section.write(
+        os.path.join(content_path, name),
+        jobs=args.jobs,
+        processes=args.processes,
+    )
+    return section
+
+
+def _pipeline(
+    inputs: tuple[Project, Optional[ProjectState]],
+    retention: int,
+    licenses: Union[str, list[License]],
+    incremental: bool,
+    stored: dict[str, ImageProbe],
+) -> tuple[ProjectState, dict]:
+    # Workers do not inherit the license list or the stored probes, so each
+    # gets them, and only gets the last state of its own project.
+    if isinstance(licenses, str):
+        SpdxLicenseList.from_file(licenses)
+    else:
+        SpdxLicenseList.from_list(licenses)
+    ImageUrl.stored = stored
+    project, previous = inputs
+    states = {project.id: previous} if previous else {}
+    return (
+        ProjectState.from_config(
+            project, retention, states if incremental else None,
+        ),
+        ImageUrl.probes,
+    )
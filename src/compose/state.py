@@ -0,0 +1,414 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Keep the state of incremental builds."""
+
+import copy
+import datetime
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field, replace
+from typing import Collection, Optional
+
+from config import Config, Project
+from files import digest, file_digest, read_json, write_json
+from news import NewsPage, NewsSection
+from project import ProjectPage, ProjectSection
+from url import StrictUrl, UrlContent
+
+PROJECTS = 'projects'
+NEWS = 'news'
+ALIASES = 'aliases'
+PROBES = 'probes'
+
+
+@dataclass
+class ProjectState:
+    """
+    Inputs of a project and the pages generated from them.
+
+    The pages of a project are generated again if its configuration entry
+    changed, or if both the revision of its repository and its manifest
+    changed, or if its description or newsfeed changed, as found by their
+    entity tag or, if their host sends none, by the digest of their text.
+    Otherwise, the pages of the last build are reused, without validating
+    the manifest again. The revision is only asked for when the project has
+    a last state with the same configuration entry, so the first build of
+    a project leaves it empty.
+    """
+
+    # Digest of the configuration entry.
+    config: str
+    # Commit hash of the default branch of the repository.
+    revision: str = ''
+    # Digest of the manifest, empty if generating the pages failed.
+    manifest: str = ''
+    # Digests of the texts of the description and newsfeed, by URL.
+    digests: dict[str, str] = field(default_factory=dict)
+    # Entity tags of the description and newsfeed, by URL.
+    sources: dict[str, str] = field(default_factory=dict)
+    # Generated pages, with their name, by section.
+    pages: dict[str, list[dict]] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Project,
+        retention: int = 0,
+        states: Optional[dict[str, 'ProjectState']] = None,
+    ) -> 'ProjectState':
+        """
+        Generate the pages of a project, unless its inputs are unchanged.
+
+        Parameters:
+            config: Project configuration.
+            retention: Number of newest news kept, all if 0.
+            states: Project states of the last build, None if the build is
+                not incremental.
+
+        Returns:
+            ProjectState: Instance of ProjectState class.
+        """
+        state = cls(digest(config.model_dump_json(
+            include=set(Project.model_fields),
+        )))
+        previous = states.get(config.id) if states else None
+        if previous is None or previous.config != state.config:
+            state.generate(config, retention)
+            return state
+        try:
+            state.revision = config.repository.revision()
+        except ValueError as revision_error:
+            logging.warning("Failed to get '{0}' revision:\n{1}".format(
+                config.id, revision_error,
+            ))
+        if state.unchanged(config, previous):
+            logging.info("Reusing '{0}' pages...".format(config.id))
+            return replace(previous, revision=state.revision)
+        state.generate(config, retention)
+        return state
+
+    def unchanged(self, config: Project, previous: 'ProjectState') -> bool:
+        """
+        Check if the inputs of the project are those of the last build.
+
+        The manifest is only fetched if the revision changed, and is not
+        validated.
+
+        Parameters:
+            config: Project configuration.
+            previous: State of the project in the last build.
+
+        Returns:
+            True if the pages of the last build can be reused.
+        """
+        if self.config != previous.config or not previous.manifest:
+            return False
+        if not self.revision or self.revision != previous.revision:
+            try:
+                manifest_yaml = config.manifest_yaml
+            except ValueError:
+                return False
+            if digest(manifest_yaml) != previous.manifest:
+                return False
+        return all(previous.fresh(url) for url in previous.sources)
+
+    def fresh(self, url: str) -> bool:
+        """
+        Check if the description or newsfeed is still the one of this state.
+
+        Sources are checked by their entity tag, or by the digest of their
+        text if their host sends none, which fetches them again.
+
+        Parameters:
+            url: Source URL.
+
+        Returns:
+            True if the source is unchanged.
+        """
+        etag = self.sources.get(url, '')
+        current = _etag(url) if etag else ''
+        if current:
+            return current == etag
+        try:
+            text = UrlContent.create(url).text
+        except ValueError:
+            return False
+        return digest(text) == self.digests.get(url)
+
+    def generate(self, config: Project, retention: int = 0) -> None:
+        """
+        Generate the pages of the project.
+
+        Projects whose project page or news fail to generate are left
+        without a manifest digest, so they are generated again by the next
+        build.
+
+        Parameters:
+            config: Project configuration.
+            retention: Number of newest news kept, all if 0.
+        """
+        projects = ProjectSection.from_config([config])
+        news = NewsSection.from_config([config], retention)
+        self.pages = {PROJECTS: _records(projects), NEWS: _records(news)}
+        if config.id not in projects:
+            return
+        try:
+            self.digests = _digests(config)
+        except ValueError:
+            return
+        self.manifest = digest(config.manifest_yaml)
+        self.sources = {url: _etag(url) for url in self.digests}
+
+    def sections(self) -> tuple[ProjectSection, NewsSection]:
+        """
+        Get the pages of the project.
+
+        Returns:
+            Projects and news sections of the project.
+        """
+        return (
+            ProjectSection({
+                record['name']: ProjectPage(
+                    copy.deepcopy(record['front_matter']), record['markdown'],
+                )
+                for record in self.pages.get(PROJECTS, [])
+            }),
+            NewsSection({
+                record['name']: NewsPage(
+                    _dated(record['front_matter']), record['markdown'],
+                )
+                for record in self.pages.get(NEWS, [])
+            }),
+        )
+
+
+class BuildState:
+    """
+    State of the last build, for incremental builds.
+
+    The state file keeps the state of each project, so the next build only
+    generates the pages of changed projects. The state is dropped if the
+    news retention, the SPDX license list or the compose sources changed
+    since it was saved.
+
+    The state file also keeps the former numbered paths of the news, which
+    are frozen by the first build that sees the news of a project and are
+    never dropped with the project states.
+    They are only kept as long as the state file is, so the state file
+    must survive between builds, e.g. in the cache of the CI workflow, or
+    the numbered paths are frozen again from the news of that build.
+
+    The state file keeps the image probes of the last build too, which the
+    next build revalidates instead of probing the images again. They do
+    not depend on the build inputs either.
+    """
+
+    def __init__(self, path: Optional[str] = None, inputs: str = '') -> None:
+        """
+        Initialize an empty build state.
+
+        Parameters:
+            path: State file path, None if the build is not incremental.
+            inputs: Digest of the inputs shared by all projects.
+        """
+        self.path = path
+        self.inputs = inputs
+        self.projects: dict[str, ProjectState] = {}
+        # Former numbered path of each news page, by project ID.
+        self.aliases: dict[str, dict[str, str]] = {}
+        # Image probes of the last build, as saved, by URL.
+        self.probes: dict[str, dict] = {}
+
+    @classmethod
+    def from_config(
+        cls, path: Optional[str], config: Config, retention: int = 0,
+    ) -> 'BuildState':
+        """
+        Load the state of the last build.
+
+        Parameters:
+            path: State file path, None if the build is not incremental.
+            config: Configuration.
+            retention: Number of newest news kept per project, all if 0.
+
+        Returns:
+            BuildState: Instance of BuildState class.
+        """
+        compose = os.path.dirname(os.path.abspath(__file__))
+        build_state = cls(path, digest(json.dumps([
+            retention,
+            file_digest(str(config.licenses)),
+            [
+                file_digest(os.path.join(compose, source))
+                for source in sorted(os.listdir(compose))
+                if source.endswith('.py')
+            ],
+        ])))
+        if path and os.path.isfile(path):
+            logging.info("Loading build state from '{0}'...".format(path))
+            build_state.load()
+        return build_state
+
+    def previous(
+        self, refresh: Collection[str] = (),
+    ) -> Optional[dict[str, ProjectState]]:
+        """
+        Get the project states of the last build.
+
+        Parameters:
+            refresh: IDs of refreshed projects, whose states are left out
+                so their pages are generated again.
+
+        Returns:
+            Project states by project ID, None if the build is not
+            incremental.
+        """
+        if not self.path:
+            return None
+        return {
+            name: project_state
+            for name, project_state in self.projects.items()
+            if name not in refresh
+        }
+
+    def update(
+        self,
+        project_states: dict[str, ProjectState],
+        refresh: Optional[Collection[str]] = None,
+    ) -> None:
+        """
+        Update the project states with those of a build.
+
+        A full build replaces all project states, so failed projects are
+        left out, and probes the images again. A refresh keeps the states of
+        the other projects, and the last states of refreshed projects which
+        failed.
+
+        Parameters:
+            project_states: Project states generated by the build.
+            refresh: IDs of the refreshed projects, all if None.
+        """
+        if refresh is None:
+            self.projects = project_states
+            self.probes = {}
+        else:
+            self.projects.update(project_states)
+
+    def sections(self) -> tuple[ProjectSection, NewsSection]:
+        """
+        Get the pages of all projects.
+
+        News pages get their frozen numbered paths as aliases.
+
+        Returns:
+            Projects and news sections, in project order.
+        """
+        projects, news = ProjectSection(), NewsSection()
+        for name, project_state in self.projects.items():
+            sections = project_state.sections()
+            projects.update(sections[0])
+            news.update(_freeze(self.aliases, name, sections[1]))
+        return projects, news
+
+    def load(self) -> None:
+        """Load the project states of the state file, if still valid."""
+        try:
+            state = read_json(self.path)
+        except ValueError as read_error:
+            logging.warning(read_error)
+            return
+        self.aliases = state.get(ALIASES, {})
+        self.probes = state.get(PROBES, {})
+        if state.get('inputs') != self.inputs:
+            logging.info('Build inputs changed, generating all pages.')
+            return
+        try:
+            self.projects = {
+                name: ProjectState(**project_state)
+                for name, project_state in state[PROJECTS].items()
+            }
+        except (KeyError, TypeError) as state_error:
+            logging.warning('Invalid build state:\n{0}'.format(state_error))
+
+    def save(self, probes: Optional[dict] = None) -> None:
+        """
+        Save the project states and image probes to the state file.
+
+        Parameters:
+            probes: Image probes of the build, by URL.
+        """
+        self.probes.update({
+            url: asdict(probe) for url, probe in (probes or {}).items()
+        })
+        if not self.path:
+            return
+        logging.info("Saving build state to '{0}'...".format(self.path))
+        try:
+            write_json(self.path, {
+                'inputs': self.inputs,
+                ALIASES: self.aliases,
+                PROBES: self.probes,
+                PROJECTS: {
+                    name: asdict(project_state)
+                    for name, project_state in self.projects.items()
+                },
+            }, compact=True)
+        except ValueError as write_error:
+            logging.error(write_error)
+
+
+def _digests(config: Project) -> dict[str, str]:
+    # The newsfeed is only kept once its news load, which raises the error
+    # the news section logged otherwise.
+    manifest = config.manifest
+    sources = [manifest.description]
+    if manifest.newsfeed and config.news is not None:
+        sources.append(manifest.newsfeed)
+    return {source.url: digest(source.text) for source in sources}
+
+
+def _etag(url: str) -> str:
+    try:
+        return StrictUrl(url).etag()
+    except ValueError:
+        return ''
+
+
+def _records(section: dict) -> list[dict]:
+    # Pages are listed, since JSON objects are written with sorted keys.
+    return [
+        dict(asdict(page), name=name) for name, page in section.items()
+    ]
+
+
+def _freeze(
+    aliases: dict[str, dict[str, str]], project: str, news: NewsSection,
+) -> NewsSection:
+    # News used to be numbered from the oldest, so numbers shift as news are
+    # dropped. The numbered paths are frozen the first time the project has
+    # news, and later news get none.
+    if project not in aliases and news:
+        aliases[project] = {
+            name: page.front_matter[ALIASES][0]
+            for name, page in news.items()
+            if page.front_matter.get(ALIASES)
+        }
+    frozen = aliases.get(project, {})
+    for name, page in news.items():
+        alias = frozen.get(name)
+        page.front_matter.pop(ALIASES, None)
+        if alias:
+            page.front_matter[ALIASES] = [alias]
+    return news
+
+
+def _dated(front_matter: dict) -> dict:
+    # JSON has no dates, so the news date is loaded back as a string.
+    front_matter = copy.deepcopy(front_matter)
+    front_matter['date'] = datetime.date.fromisoformat(
+        str(front_matter['date']),
+    )
+    return front_matter
@@ -0,0 +1,157 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Run build tasks as a graph."""
+
+import logging
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+@dataclass
+class Task:
+    """Build task and its timing."""
+
+    name: str
+    run: Callable[..., Any]
+    needs: tuple[str, ...]
+    start: float = 0
+    end: float = 0
+
+    def __call__(self, *inputs: Any) -> Any:
+        """
+        Run the task.
+
+        Parameters:
+            inputs: Results of the tasks it needs.
+
+        Returns:
+            Result of the task.
+        """
+        logging.info("Running '{0}' task...".format(self.name))
+        self.start = time.perf_counter()
+        task_result = self.run(*inputs)
+        self.end = time.perf_counter()
+        return task_result
+
+
+class TaskGraph:
+    """
+    Graph of build tasks.
+
+    Each task runs in a pool of threads as soon as the tasks it needs are
+    done, and gets their results as arguments. Since tasks can only need
+    tasks added before them, the graph has no cycles.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty graph."""
+        self.tasks: dict[str, Task] = {}
+        self.outputs: dict[str, Any] = {}
+        self.started = time.perf_counter()
+
+    def add(self, name: str, run: Callable[..., Any], *needs: str) -> None:
+        """
+        Add a task.
+
+        Parameters:
+            name: Task name.
+            run: Task function, called with the results of the needed tasks.
+            needs: Names of the tasks whose results the task needs.
+
+        Raises:
+            ValueError: If the task exists or needs unknown tasks.
+        """
+        unknown = [need for need in needs if need not in self.tasks]
+        if name in self.tasks or unknown:
+            raise ValueError("Invalid '{0}' task needs: {1}".format(
+                name, unknown or 'duplicate task',
+            ))
+        self.tasks[name] = Task(name, run, needs)
+
+    def run(self) -> dict[str, Any]:
+        """
+        Run the tasks.
+
+        There are as many threads as tasks, since tasks mostly wait on the
+        network or on their own workers. If a task fails, no more tasks
+        are started and the error is raised once the running tasks are done.
+
+        Returns:
+            Task results by name.
+        """
+        self.started = time.perf_counter()
+        waiting = dict(self.tasks)
+        running: dict[Future, str] = {}
+        with ThreadPoolExecutor(max(len(self.tasks), 1)) as pool:
+            while waiting or running:
+                self._submit(pool, waiting, running)
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.outputs[running.pop(future)] = future.result()
+        return self.outputs
+
+    def critical_path(self) -> list[Task]:
+        """
+        Get the critical path of the last run.
+
+        Going back from the last task to finish, each task on the path is
+        the needed task which finished last, so it held up the next one.
+
+        Returns:
+            Tasks of the critical path, in order.
+        """
+        path = []
+        candidates = list(self.tasks.values())
+        while candidates:
+            task = max(candidates, key=_end)
+            path.insert(0, task)
+            candidates = [self.tasks[need] for need in task.needs]
+        return path
+
+    def summary(self) -> str:
+        """
+        Summarize the timing of the last run.
+
+        Returns:
+            Time of each task and critical path, in seconds.
+        """
+        lines = [
+            '{0}: {1:.2f} s'.format(task.name, task.end - task.start)
+            for task in sorted(self.tasks.values(), key=_end)
+        ]
+        path = self.critical_path()
+        lines.append('Critical path: {0} ({1:.2f} s)'.format(
+            ' -> '.join(task.name for task in path),
+            path[-1].end - self.started if path else 0,
+        ))
+        return '\n'.join(lines)
+
+    def _submit(
+        self,
+        pool: Executor,
+        waiting: dict[str, Task],
+        running: dict[Future, str],
+    ) -> None:
+        ready = [
+            task for task in waiting.values()
+            if all(need in self.outputs for need in task.needs)
+        ]
+        for task in ready:
+            waiting.pop(task.name)
+            running[pool.submit(
+                task, *(self.outputs[need] for need in task.needs),
+            )] = task.name
+
+
+def _end(task: Task) -> float:
+    return task.end
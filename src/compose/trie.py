@@ -0,0 +1,183 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Match redirect rules with a path trie."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+PLACEHOLDER = re.compile(':([A-Za-z_][A-Za-z0-9_]*)')
+_SPLAT = '*'
+
+
+@dataclass
+class _Rule:
+    names: tuple[str, ...]
+    target: str
+
+    def __post_init__(self) -> None:
+        unknown = set(PLACEHOLDER.findall(self.target)) - set(self.names)
+        if unknown:
+            raise ValueError("Unknown placeholders '{0}' in '{1}'.".format(
+                "', '".join(sorted(unknown)), self.target,
+            ))
+
+    def expand(self, captures: tuple[str, ...]) -> str:
+        substitutions = dict(zip(self.names, captures))
+        return PLACEHOLDER.sub(
+            lambda match: substitutions.get(match.group(1), match.group()),
+            self.target,
+        )
+
+
+@dataclass
+class _Node:
+    children: dict[str, '_Node'] = field(default_factory=dict)
+    placeholder: Optional['_Node'] = None
+    rule: Optional[_Rule] = None
+    splat: Optional[_Rule] = None
+
+    def insert(
+        self, segments: list[str], splat: bool,
+    ) -> tuple['_Node', tuple[str, ...]]:
+        node = self
+        names = []
+        for segment in segments:
+            if segment.startswith(':'):
+                names.append(segment[1:])
+                node.placeholder = node.placeholder or _Node()
+                node = node.placeholder
+            else:
+                node = node.children.setdefault(segment, _Node())
+        if splat:
+            names.append('splat')
+        return node, tuple(names)
+
+    def assign(self, rule: _Rule, splat: bool) -> bool:
+        if splat and self.splat is None:
+            self.splat = rule
+        elif not splat and self.rule is None:
+            self.rule = rule
+        else:
+            return False
+        return True
+
+
+class RedirectTrie:
+    """
+    Path trie of redirect rules.
+
+    Rule patterns are site paths whose segments are literals, ':name'
+    placeholders matching one segment, or a final '*' matching the rest of
+    the path. Targets refer to the captured segments as ':name' and to the
+    rest of the path as ':splat'. Literal segments win over placeholders,
+    which win over a splat: matching backtracks to the next of them when a
+    branch has no rule for the path. Each node is visited at most once, so
+    matching takes time proportional to the length of the path when rules
+    do not overlap, and to the number of overlapping rule prefixes at
+    worst.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty trie."""
+        self._rules: list[tuple[str, str]] = []
+        self._root = _Node()
+
+    @property
+    def rules(self) -> list[tuple[str, str]]:
+        """
+        Rules ordered like the trie matches them.
+
+        Formats that try rules in order need the most specific rule first.
+
+        Returns:
+            Pairs of rule path and target.
+        """
+        return sorted(self._rules, key=lambda rule: [
+            2 if segment == _SPLAT else int(segment.startswith(':'))
+            for segment in _segments(rule[0])
+        ])
+
+    @classmethod
+    def from_rules(cls, rules: Iterable[tuple[str, str]]) -> 'RedirectTrie':
+        """
+        Compile redirect rules into a trie.
+
+        Parameters:
+            rules: Pairs of rule pattern and target.
+
+        Returns:
+            RedirectTrie: Instance of RedirectTrie class.
+        """
+        trie = cls()
+        for pattern, target in rules:
+            trie.add(pattern, target)
+        return trie
+
+    def add(self, pattern: str, target: str) -> None:
+        """
+        Add a redirect rule.
+
+        Parameters:
+            pattern: Rule pattern.
+            target: Rule target.
+
+        Raises:
+            ValueError: If the rule is not valid or duplicates a rule.
+        """
+        segments, splat = _parse(pattern)
+        node, names = self._root.insert(segments, splat)
+        path = '/{0}'.format('/'.join(_segments(pattern)))
+        if not node.assign(_Rule(names, target), splat):
+            raise ValueError("Duplicate rule '{0}'.".format(path))
+        self._rules.append((path, target))
+
+    def match(self, path: str) -> Optional[str]:
+        """
+        Find the target of a site path.
+
+        Parameters:
+            path: Site path.
+
+        Returns:
+            Expanded target, or None if no rule matches the path.
+        """
+        return _match(self._root, tuple(_segments(path)), ())
+
+
+def _segments(path: str) -> list[str]:
+    return [segment for segment in path.split('/') if segment]
+
+
+def _parse(pattern: str) -> tuple[list[str], bool]:
+    segments = _segments(pattern)
+    splat = segments[-1:] == [_SPLAT]
+    if splat:
+        segments.pop()
+    for segment in segments:
+        if segment == _SPLAT:
+            raise ValueError("Splat not last in '{0}'.".format(pattern))
+        if segment.startswith(':') and not PLACEHOLDER.fullmatch(segment):
+            raise ValueError("Invalid placeholder '{0}'.".format(segment))
+    return segments, splat
+
+
+def _match(
+    node: _Node, segments: tuple[str, ...], captures: tuple[str, ...],
+) -> Optional[str]:
+    if not segments:
+        return _expand(node.rule, captures)
+    head, tail = segments[0], segments[1:]
+    literal = node.children.get(head)
+    target = _match(literal, tail, captures) if literal else None
+    if target is None and node.placeholder:
+        target = _match(node.placeholder, tail, (*captures, head))
+    if target is None:
+        target = _expand(node.splat, (*captures, '/'.join(segments)))
+    return target
+
+
+def _expand(rule: Optional[_Rule], captures: tuple[str, ...]) -> Optional[str]:
+    return rule.expand(captures) if rule else None
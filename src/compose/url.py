@@ -10,7 +10,7 @@ import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 import time
-from typing import Annotated, Any
+from typing import Annotated, Any, ClassVar
 from urllib.parse import quote, urljoin
 import warnings
 
@@ -23,6 +23,15 @@ from pydantic_core import CoreSchema, core_schema
 class Url:
     """Represent a URL."""
 
+    # Successful HEAD responses, so each URL is only checked once per run.
+    # Long running processes clear them before each build.
+    heads: ClassVar[dict[str, requests.Response]] = {}
+    # Skip the HEAD request of validation, for URLs checked later.
+    deferred: ClassVar[bool] = False
+    # Idle sessions of the process, whose connections stay open for the
+    # next requests to the same host, e.g. those of a refresh.
+    sessions: ClassVar[list[requests.Session]] = []
+
     url: str
 
     @classmethod
@@ -47,6 +56,28 @@ class Url:
             ),
         )
 
+    def resolve(self, max_hops: int) -> tuple[str, int]:
+        """
+        Follow the redirect chain of the URL.
+
+        Parameters:
+            max_hops: Maximum number of redirects to follow.
+
+        Returns:
+            Final URL of the chain and number of redirects to reach it.
+
+        Raises:
+            ValueError: If the chain loops, is too long or fails.
+        """
+        response = self._head(self.url)
+        _check_loop([hop.url for hop in response.history] + [response.url])
+        hops = len(response.history)
+        if hops > max_hops:
+            raise ValueError("Redirect chain too long: {0} > {1}.".format(
+                hops, max_hops,
+            ))
+        return response.url, hops
+
     @classmethod
     def _validate(cls, input_value: Any) -> 'Url':
         """
@@ -60,6 +91,8 @@ class Url:
         """
         if isinstance(input_value, cls):
             return input_value
+        if isinstance(input_value, str) and Url.deferred:
+            return cls(input_value)
         if isinstance(input_value, str):
             try:
                 cls._head(input_value)
@@ -74,12 +107,18 @@ class Url:
 
     @classmethod
     def _head(cls, url: str, max_retries: int = 3) -> requests.Response:
+        if url not in Url.heads:
+            Url.heads[url] = cls._head_uncached(url, max_retries)
+        return Url.heads[url]
+
+    @classmethod
+    def _head_uncached(cls, url: str, max_retries: int) -> requests.Response:
         requests_error = None
         for attempt in range(max_retries):
             if attempt > 0:
                 time.sleep(attempt)
             try:
-                res = requests.head(url, timeout=10, allow_redirects=True)
+                res = _request('head', url, allow_redirects=True)
             except requests.exceptions.RequestException as head_error:
                 requests_error = head_error
                 continue
@@ -95,14 +134,18 @@ class Url:
 
     @classmethod
     def _get(
-        cls, url: str, headers: str = '', max_retries: int = 3,
+        cls,
+        url: str,
+        headers: str = '',
+        max_retries: int = 3,
+        stream: bool = False,
     ) -> requests.Response:
         requests_error = None
         for attempt in range(max_retries):
             if attempt > 0:
                 time.sleep(attempt)
             try:
-                res = requests.get(url, headers=headers, timeout=10)
+                res = _request('get', url, headers=headers, stream=stream)
             except requests.exceptions.RequestException as get_error:
                 requests_error = get_error
                 continue
@@ -120,10 +163,53 @@ class Url:
 UrlList = Annotated[list[Url], Field(min_length=1)]
 
 
+def _request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    # Sessions are not thread-safe, so each request takes an idle session,
+    # or a new one if all are in use, and puts it back once sent. List pops
+    # and appends are atomic.
+    try:
+        session = Url.sessions.pop()
+    except IndexError:
+        session = requests.Session()
+    try:
+        return getattr(session, method)(url, timeout=10, **kwargs)
+    except requests.exceptions.TooManyRedirects as redirects_error:
+        # The response of the last redirect lists those before it. A loop
+        # fails the same way again, so it raises an error without retry.
+        _check_loop([url] + [
+            hop.url for hop in redirects_error.response.history
+        ])
+        raise
+    finally:
+        Url.sessions.append(session)
+
+
+def _check_loop(chain: list[str]) -> None:
+    visited = set()
+    for index, url in enumerate(chain):
+        if url in visited:
+            raise ValueError('Redirect loop: {0}.'.format(
+                ' -> '.join(chain[:index + 1]),
+            ))
+        visited.add(url)
+
+
 @dataclass
 class StrictUrl(Url):
     """Represent a reachable URL."""
 
+    def etag(self) -> str:
+        """
+        Get the entity tag of the URL.
+
+        Returns:
+            Entity tag of the HEAD response, empty if it has none.
+
+        Raises:
+            ValueError: If the HEAD request fails.
+        """
+        return self._head(self.url).headers.get('ETag', '')
+
     @classmethod
     def _validate(cls, input_value: Any) -> 'StrictUrl':
         """
@@ -18,37 +18,80 @@ const infoIconElement = document.getElementById('search-info-icon');
 const tooltipElement = document.getElementById('info-tooltip');
 
 let searchView;
+let searchIndex;
+let itemsByName;
+let allItems;
+let archive;
+let fuseOptions;
+let facets;
+let cooccurrence;
 let fuse;
 let filterFuse;
 let results;
+let resultCount;
 let suggestions;
 let selectedSuggestionIndex = -1;
 const perPage = 9;
 
 document.addEventListener("DOMContentLoaded", initializeSearch);
 
-async function initializeSearch() {
-  const url = new URL("index.json", window.location.href);
+async function fetchJson(path) {
+  const url = new URL(path, window.location.href);
   const response = await fetch(url);
 
   if (!response.ok) {
     throw new Error(`Failed to fetch data: ${response.status}`);
   }
 
-  const data = await response.json();
+  return response.json();
+}
+
+async function initializeSearch() {
+  const data = await fetchJson("index.json");
+
+  try {
+    searchIndex = await fetchJson("search.json");
+    searchIndex.shardSet = new Set(searchIndex.shards);
+    searchIndex.cache = new Map();
+  } catch (error) {
+    searchIndex = null;
+  }
+
+  if (data['archive']) {
+    archive = await fetchJson(data['archive']);
+    archive.pending = [...archive['shards']];
+    archive.loading = Promise.resolve();
+    allItems = archive['index'];
+  } else {
+    allItems = data['index'];
+  }
+  itemsByName = new Map(allItems.map(item => [item['name'], item]));
+
+  try {
+    facets = loadFacets(await fetchJson("facets.json"));
+  } catch (error) {
+    facets = null;
+  }
+
+  try {
+    cooccurrence = loadCooccurrence(await fetchJson("cooccurrence.json"));
+  } catch (error) {
+    cooccurrence = null;
+  }
 
-  fuse = new Fuse(data['index'], {
+  fuseOptions = {
     useExtendedSearch: true,
     ignoreLocation: true,
     threshold: 0,
     keys: data['keys'],
-  });
+  };
+  fuse = await createFuse(fuseOptions);
 
   searchView = data['view'];
 
-  const filterData = [...new Set(data['index'].flatMap(item =>
-    item['filter'] || []
-  ))];
+  const filterData = archive && facets
+    ? [...facets.counts.keys()]
+    : [...new Set(allItems.flatMap(item => item['filter'] || []))];
 
   filterFuse = new Fuse(filterData, {minMatchCharLength: 2});
 
@@ -60,6 +103,72 @@ async function initializeSearch() {
   performSearch();
 }
 
+async function createFuse(options) {
+  const docs = searchIndex
+    ? searchIndex.docs.map(name => itemsByName.get(name))
+    : [];
+
+  if (docs.length === allItems.length && docs.every(doc => doc)) {
+    try {
+      const fuseIndex = Fuse.parseIndex(await fetchJson("fuse.json"));
+      return new Fuse(docs, options, fuseIndex);
+    } catch (error) {
+      console.warn(`Failed to load prebuilt search index: ${error}`);
+    }
+  }
+
+  return new Fuse(allItems, options);
+}
+
+function loadArchive(count) {
+  archive.loading = archive.loading.then(() => loadArchiveShards(count));
+  return archive.loading;
+}
+
+async function loadArchiveShards(count) {
+  const loaded = allItems.length;
+  while (archive.pending.length && allItems.length < count) {
+    const shards = archive.pending.splice(
+      0, count === Infinity ? archive.pending.length : 1
+    );
+    const items = await Promise.all(shards.map(shard =>
+      fetchJson(`archive/${encodeURIComponent(shard)}.json`)
+    ));
+    allItems = allItems.concat(...items);
+  }
+  if (allItems.length > loaded) {
+    itemsByName = new Map(allItems.map(item => [item['name'], item]));
+    if (facets) {
+      facets.items = facets.docs
+        .map(name => itemsByName.get(name))
+        .filter(item => item);
+    }
+    fuse = await createFuse(fuseOptions);
+  }
+}
+
+function loadFacets(data) {
+  return {
+    docs: data['docs'],
+    ordinals: new Map(data['docs'].map((name, ordinal) => [name, ordinal])),
+    bitsets: new Map(Object.entries(data['facets']).map(
+      ([facet, words]) => [facet, Uint32Array.from(words)]
+    )),
+    counts: new Map(Object.entries(data['counts'])),
+    items: data['docs'].map(name => itemsByName.get(name)).filter(item => item),
+    words: Math.ceil(data['docs'].length / 32),
+  };
+}
+
+function loadCooccurrence(data) {
+  return {
+    ordinals: new Map(data['facets'].map((facet, ordinal) => [facet, ordinal])),
+    facets: data['facets'],
+    matrix: data['matrix'],
+    top: new Map(Object.entries(data['top'])),
+  };
+}
+
 function initializeInfo() {
   infoIconElement.addEventListener('click', function (e) {
     e.stopPropagation();
@@ -80,7 +189,61 @@ function initializeInfo() {
   });
 }
 
-function performSearch() {
+function tokenize(text) {
+  return text.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || [];
+}
+
+function fetchShard(prefix) {
+  if (!searchIndex.cache.has(prefix)) {
+    searchIndex.cache.set(
+      prefix, fetchJson(`search/${encodeURIComponent(prefix)}.json`)
+    );
+  }
+  return searchIndex.cache.get(prefix);
+}
+
+async function searchTerm(term) {
+  const prefixes = term.length >= searchIndex.prefix
+    ? [term.slice(0, searchIndex.prefix)]
+    : searchIndex.shards.filter(prefix => prefix.startsWith(term));
+  const shards = await Promise.all(
+    prefixes.filter(prefix => searchIndex.shardSet.has(prefix)).map(fetchShard)
+  );
+  const scores = new Map();
+  shards.forEach(shard => {
+    Object.entries(shard).forEach(([token, postings]) => {
+      if (token.startsWith(term)) {
+        postings.forEach(([doc, score]) => {
+          scores.set(doc, Math.max(scores.get(doc) || 0, score));
+        });
+      }
+    });
+  });
+  return scores;
+}
+
+async function searchItems(query) {
+  const matches = fuse.search(query).map(({ item }) => item);
+  const terms = tokenize(query);
+
+  if (!searchIndex || !terms.length || /["'|!^$=]/.test(query)) {
+    return matches;
+  }
+
+  const termScores = await Promise.all(terms.map(searchTerm));
+  const totals = [...termScores[0].keys()]
+    .filter(doc => termScores.every(scores => scores.has(doc)))
+    .map(doc => [doc, termScores.reduce(
+      (total, scores) => total + scores.get(doc), 0
+    )])
+    .sort((a, b) => b[1] - a[1]);
+  const items = totals
+    .map(([doc]) => itemsByName.get(searchIndex.docs[doc]))
+    .filter(item => item);
+  return [...new Set([...items, ...matches])];
+}
+
+async function performSearch() {
   const url = new URL(window.location);
   const query = url.searchParams.get("q");
   const filters = url.searchParams.getAll("f");
@@ -89,29 +252,119 @@ function performSearch() {
 
   hideSuggestions();
 
-  results = query ? fuse.search(query).map(({ item }) => item) : fuse._docs;
+  const browsing = !query && !filters.length;
+  if (archive) {
+    const page = parseInt(url.searchParams.get("p"), 10) || 1;
+    await loadArchive(browsing ? page * perPage : Infinity);
+  }
 
-  if (filters.length) {
-    results = results.filter(result =>
-      result['filter'] &&
-      filters.every(filter =>
-        result['filter'].includes(filter)
-      )
-    );
+  if (query) {
+    results = await searchItems(query);
+  } else {
+    results = facets && !archive ? facets.items : allItems;
+  }
+
+  let filterCounts;
+  if (facets) {
+    const bitset = intersectFacets(toBitset(results), filters);
+    results = results.filter(item => hasBit(bitset, item));
+    filterCounts = countAvailableFacets(query, filters, bitset);
+  } else {
+    if (filters.length) {
+      results = results.filter(result =>
+        result['filter'] &&
+        filters.every(filter =>
+          result['filter'].includes(filter)
+        )
+      );
+    }
+    filterCounts = countFilters(results);
   }
 
-  results = [...results].sort((a, b) => b.weight - a.weight);
+  if (query || !facets) {
+    results = [...results].sort((a, b) => b.weight - a.weight);
+  }
+
+  resultCount = browsing && archive ? archive['total'] : results.length;
 
   displaySearchResults(results);
 
   displayActiveFilters(filters);
-  displayAvailableFilters(results.flatMap(result =>
-    result['filter'] || []
-    ).filter(filter => !filters.includes(filter)));
+  displayAvailableFilters(filterCounts, filters);
 
   displayPagination();
 }
 
+function toBitset(items) {
+  const bitset = new Uint32Array(facets.words);
+  items.forEach(item => {
+    const ordinal = facets.ordinals.get(item['name']);
+    if (ordinal !== undefined) {
+      bitset[ordinal >>> 5] |= 1 << (ordinal & 31);
+    }
+  });
+  return bitset;
+}
+
+function hasBit(bitset, item) {
+  const ordinal = facets.ordinals.get(item['name']);
+  return ordinal !== undefined && (bitset[ordinal >>> 5] >>> (ordinal & 31)) & 1;
+}
+
+function intersectFacets(bitset, filters) {
+  filters.forEach(filter => {
+    const facet = facets.bitsets.get(filter);
+    bitset.forEach((word, index) => {
+      bitset[index] = facet ? word & facet[index] : 0;
+    });
+  });
+  return bitset;
+}
+
+function popcount(word) {
+  word -= (word >>> 1) & 0x55555555;
+  word = (word & 0x33333333) + ((word >>> 2) & 0x33333333);
+  return Math.imul((word + (word >>> 4)) & 0x0f0f0f0f, 0x01010101) >>> 24;
+}
+
+function countFacets(bitset) {
+  const counts = new Map();
+  facets.bitsets.forEach((facet, filter) => {
+    counts.set(filter, facet.reduce(
+      (count, word, index) => count + popcount(word & bitset[index]), 0
+    ));
+  });
+  return counts;
+}
+
+function countAvailableFacets(query, filters, bitset) {
+  if (!query && !filters.length) {
+    return facets.counts;
+  }
+  if (!query && filters.length === 1 && cooccurrence?.ordinals.has(filters[0])) {
+    return cooccurrenceCounts(filters[0]);
+  }
+  return countFacets(bitset);
+}
+
+function cooccurrenceCounts(filter) {
+  const row = cooccurrence.matrix[cooccurrence.ordinals.get(filter)];
+  return new Map(cooccurrence.facets.map((facet, ordinal) => [facet, row[ordinal]]));
+}
+
+function cooccurs(filter, facet) {
+  const row = cooccurrence.ordinals.get(filter);
+  const column = cooccurrence.ordinals.get(facet);
+  return row === undefined || column === undefined || cooccurrence.matrix[row][column] > 0;
+}
+
+function countFilters(items) {
+  return items.flatMap(item => item['filter'] || []).reduce(
+    (counts, filter) => counts.set(filter, (counts.get(filter) || 0) + 1),
+    new Map()
+  );
+}
+
 function displaySearchInput(query) {
   searchInputElement.value = query;
 }
@@ -175,18 +428,11 @@ function displayActiveFilters(filters) {
   });
 }
 
-function displayAvailableFilters(filters) {
+function displayAvailableFilters(filterCounts, activeFilters) {
   searchAvailableFiltersElement.innerHTML = "";
-  const filterMap = filters.reduce((acc, filter) => {
-    const existing = acc.get(filter);
-    if (existing) {
-      existing.count++;
-    } else {
-      acc.set(filter, { filter, count: 1 });
-    }
-    return acc;
-  }, new Map());
-  const sortedFilters = Array.from(filterMap.values()).sort((a, b) => a.filter.localeCompare(b.filter));
+  const sortedFilters = Array.from(filterCounts, ([filter, count]) => ({ filter, count }))
+    .filter(item => item.count && !activeFilters.includes(item.filter))
+    .sort((a, b) => a.filter.localeCompare(b.filter));
 
   sortedFilters.forEach(item => {
     const button = Object.assign(document.createElement("button"), {
@@ -204,7 +450,7 @@ function displayAvailableFilters(filters) {
 function displayPagination() {
   const url = new URL(window.location);
   const page = parseInt(url.searchParams.get("p"), 10) || 1;
-  const total = Math.ceil(results.length / perPage);
+  const total = Math.ceil(resultCount / perPage);
   searchPaginationElement.innerHTML = "";
 
   if (total > 1) {
@@ -297,6 +543,14 @@ function handleSearchInput(event) {
   const filters = url.searchParams.getAll("f");
   const inputValue = event.target.value.trim();
   suggestions = inputValue ? filterFuse.search(inputValue).map(({ item }) => item) : [];
+  if (cooccurrence && filters.length) {
+    if (!inputValue) {
+      suggestions = cooccurrence.top.get(filters.at(-1)) || [];
+    }
+    suggestions = suggestions.filter(suggestion =>
+      filters.every(filter => cooccurs(filter, suggestion))
+    );
+  }
   suggestions = suggestions.filter(filter => !filters.includes(filter)).slice(0, 8);
   displaySuggestions(suggestions);
 }
@@ -383,6 +637,10 @@ function handlePaginationButton(event) {
 
   url.searchParams.set("p", page);
   window.history.pushState({}, "", url);
+  if (archive?.pending.length) {
+    performSearch();
+    return;
+  }
   displaySearchResults();
   displayPagination();
 }
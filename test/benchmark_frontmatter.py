@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Benchmark writing sections with each front matter format."""
+
+import argparse
+import random
+import tempfile
+import time
+
+from frontmatter import SERIALIZERS
+from hugo import Page, Section
+
+WORDS = 1000
+TEXT_WORDS = 200
+DESCRIPTION_WORDS = 20
+PAGES = 5000
+
+
+def synthetic_section(pages: int, seed: int) -> Section:
+    """
+    Generate pages with a front matter like the one of projects.
+
+    Parameters:
+        pages: Number of pages.
+        seed: Random seed.
+
+    Returns:
+        Section: Instance of Section class.
+    """
+    rng = random.Random(seed)
+    words = ['word{0}'.format(index) for index in range(WORDS)]
+    return Section({
+        'page{0}'.format(index): Page(
+            front_matter={
+                'title': ' '.join(rng.choices(words, k=3)),
+                'description': ' '.join(
+                    rng.choices(words, k=DESCRIPTION_WORDS),
+                ),
+                'tags': rng.sample(words, 5),
+                'links': [
+                    {'name': word, 'url': 'https://ohwr.org/{0}'.format(word)}
+                    for word in rng.sample(words, 3)
+                ],
+                'date': '2025-01-01',
+            },
+            markdown=' '.join(rng.choices(words, k=TEXT_WORDS)),
+        )
+        for index in range(pages)
+    })
+
+
+def write_rate(section: Section, jobs: int) -> float:
+    """
+    Write a section to a temporary directory.
+
+    Parameters:
+        section: Section to write.
+        jobs: Number of workers.
+
+    Returns:
+        Number of pages written per second.
+    """
+    with tempfile.TemporaryDirectory() as content_path:
+        start = time.perf_counter()
+        stats = section.write(content_path, jobs)
+        return stats.written / (time.perf_counter() - start)
+
+
+def benchmark(section: Section, jobs: int) -> None:
+    """
+    Print the section write throughput of each front matter format.
+
+    Formats whose optional encoder is not installed are skipped.
+
+    Parameters:
+        section: Section to write.
+        jobs: Number of workers.
+    """
+    page = next(iter(section.values()))
+    for front_matter_format in SERIALIZERS:
+        try:
+            page.render(front_matter_format)
+        except ValueError as render_error:
+            print('{0}: {1}'.format(  # noqa: WPS421
+                front_matter_format, render_error,
+            ))
+            continue
+        section.front_matter_format = front_matter_format
+        print('{0}: {1:.0f} pages/s'.format(  # noqa: WPS421
+            front_matter_format, write_rate(section, jobs),
+        ))
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--pages', type=int, default=PAGES)
+parser.add_argument('--jobs', type=int, default=1)
+parser.add_argument('--seed', type=int, default=0)
+args = parser.parse_args()
+
+benchmark(synthetic_section(args.pages, args.seed), args.jobs)
@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Benchmark related projects on synthetic projects."""
+
+import argparse
+import random
+import resource
+import time
+
+from project import ProjectPage, ProjectSection
+from related import BLOCK_SIZE, related_pages
+
+WORDS = 5000
+TAGS = 100
+TEXT_WORDS = 200
+PROJECTS = 10000
+
+
+def synthetic_section(projects: int, seed: int) -> ProjectSection:
+    """
+    Generate projects of random words and tags.
+
+    Word frequencies follow a Zipf-like law, as in real descriptions.
+
+    Parameters:
+        projects: Number of projects.
+        seed: Random seed.
+
+    Returns:
+        ProjectSection: Instance of ProjectSection class.
+    """
+    rng = random.Random(seed)
+    words = ['word{0}'.format(index) for index in range(WORDS)]
+    weights = [1 / (rank + 1) for rank in range(WORDS)]
+    return ProjectSection({
+        'project{0}'.format(index): ProjectPage(
+            front_matter={
+                'title': ' '.join(rng.choices(words, weights, k=3)),
+                'id': 'project{0}'.format(index),
+                'tags': [
+                    'tag{0}'.format(tag) for tag in rng.sample(range(TAGS), 3)
+                ],
+            },
+            markdown=' '.join(rng.choices(words, weights, k=TEXT_WORDS)),
+        )
+        for index in range(projects)
+    })
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--projects', type=int, default=PROJECTS)
+parser.add_argument('--related', type=int, default=3)
+parser.add_argument('--block-size', type=int, default=BLOCK_SIZE)
+parser.add_argument('--seed', type=int, default=0)
+args = parser.parse_args()
+
+section = synthetic_section(args.projects, args.seed)
+start = time.perf_counter()
+related_pages(section, args.related, args.block_size)
+print('{0} projects: {1:.2f} s, {2} MiB peak memory'.format(  # noqa: WPS421
+    args.projects,
+    time.perf_counter() - start,
+    resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024,
+))
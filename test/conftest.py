@@ -5,8 +5,9 @@
 import pytest
 
 from config import Contact, Project
+from probe import ImageUrl
 from repository import Repository
-from url import StrictUrl
+from url import StrictUrl, Url
 
 
 @pytest.fixture(autouse=True)
@@ -14,11 +15,24 @@ def mock_requests(mocker):
     mock_response = mocker.Mock()
     mock_response.status_code = 200
     mock_response.text = "# Description\n\nExample description"
-    mocker.patch('requests.head', return_value=mock_response)
-    mocker.patch('requests.get', return_value=mock_response)
+    mock_response.content = b""
+    mock_response.headers = {}
+    mock_response.iter_content.side_effect = lambda size: iter([
+        mock_response.content,
+    ])
+    mocker.patch('requests.Session.head', return_value=mock_response)
+    mocker.patch('requests.Session.get', return_value=mock_response)
     return mock_response
 
 
+@pytest.fixture(autouse=True)
+def clear_url_heads(mocker):
+    mocker.patch.dict(Url.heads, clear=True)
+    mocker.patch.dict(ImageUrl.probes, clear=True)
+    mocker.patch.object(ImageUrl, "stored", {})
+    mocker.patch.object(Url, "sessions", [])
+
+
 @pytest.fixture
 def sample_contact():
     return Contact(name="John Doe", email="john@example.com")
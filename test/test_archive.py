@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for archive module."""
+
+import datetime
+import json
+
+import pytest
+
+from archive import newest, read_archive, summary, write_archive
+
+LATEST = "latest.json"
+ARCHIVE = "archive"
+NAME = "name"
+YEAR = 2025
+OLDEST = "a"
+NEWEST = "b"
+OLD = "c"
+NEW = "d"
+NEWER = "e"
+
+
+def dated(name, year, month=1):
+    """Return a page name and its date."""
+    return datetime.date(year, month, 1), name
+
+
+def record(name):
+    """Return the record of a page."""
+    return {NAME: name}
+
+
+@pytest.fixture
+def timeline():
+    """Return the merged timelines of two projects over three years."""
+    return newest([
+        [
+            dated(NEWEST, YEAR, 2),
+            dated(NEW, YEAR),
+            dated(OLDEST, YEAR - 2),
+        ],
+        [dated(NEWER, YEAR), dated(OLD, YEAR - 1)],
+    ])
+
+
+def test_summary():
+    """Test summarizing Markdown as plain text."""
+    markdown = "## New *release*\n\n![logo](logo.png) See [the docs](url).\n"
+
+    assert summary(markdown) == "New release See the docs."
+    assert summary(markdown, 2) == "New release"
+
+
+def test_newest(timeline):
+    """Test merging timelines newest first, then by name in reverse."""
+    assert [name for _, name in timeline] == [
+        NEWEST, NEWER, NEW, OLD, OLDEST,
+    ]
+
+
+class TestArchive:
+    """Tests for archive shards."""
+
+    def test_write_archive(self, timeline, tmp_path):
+        """Test writing the newest records and yearly shards."""
+        write_archive(str(tmp_path), timeline, record, 2)
+
+        assert json.loads((tmp_path / LATEST).read_text()) == {
+            "index": [record(NEWEST), record(NEWER)],
+            "shards": ["2025", "2024", "2023"],
+            "total": 5,
+        }
+        assert json.loads((tmp_path / ARCHIVE / "2025.json").read_text()) == [
+            record(NEW),
+        ]
+
+    def test_write_archive_stale(self, timeline, tmp_path):
+        """Test removing the shards of years no longer archived."""
+        pages = list(timeline)
+        write_archive(str(tmp_path), pages, record, 2)
+        write_archive(str(tmp_path), pages[:-1], record, 2)
+
+        assert sorted(
+            path.name for path in (tmp_path / ARCHIVE).iterdir()
+        ) == ["2024.json", "2025.json"]
+
+    def test_write_archive_failure(self, timeline, tmp_path, caplog):
+        """Test that write errors are logged."""
+        (tmp_path / ARCHIVE).write_text("")
+
+        write_archive(str(tmp_path), timeline, record)
+
+        assert "Failed to write" in caplog.text
+
+    def test_read_archive(self, timeline, tmp_path):
+        """Test reading all records back, newest first."""
+        write_archive(str(tmp_path), timeline, record, 1)
+
+        assert read_archive(str(tmp_path / LATEST)) == [
+            record(name) for name in (NEWEST, NEWER, NEW, OLD, OLDEST)
+        ]
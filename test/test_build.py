@@ -0,0 +1,93 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for build module."""
+
+import argparse
+
+import pytest
+
+from build import (
+    LICENSES,
+    NEWS_IMAGES,
+    PROJECT_IMAGES,
+    SECTIONS,
+    STATE,
+    WRITE_NEWS,
+    WRITE_PROJECTS,
+    build_graph,
+)
+
+PROJECT = "project"
+REDIRECTS = "redirects"
+STAGE = "stage"
+SWAP = "swap"
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Return a configuration with a sources directory."""
+    return argparse.Namespace(sources=str(tmp_path), tags=[])
+
+
+@pytest.fixture
+def args():
+    """Return the command line arguments of a build without state file."""
+    return argparse.Namespace(state=None, news_retention=0)
+
+
+class TestBuildGraph:
+    """Tests for build_graph function."""
+
+    def test_build_graph(self, config, args):
+        """Test that a full build loads the licenses and the redirects."""
+        graph = build_graph(config, args)
+
+        assert {LICENSES, REDIRECTS, STATE} <= set(graph.tasks)
+
+    def test_build_graph_sections(self, config, args):
+        """Test that each section only waits for its own inputs."""
+        graph = build_graph(config, args)
+
+        assert graph.tasks[SECTIONS].needs == (STATE,)
+        assert graph.tasks[WRITE_PROJECTS].needs == (PROJECT_IMAGES,)
+        assert graph.tasks[WRITE_NEWS].needs == (NEWS_IMAGES,)
+        assert graph.tasks["news feeds"].needs == (NEWS_IMAGES,)
+
+    def test_build_graph_staged(self, config, args):
+        """Test that the sources are staged once, and swapped once."""
+        graph = build_graph(config, args)
+
+        assert STAGE in graph.tasks[PROJECT_IMAGES].needs
+        assert STAGE in graph.tasks[REDIRECTS].needs
+        assert {WRITE_PROJECTS, WRITE_NEWS} <= set(graph.tasks[SWAP].needs)
+        assert graph.tasks["save state"].needs == (STATE, SWAP)
+
+    def test_build_graph_refresh(self, config, args, mocker, tmp_path):
+        """Test that a refresh keeps the state and licenses of the build."""
+        sections = (mocker.Mock(), mocker.Mock())
+        generate = mocker.patch(
+            "build.generate_sections", return_value=sections,
+        )
+        mocker.patch(
+            "build.store_images", side_effect=lambda *stage: stage[3],
+        )
+        mocker.patch("build.write_section")
+        mocker.patch("build.write_indexes")
+        build_state = mocker.Mock()
+        licenses = [mocker.Mock()]
+
+        outputs = build_graph(
+            config, args, build_state, {PROJECT}, licenses,
+        ).run()
+
+        assert REDIRECTS not in outputs
+        assert outputs[STATE] is build_state
+        generate.assert_called_once_with(
+            config, args, build_state, {PROJECT}, licenses,
+        )
+        sections[1].write_feeds.assert_called_once()
+        build_state.save.assert_called_once()
+        assert (tmp_path / "content").is_dir()
+        assert not (tmp_path / ".content.staging").exists()
@@ -7,10 +7,18 @@ import pytest
 from datetime import date
 from pydantic import ValidationError
 
-from config import Contact, News, Redirect, Config
+from config import Contact, News, Redirect, RedirectRule, Config
 from manifest import Manifest
 from repository import Repository
 
+REDIRECT_TARGET = "https://github.com/moved"
+TAGS = ("test-tag",)
+VALIDATE = "url.StrictUrl._validate"
+OLD_URL = "/old"
+NEW_TARGET = "https://github.com/new"
+RULE_URL = "docs/*"
+RULE_TARGET = "https://example.com/:splat"
+
 
 @pytest.fixture
 def valid_markdown():
@@ -42,7 +50,7 @@ class TestContact:
 
 class TestNews:
     def test_from_markdown_valid(self, mocker, valid_markdown):
-        mocker.patch('url.StrictUrl._validate', return_value=True)
+        mocker.patch(VALIDATE, return_value=True)
         news = News.from_markdown(valid_markdown)
         assert news.title == "Sample News"
         assert news.date == date.fromisoformat('2023-01-15')
@@ -75,7 +83,7 @@ class TestConfig:
     def test_valid_config(
         self, mocker, sample_projects, tmp_path, dummy_licenses_file
     ):
-        mocker.patch('url.StrictUrl._validate', return_value=True)
+        mocker.patch(VALIDATE, return_value=True)
         mock_repo = mocker.Mock(spec=Repository)
         mocker.patch('repository.Repository.create', return_value=mock_repo)
 
@@ -83,14 +91,132 @@ class TestConfig:
             sources=tmp_path,
             licenses=dummy_licenses_file,
             redirects=[Redirect(
-                url="/old",
-                target="https://github.com/new"
+                url=OLD_URL,
+                target=NEW_TARGET
             )],
-            tags=["test-tag"],
+            tags=TAGS,
             projects=sample_projects
         )
 
         assert len(config.projects) == 1
         assert config.projects[0].id == "test-project"
         assert config.licenses == dummy_licenses_file
-        assert config.redirects[0].url == "/old"
+        assert config.redirects[0].url == OLD_URL
+
+    def test_redirect_rule_path_mismatch(
+        self, mocker, sample_projects, tmp_path, dummy_licenses_file
+    ):
+        mocker.patch(VALIDATE, return_value=True)
+
+        with pytest.raises(ValidationError, match="does not match"):
+            Config(
+                sources=tmp_path,
+                licenses=dummy_licenses_file,
+                redirects=[Redirect(
+                    url=OLD_URL,
+                    target=NEW_TARGET
+                )],
+                redirect_rules=[RedirectRule(
+                    url=RULE_URL,
+                    target=RULE_TARGET,
+                    paths=["other/a"],
+                )],
+                tags=TAGS,
+                projects=sample_projects
+            )
+
+    def test_redirect_rule_path_is_redirect(
+        self, sample_projects, tmp_path, dummy_licenses_file
+    ):
+        with pytest.raises(ValidationError, match="is a redirect"):
+            Config(
+                sources=tmp_path,
+                licenses=dummy_licenses_file,
+                redirects=[Redirect(
+                    url="docs/old",
+                    target=NEW_TARGET
+                )],
+                redirect_rules=[RedirectRule(
+                    url=RULE_URL,
+                    target=RULE_TARGET,
+                    paths=["/docs/old/"],
+                )],
+                tags=TAGS,
+                projects=sample_projects
+            )
+
+    def test_redirect_rule_targets(
+        self, mocker, sample_projects, tmp_path, dummy_licenses_file
+    ):
+        head = mocker.patch('url.Url._head')
+
+        Config(
+            sources=tmp_path,
+            licenses=dummy_licenses_file,
+            redirects=[Redirect(
+                url="/moved",
+                target=REDIRECT_TARGET
+            )],
+            redirect_rules=[RedirectRule(
+                url=RULE_URL,
+                target=RULE_TARGET,
+                paths=["docs/a", "docs/b/c"],
+            )],
+            tags=TAGS,
+            projects=sample_projects
+        )
+
+        head.assert_any_call("https://example.com/a")
+        assert mocker.call("https://example.com/b/c") not in head.mock_calls
+
+    def test_redirect_rule_path_shadowed(
+        self, mocker, sample_projects, tmp_path, dummy_licenses_file
+    ):
+        mocker.patch(VALIDATE, return_value=True)
+
+        with pytest.raises(ValidationError, match="does not match"):
+            Config(
+                sources=tmp_path,
+                licenses=dummy_licenses_file,
+                redirects=[Redirect(
+                    url=OLD_URL,
+                    target=NEW_TARGET
+                )],
+                redirect_rules=[
+                    RedirectRule(
+                        url=RULE_URL,
+                        target=RULE_TARGET,
+                        paths=["docs/a", "docs/api/b"],
+                    ),
+                    RedirectRule(
+                        url="docs/api/:page",
+                        target="https://api.example.com/:page",
+                    ),
+                ],
+                tags=TAGS,
+                projects=sample_projects
+            )
+
+    def test_from_yaml_deferred(self, mocker, tmp_path, dummy_licenses_file):
+        head = mocker.patch('url.Url._head')
+        yaml_str = "\n".join([
+            "sources: {0}".format(tmp_path),
+            "licenses: {0}".format(dummy_licenses_file),
+            "redirects: [{url: /moved, target: '%s'}]" % REDIRECT_TARGET,
+            "redirect_rules:",
+            "  - {url: 'docs/*', target: '%s'," % RULE_TARGET,
+            "     paths: [docs/a, docs/b]}",
+            "tags: [test-tag]",
+            "projects:",
+            "  - id: test-project",
+            "    repository: https://github.com/example/project.git",
+            "    contact: {name: John Doe, email: john@example.com}",
+        ])
+
+        config = Config.from_yaml(yaml_str, deferred=True)
+        head.assert_not_called()
+        config.check_targets(jobs=2)
+
+        assert sorted(call.args[0] for call in head.call_args_list) == [
+            "https://example.com/a", REDIRECT_TARGET,
+        ]
@@ -0,0 +1,129 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for facets module."""
+
+import datetime
+
+import numpy
+import pytest
+
+from facets import FacetCooccurrence, FacetIndex
+from files import read_json
+from news import NewsPage, NewsSection
+from project import ProjectPage, ProjectSection
+
+FPGA = "FPGA"
+TIMING = "Timing"
+RADIATION = "Radiation"
+PAGES = 40
+HIGH_BIT = 33
+
+
+def project(weight, tags):
+    """Return a project page."""
+    front_matter = {"title": "Title", "id": "id", "tags": tags}
+    if weight:
+        front_matter["weight"] = weight
+    return ProjectPage(front_matter=front_matter, markdown="")
+
+
+@pytest.fixture
+def project_section():
+    """Return a projects section with weighted and unweighted pages."""
+    return ProjectSection({
+        "a": project(None, [FPGA]),
+        "b": project(1, [FPGA, TIMING]),
+        "c": project(2, [TIMING]),
+        "d": project(1, []),
+    })
+
+
+class TestFacetIndex:
+    """Tests for FacetIndex class."""
+
+    def test_from_section(self, project_section):
+        """Test page order and bitsets."""
+        facet_index = FacetIndex.from_section(project_section, ["Unused"])
+
+        assert facet_index.docs == ["c", "b", "d", "a"]
+        assert facet_index == {"Unused": 0, FPGA: 0b1010, TIMING: 0b11}
+
+    def test_date_order(self):
+        """Test that pages of equal weight are ordered by date."""
+        section = NewsSection({
+            name: NewsPage(
+                front_matter={"title": name, "project": FPGA, "date": date},
+                markdown="",
+            )
+            for name, date in (
+                ("old", datetime.date.fromisoformat("2025-01-01")),
+                ("new", datetime.date.fromisoformat("2025-01-02")),
+                ("none", None),
+            )
+        })
+
+        assert FacetIndex.from_section(section).docs == ["new", "old", "none"]
+
+    def test_words(self):
+        """Test splitting a bitset into 32-bit words."""
+        facet_index = FacetIndex([str(ordinal) for ordinal in range(PAGES)])
+
+        assert facet_index.words(2 ** HIGH_BIT + 1) == [1, 2]
+
+    def test_write(self, project_section, tmp_path):
+        """Test writing bitsets and counts."""
+        FacetIndex.from_section(project_section).write(str(tmp_path))
+        facets = read_json(str(tmp_path / "facets.json"))
+
+        assert facets["facets"] == {FPGA: [0b1010], TIMING: [0b11]}
+        assert facets["counts"] == {FPGA: 2, TIMING: 2}
+
+
+class TestFacetCooccurrence:
+    """Tests for FacetCooccurrence class."""
+
+    def test_from_section(self, project_section):
+        """Test counting co-occurrences of known facets."""
+        cooccurrence = FacetCooccurrence.from_section(
+            project_section, [TIMING, FPGA, RADIATION],
+        )
+
+        assert cooccurrence.facets == [TIMING, FPGA, RADIATION]
+        assert cooccurrence.matrix.tolist() == [
+            [2, 1, 0],
+            [1, 2, 0],
+            [0, 0, 0],
+        ]
+
+    def test_top(self):
+        """Test ordering by count, then by facet, without self or zeros."""
+        cooccurrence = FacetCooccurrence(
+            [FPGA, TIMING, RADIATION],
+            numpy.array([
+                [3, 1, 2],
+                [1, 2, 1],
+                [2, 1, 2],
+            ]),
+        )
+
+        assert cooccurrence.top() == {
+            FPGA: [RADIATION, TIMING],
+            TIMING: [FPGA, RADIATION],
+            RADIATION: [FPGA, TIMING],
+        }
+        assert cooccurrence.top(1)[TIMING] == [FPGA]
+
+    def test_write(self, project_section, tmp_path):
+        """Test writing the matrix and top facets."""
+        FacetCooccurrence.from_section(
+            project_section, [FPGA, TIMING],
+        ).write(str(tmp_path))
+        cooccurrence = read_json(str(tmp_path / "cooccurrence.json"))
+
+        assert cooccurrence == {
+            "facets": [FPGA, TIMING],
+            "matrix": [[2, 1], [1, 2]],
+            "top": {FPGA: [TIMING], TIMING: [FPGA]},
+        }
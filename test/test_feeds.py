@@ -0,0 +1,168 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for feeds module."""
+
+import datetime
+import json
+from xml.etree import ElementTree  # noqa: S405
+
+import pytest
+
+from feeds import ATOM, ENTRIES, HUGO_BASE_URL, HUGO_CONFIG, STATE, AtomFeeds
+from news import URL, NewsPage, NewsSection
+
+NOW = datetime.datetime.fromisoformat("2025-03-01T12:00:00+00:00")
+LATER = NOW + datetime.timedelta(days=1)
+SWITCH = "switch-1"
+NODE = "node-1"
+FEED = "feed.xml"
+SWITCH_FEED = "feeds/switch.xml"
+BASE_URL = "https://ohwr.org"
+
+
+def news(name, date, markdown="New release."):
+    """Return a news page, named after its project."""
+    project = name.split("-")[0]
+    return NewsPage(
+        front_matter={
+            "title": "{0} release".format(project),
+            "date": date,
+            "project": project.title(),
+            "project_id": project,
+            "url": "/news/{0}/".format(name),
+            "summary": markdown,
+        },
+        markdown=markdown,
+    )
+
+
+@pytest.fixture
+def pages():
+    """Return news of two projects."""
+    return {
+        SWITCH: news(SWITCH, "2025-01-02"),
+        NODE: news(NODE, "2025-02-03"),
+    }
+
+
+def update(pages, path, now, entries=ENTRIES):
+    """Update the feeds as a new run would."""
+    AtomFeeds(
+        str(path), str(path / STATE), URL, BASE_URL, entries=entries,
+    ).update(
+        pages, NewsSection(pages).timelines(), now,
+    )
+
+
+def parse(path, feed=FEED):
+    """Return the entry ids and updated timestamps of a feed."""
+    root = ElementTree.parse(path / feed).getroot()  # noqa: S314
+    return [
+        (
+            entry.findtext("{{{0}}}id".format(ATOM)),
+            entry.findtext("{{{0}}}updated".format(ATOM)),
+        )
+        for entry in root.iter("{{{0}}}entry".format(ATOM))
+    ]
+
+
+class TestAtomFeeds:
+    """Tests for AtomFeeds class."""
+
+    def test_update(self, pages, tmp_path):
+        """Test writing the global and project feeds, newest first."""
+        update(pages, tmp_path, NOW)
+
+        assert parse(tmp_path) == [
+            ("https://ohwr.org/news/node-1/", "2025-02-03T00:00:00Z"),
+            ("https://ohwr.org/news/switch-1/", "2025-01-02T00:00:00Z"),
+        ]
+        assert len(parse(tmp_path, SWITCH_FEED)) == 1
+        assert len(parse(tmp_path, "feeds/node.xml")) == 1
+
+    def test_update_unchanged(self, pages, tmp_path):
+        """Test that feeds of unchanged news stay byte-identical."""
+        feed_path = tmp_path / FEED
+        update(pages, tmp_path, NOW)
+        feed = feed_path.read_bytes()
+        mtime = feed_path.stat().st_mtime_ns
+
+        update(pages, tmp_path, LATER)
+
+        assert feed_path.read_bytes() == feed
+        assert feed_path.stat().st_mtime_ns == mtime
+
+    def test_update_changed(self, pages, tmp_path):
+        """Test that only changed news get a new updated timestamp."""
+        update(pages, tmp_path, NOW)
+        pages[SWITCH].markdown = "Fixed release."
+
+        update(pages, tmp_path, LATER)
+
+        assert [updated for _, updated in parse(tmp_path)] == [
+            "2025-02-03T00:00:00Z", "2025-03-02T12:00:00Z",
+        ]
+
+    def test_update_stale(self, pages, tmp_path):
+        """Test removing the feeds of projects without news."""
+        update(pages, tmp_path, NOW)
+        pages.pop(SWITCH)
+
+        update(pages, tmp_path, NOW)
+
+        assert not (tmp_path / SWITCH_FEED).exists()
+        assert len(parse(tmp_path)) == 1
+
+        update({}, tmp_path, NOW)
+
+        assert not (tmp_path / FEED).exists()
+        assert not list((tmp_path / "feeds").iterdir())
+
+    def test_update_entries(self, pages, tmp_path):
+        """Test that only the newest entries of each feed are rendered."""
+        pages["switch-0"] = news("switch-0", "2024-12-01")
+
+        update(pages, tmp_path, NOW, entries=1)
+
+        assert [entry_id for entry_id, _ in parse(tmp_path)] == [
+            "https://ohwr.org/news/node-1/",
+        ]
+        assert sorted(json.loads(
+            (tmp_path / STATE).read_text(),
+        )) == [NODE, SWITCH]
+
+
+class TestFromHugo:
+    """Tests for the site URL of the feeds."""
+
+    @pytest.fixture(autouse=True)
+    def clear_base_url(self, monkeypatch):
+        """Clear the site URL set by the environment."""
+        monkeypatch.delenv(HUGO_BASE_URL, raising=False)
+
+    def test_from_hugo(self, tmp_path):
+        """Test taking the site URL from the Hugo configuration."""
+        (tmp_path / HUGO_CONFIG).write_text("baseURL: 'https://ohwr.org/'\n")
+
+        feeds = AtomFeeds.from_hugo("static", str(tmp_path), URL)
+
+        assert feeds.base_url == BASE_URL
+        assert feeds.state == str(tmp_path / STATE)
+
+    def test_from_hugo_without_url(self, tmp_path):
+        """Test that a Hugo configuration without site URL fails."""
+        (tmp_path / HUGO_CONFIG).write_text("title: 'Site'\n")
+
+        with pytest.raises(ValueError, match="No site URL"):
+            AtomFeeds.from_hugo("static", str(tmp_path), URL)
+
+    def test_from_hugo_environment(self, tmp_path, monkeypatch):
+        """Test that the site URL of the environment comes first."""
+        (tmp_path / HUGO_CONFIG).write_text("baseURL: 'https://ohwr.org/'\n")
+        monkeypatch.setenv(HUGO_BASE_URL, "https://example.github.io/ohwr/")
+
+        feeds = AtomFeeds.from_hugo("static", str(tmp_path), URL)
+
+        assert feeds.base_url == "https://example.github.io/ohwr"
@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for generated file helpers."""
+
+import errno
+import os
+
+import pytest
+
+from files import StagedDirectory, read_json, write_json, write_text
+
+INDEX = "_index.md"
+INDEX_TEXT = "index"
+PAGE = "page.md"
+PAGE_TEXT = "new"
+STAGE = ".section.staging"
+
+
+@pytest.fixture
+def target(tmp_path):
+    """Fixture providing a target directory with one file."""
+    path = tmp_path / "section"
+    path.mkdir()
+    (path / INDEX).write_text(INDEX_TEXT)
+    return path
+
+
+class TestWrite:
+    """Tests for the write helpers."""
+
+    def test_write_text_unchanged(self, tmp_path):
+        """Test that identical content is not rewritten."""
+        path = str(tmp_path / "file.txt")
+
+        assert write_text(path, "content") is True
+        assert write_text(path, "content") is False
+        assert write_text(path, "changed") is True
+
+    def test_write_json_stable(self, tmp_path):
+        """Test that key order does not change the JSON bytes."""
+        path = str(tmp_path / "file.json")
+
+        assert write_json(path, {"b": 1, "a": 2}) is True
+        assert write_json(path, {"a": 2, "b": 1}) is False
+        assert read_json(path) == {"a": 2, "b": 1}
+
+    def test_write_json_compact(self, tmp_path):
+        """Test writing JSON without optional whitespace."""
+        path = tmp_path / "file.json"
+        json_data = {"y": [1, 2], "x": None}
+        write_json(str(path), json_data, compact=True)
+
+        assert path.read_text() == '{"x":null,"y":[1,2]}'
+
+    def test_read_json_invalid(self, tmp_path):
+        """Test reading an invalid JSON file."""
+        path = tmp_path / "file.json"
+        path.write_text("{")
+
+        with pytest.raises(ValueError, match="Failed to read"):
+            read_json(str(path))
+
+
+class TestStagedDirectory:
+    """Tests for the StagedDirectory class."""
+
+    def test_swap(self, target):
+        """Test that staged changes replace the target on success."""
+        with StagedDirectory(str(target)) as stage:
+            assert (target.parent / STAGE).samefile(stage)
+            assert not (target / PAGE).exists()
+            (target.parent / STAGE / PAGE).write_text(PAGE_TEXT)
+
+        assert (target / PAGE).read_text() == PAGE_TEXT
+        assert (target / INDEX).read_text() == INDEX_TEXT
+        assert not (target.parent / STAGE).exists()
+
+    def test_failure_keeps_target(self, target):
+        """Test that a failing block leaves the target untouched."""
+        with pytest.raises(RuntimeError):
+            with StagedDirectory(str(target)) as stage:
+                (target.parent / STAGE / PAGE).write_text(
+                    stage,
+                )
+                raise RuntimeError("crash")
+
+        assert not (target / PAGE).exists()
+        assert not (target.parent / STAGE).exists()
+
+    def test_missing_target(self, tmp_path):
+        """Test staging a directory that does not exist yet."""
+        path = tmp_path / "section"
+        with StagedDirectory(str(path)):
+            (tmp_path / STAGE / PAGE).write_text(PAGE_TEXT)
+
+        assert (path / PAGE).read_text() == PAGE_TEXT
+
+    def test_unchanged_files_linked(self, target):
+        """Test that unchanged files keep their inode through a swap."""
+        index = target / INDEX
+        inode = index.stat().st_ino
+        with StagedDirectory(str(target)) as stage:
+            write_text(os.path.join(stage, PAGE), PAGE_TEXT)
+            write_text(os.path.join(stage, INDEX), INDEX_TEXT)
+
+        assert index.stat().st_ino == inode
+        assert (target / PAGE).read_text() == PAGE_TEXT
+
+    def test_changed_files_replaced(self, target):
+        """Test that writing a staged file leaves the target untouched."""
+        with StagedDirectory(str(target)) as stage:
+            write_text(os.path.join(stage, INDEX), PAGE_TEXT)
+
+            assert (target / INDEX).read_text() == INDEX_TEXT
+
+        assert (target / INDEX).read_text() == PAGE_TEXT
+
+    def test_swap_without_exchange(self, target, mocker):
+        """Test swapping with renames where exchanging is unsupported."""
+        mocker.patch.object(
+            StagedDirectory,
+            "_exchange",
+            side_effect=OSError(errno.ENOSYS, "unsupported"),
+        )
+        with StagedDirectory(str(target)) as stage:
+            write_text(os.path.join(stage, PAGE), PAGE_TEXT)
+
+        assert (target / PAGE).read_text() == PAGE_TEXT
+        assert not (target.parent / ".section.backup").exists()
+
+    def test_recover_interrupted_swap(self, target):
+        """Test that a swap interrupted between renames is rolled back."""
+        target.rename(target.parent / ".section.backup")
+        with StagedDirectory(str(target)):
+            assert (target / INDEX).read_text() == INDEX_TEXT
+
+        assert (target / INDEX).read_text() == INDEX_TEXT
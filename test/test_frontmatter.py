@@ -0,0 +1,203 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for frontmatter module."""
+
+import datetime
+import json
+import shutil
+import subprocess  # noqa: S404
+import tomllib
+
+import pytest
+import yaml
+
+from frontmatter import SERIALIZERS
+from hugo import ADAPTER_DATES, ADAPTER_FIELDS, Page, Section
+
+TOML = "toml"
+YAML = "yaml"
+TOMLI_W = "tomli_w"
+JSON_FORMAT = "json"
+JSON = SERIALIZERS[JSON_FORMAT]
+MARKDOWN = "# Test Page\n\nThis is a test page."
+# Project ID with uppercase letters, which Hugo lowercases in page paths.
+PROJECT_ID = "WR2RF-VME"
+FRONT_MATTER = dict(
+    title="Tëst Page",
+    date=datetime.date.fromisoformat("2025-01-02"),
+    summary="Summary.",
+    weight=2,
+    tags=["hardware", "fpga"],
+    links=[dict(url="https://ohwr.org", name="OHWR")],
+)
+SITE = """
+baseURL = "https://example.org/"
+disableKinds = ["taxonomy", "term", "RSS", "sitemap"]
+"""
+LAYOUT = """
+{{ .Title }} {{ .Date.Format "2006-01-02" }} {{ delimit .Params.tags "," }}
+{{ .Weight }} {{ .Summary }} {{ .RelPermalink }}
+{{ range .Params.links }}{{ .name }} {{ .url }}{{ end }}
+{{ .Content }}
+"""
+
+
+def split(rendered, closing):
+    """Split a rendered page into its front matter and its content."""
+    front_matter, _, markdown = rendered.partition(closing)
+    return front_matter, markdown
+
+
+def parse(rendered, front_matter_format):
+    """Parse a rendered page back, with dates as strings like in JSON."""
+    if front_matter_format == JSON_FORMAT:
+        front_matter, markdown = split(rendered, "\n")
+        loaded = json.loads(front_matter)
+    else:
+        closing = rendered[:4]
+        front_matter, markdown = split(rendered[4:], closing)
+        load = yaml.safe_load if closing == "---\n" else tomllib.loads
+        loaded = load(front_matter)
+    return json.loads(json.dumps(loaded, default=str)), markdown
+
+
+def build(path, front_matter_format, content_adapter=None):
+    """Build a Hugo site of one page and return the page HTML."""
+    site = path / (content_adapter or front_matter_format)
+    (site / "layouts" / "_default").mkdir(parents=True)
+    (site / "hugo.toml").write_text(SITE)
+    (site / "layouts" / "_default" / "single.html").write_text(LAYOUT)
+    (site / "layouts" / "_default" / "list.html").write_text("")
+    section = Section({"page": Page(dict(FRONT_MATTER), MARKDOWN)})
+    section.front_matter_format = front_matter_format
+    section.content_adapter = content_adapter
+    section.write(str(site / "content" / "pages"))
+    subprocess.run(  # noqa: S603
+        [shutil.which("hugo"), "--source", str(site), "--quiet"],
+        check=True,
+    )
+    return (site / "public" / "pages" / "page" / "index.html").read_text()
+
+
+class TestSerializers:
+    """Tests for the front matter serializers."""
+
+    def test_yaml(self):
+        """Test rendering YAML front matter."""
+        rendered = SERIALIZERS[YAML].render(FRONT_MATTER, MARKDOWN)
+
+        assert rendered.startswith("---\ndate: 2025-01-02\n")
+        assert rendered.endswith("---\n{0}".format(MARKDOWN))
+
+    def test_json(self):
+        """Test rendering compact JSON front matter with sorted keys."""
+        front_matter, markdown = split(
+            JSON.render(FRONT_MATTER, MARKDOWN), "\n",
+        )
+
+        assert markdown == MARKDOWN
+        assert list(json.loads(front_matter)) == sorted(FRONT_MATTER)
+        assert json.loads(front_matter)["date"] == "2025-01-02"
+        assert " " not in front_matter.replace(FRONT_MATTER["title"], "")
+
+    def test_json_without_orjson(self, mocker):
+        """Test that the standard library encoder gives the same JSON."""
+        front_matter = dict(
+            title="Tëst",
+            date=datetime.date.fromisoformat("2025-01-02"),
+            lastmod=datetime.datetime.fromisoformat(
+                "2025-01-02T03:04:05+00:00",
+            ),
+            publishDate=datetime.datetime.fromisoformat("2025-01-02T03:04:05"),
+        )
+        golden = (
+            '{"date":"2025-01-02","lastmod":"2025-01-02T03:04:05+00:00",'
+            '"publishDate":"2025-01-02T03:04:05","title":"Tëst"}\n'
+        ) + MARKDOWN
+        rendered = JSON.render(front_matter, MARKDOWN)
+        mocker.patch("frontmatter.orjson", None)
+
+        assert JSON.render(front_matter, MARKDOWN) == rendered == golden
+
+    def test_json_invalid(self):
+        """Test rendering invalid JSON front matter."""
+        with pytest.raises(ValueError, match="Failed to create JSON"):
+            JSON.render({("key",): "value"}, MARKDOWN)
+
+    def test_toml(self):
+        """Test rendering TOML front matter with sorted keys."""
+        pytest.importorskip(TOMLI_W)
+        front_matter, markdown = split(
+            SERIALIZERS[TOML].render(FRONT_MATTER, MARKDOWN)[4:], "+++\n",
+        )
+
+        assert markdown == MARKDOWN
+        assert tomllib.loads(front_matter) == FRONT_MATTER
+
+    def test_toml_missing(self, mocker):
+        """Test rendering TOML front matter without tomli-w."""
+        mocker.patch("frontmatter.{0}".format(TOMLI_W), None)
+
+        with pytest.raises(ValueError, match="needs tomli-w"):
+            SERIALIZERS[TOML].render(FRONT_MATTER, MARKDOWN)
+
+    def test_page_render(self):
+        """Test rendering a page in each front matter format."""
+        page = Page(FRONT_MATTER, MARKDOWN)
+
+        assert page.render("json").startswith('{"date":')
+        assert page.render() == SERIALIZERS[YAML].render(
+            FRONT_MATTER, MARKDOWN,
+        )
+
+
+@pytest.mark.parametrize("front_matter_format", [YAML, TOML, JSON_FORMAT])
+def test_adapter_parity(front_matter_format):
+    """Test that a content adapter page holds what Hugo reads from a file."""
+    if front_matter_format == TOML:
+        pytest.importorskip(TOMLI_W)
+    page = Page(dict(
+        FRONT_MATTER,
+        id=PROJECT_ID,
+        aliases=["/old/"],
+        lastmod=datetime.date.fromisoformat("2025-02-03"),
+        resources=[dict(src="image.png", title="Image")],
+    ), MARKDOWN)
+    front_matter, markdown = parse(
+        page.render(front_matter_format), front_matter_format,
+    )
+    record = json.loads(
+        json.dumps(page.adapter_record(PROJECT_ID), default=str),
+    )
+    fields = front_matter.keys() & ADAPTER_FIELDS
+
+    assert (record["path"], record["params"]) == (
+        front_matter["id"], front_matter,
+    )
+    assert record["content"]["value"] == markdown
+    assert record.pop("dates") == {
+        field: front_matter[field]
+        for field in front_matter.keys() & ADAPTER_DATES
+    }
+    assert {field: record.pop(field) for field in fields} == {
+        field: front_matter[field] for field in fields
+    }
+    assert set(record) == {"path", "params", "content"}
+
+
+@pytest.mark.skipif(shutil.which("hugo") is None, reason="Hugo not found")
+@pytest.mark.parametrize("front_matter_format", [TOML, "json"])
+def test_hugo_golden(front_matter_format, tmp_path):
+    """Test that Hugo renders the same page for each front matter format."""
+    if front_matter_format == TOML:
+        pytest.importorskip(TOMLI_W)
+
+    assert build(tmp_path, front_matter_format) == build(tmp_path, YAML)
+
+
+@pytest.mark.skipif(shutil.which("hugo") is None, reason="Hugo not found")
+def test_hugo_golden_adapter(tmp_path):
+    """Test that Hugo renders the same page from a content adapter."""
+    assert build(tmp_path, YAML, "pages") == build(tmp_path, YAML)
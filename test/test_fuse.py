@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for fuse module."""
+
+import json
+
+from files import read_json
+from fuse import FuseIndex
+
+TITLE = "title"
+FILTER = "filter"
+KEYS = ((TITLE, 3), (FILTER, 2))
+RECORDS = """[
+    {"i": 0, "$": {
+        "0": {"v": "White  Rabbit switch", "n": 0.577},
+        "1": [{"v": "b c", "i": 2, "n": 0.707}, {"v": "a", "i": 0, "n": 1}]
+    }},
+    {"i": 1, "$": {"0": {"v": "Switch", "n": 1}}},
+    {"i": 2, "$": {"1": {"v": "x", "n": 1}}},
+    {"i": 3, "$": {"0": {"v": "Switch", "n": 1}, "1": []}}
+]"""
+
+
+class TestFuseIndex:
+    """Tests for FuseIndex class."""
+
+    def test_keys(self):
+        """Test that keys keep their weights, like Fuse.createIndex."""
+        fuse_index = FuseIndex.from_docs(KEYS, [])
+
+        assert fuse_index.keys[1] == {
+            "path": [FILTER],
+            "id": FILTER,
+            "weight": 2,
+            "src": FILTER,
+            "getFn": None,
+        }
+        assert fuse_index.records == []
+
+    def test_records(self):
+        """Test field norms, array item order and empty arrays."""
+        fuse_index = FuseIndex.from_docs(KEYS, [
+            {TITLE: "White  Rabbit switch", FILTER: ["a", " ", "b c"]},
+            {TITLE: "Switch"},
+            {TITLE: " ", FILTER: "x"},
+            {TITLE: "Switch", FILTER: []},
+        ])
+
+        assert fuse_index.records == json.loads(RECORDS)
+
+    def test_write(self, tmp_path):
+        """Test writing the serialized index."""
+        fuse_index = FuseIndex.from_docs(KEYS, [{TITLE: "Switch"}])
+        fuse_index.write(str(tmp_path))
+
+        assert read_json(str(tmp_path / "fuse.json")) == {
+            "keys": fuse_index.keys,
+            "records": fuse_index.records,
+        }
@@ -4,9 +4,14 @@
 
 """Tests for Hugo content generation."""
 
+import json
+import threading
+
 import pytest
 import yaml
-from hugo import Page, Section
+from hugo import ADAPTER, ADAPTER_DATA, Page, Section, SectionStats
+
+INDEX = "_index.md"
 
 
 @pytest.fixture
@@ -36,6 +41,7 @@ class TestPage:
     def test_write_success(self, sample_page, mocker):
         """Test successful page writing with mocked file operations."""
         mock_file = mocker.patch("builtins.open", mocker.mock_open())
+        mock_replace = mocker.patch("os.replace")
         mock_yaml_dump = mocker.patch(
             "yaml.safe_dump",
             return_value="yaml_output"
@@ -44,7 +50,10 @@ class TestPage:
         sample_page.write("test_path.md")
 
         mock_yaml_dump.assert_called_once_with(sample_page.front_matter)
-        mock_file.assert_called_once_with("test_path.md", 'w')
+        mock_file.assert_called_once_with(".test_path.md.tmp", 'w')
+        mock_replace.assert_called_once_with(
+            ".test_path.md.tmp", "test_path.md",
+        )
         file_handle = mock_file()
         expected_content = (
             "---\nyaml_output---\n# Test Page\n\nThis is a test page."
@@ -65,6 +74,37 @@ class TestPage:
         with pytest.raises(ValueError, match="Failed to create YAML"):
             page.write("dummy_path.md")
 
+    def test_write_unchanged(self, sample_page, tmp_path):
+        """Test that an identical page on disk is not rewritten."""
+        path = tmp_path / "page.md"
+
+        assert sample_page.write(str(path)) is True
+        mtime = path.stat().st_mtime_ns
+        assert sample_page.write(str(path)) is False
+        assert path.stat().st_mtime_ns == mtime
+
+    def test_render_stable_key_order(self):
+        """Test that rendering does not depend on front matter key order."""
+        first = Page(front_matter={"b": 1, "a": 2}, markdown="text")
+        second = Page(front_matter={"a": 2, "b": 1}, markdown="text")
+
+        assert first.render() == second.render()
+
+    def test_adapter_record(self, sample_page):
+        """Test getting a page as a content adapter page."""
+        sample_page.front_matter["aliases"] = ["/old/"]
+
+        assert sample_page.adapter_record("page") == dict(
+            path="page",
+            title="Test Page",
+            aliases=["/old/"],
+            dates=dict(date="2025-01-01"),
+            params=sample_page.front_matter,
+            content=dict(
+                mediaType="text/markdown", value=sample_page.markdown,
+            ),
+        )
+
     def test_write_io_error(self, sample_page, mocker):
         """Test handling of IO errors during file writing."""
         mocker.patch("builtins.open", side_effect=OSError("Disk error"))
@@ -82,8 +122,12 @@ class TestSection:
         sample_section.write("/content/dir")
 
         assert mock_write.call_count == 2
-        mock_write.assert_any_call("/content/dir/page1.md")
-        mock_write.assert_any_call("/content/dir/page2.md")
+        mock_write.assert_any_call(
+            "/content/dir/page1.md", front_matter_format="yaml",
+        )
+        mock_write.assert_any_call(
+            "/content/dir/page2.md", front_matter_format="yaml",
+        )
 
     def test_write_with_failing_page(self, sample_section, mocker, caplog):
         """Test section writing when one page fails."""
@@ -97,7 +141,132 @@ class TestSection:
         assert "Failed to write 'bad_page' page" in caplog.text
         assert "Disk full" in caplog.text
 
+    def test_write_stats(self, sample_section, tmp_path):
+        """Test written and unchanged counts across two writes."""
+        assert sample_section.write(str(tmp_path)) == SectionStats(written=2)
+
+        sample_section["page2"] = Page(
+            front_matter={"name": "Changed Page"},
+            markdown="Changed content."
+        )
+        stats = sample_section.write(str(tmp_path))
+
+        assert stats == SectionStats(written=1, unchanged=1)
+
+    def test_write_prunes_orphans(self, sample_section, tmp_path):
+        """Test that pages dropped from the section are removed."""
+        (tmp_path / INDEX).write_text("index")
+        sample_section.write(str(tmp_path))
+        sample_section.pop("page2")
+        stats = sample_section.write(str(tmp_path))
+
+        assert stats == SectionStats(unchanged=1, removed=1)
+        assert not (tmp_path / "page2.md").exists()
+        assert (tmp_path / "page1.md").exists()
+        assert (tmp_path / INDEX).exists()
+
+    def test_write_ignores_invalid_manifest(self, sample_section, tmp_path):
+        """Test that an unreadable manifest does not prune anything."""
+        (tmp_path / Section.manifest).write_text("not json")
+        (tmp_path / "other.md").write_text("other")
+        stats = sample_section.write(str(tmp_path))
+
+        assert stats == SectionStats(written=2)
+        assert (tmp_path / "other.md").exists()
+
     def test_page_path(self, sample_section):
         """Test the _page_path helper method."""
         path = sample_section._page_path("/content/dir", "test_page")
         assert path == "/content/dir/test_page.md"
+
+
+class TestSectionParallel:
+    """Tests for parallel Section writes."""
+
+    @pytest.mark.parametrize("processes", [False, True])
+    def test_write_parallel(self, sample_section, tmp_path, processes):
+        """Test that parallel writes match serial writes."""
+        serial = tmp_path / "serial"
+        parallel = tmp_path / "parallel"
+        serial.mkdir()
+        parallel.mkdir()
+        sample_section.write(str(serial))
+        stats = sample_section.write(
+            str(parallel), jobs=2, processes=processes,
+        )
+
+        assert stats == SectionStats(written=2)
+        for page in ("page1.md", "page2.md", Section.manifest):
+            assert (parallel / page).read_text() == (
+                serial / page
+            ).read_text()
+
+    def test_write_parallel_unpicklable(
+        self, sample_section, tmp_path, caplog,
+    ):
+        """Test that pages which fail to pickle are rendered in threads."""
+        sample_section.front_matter_format = "json"
+        sample_section["page1"].front_matter["lock"] = threading.Lock()
+
+        stats = sample_section.write(
+            tmp_path.as_posix(), jobs=2, processes=True,
+        )
+
+        assert stats == SectionStats(written=2)
+        assert "Failed to render 'page1' page in a worker" in caplog.text
+
+    def test_write_parallel_with_failing_page(
+        self, sample_section, mocker, caplog,
+    ):
+        """Test that parallel page failures are logged per page."""
+        mocker.patch.object(Page, 'write', side_effect=ValueError("Disk full"))
+        stats = sample_section.write("/parallel/dir", jobs=2)
+
+        assert stats == SectionStats()
+        assert "Failed to write 'page1' page" in caplog.text
+        assert "Failed to write 'page2' page" in caplog.text
+
+
+class TestSectionAdapter:
+    """Tests for Section writes as a content adapter."""
+
+    @pytest.fixture
+    def adapter_section(self, sample_section):
+        """Fixture providing the sample section as a content adapter."""
+        sample_section.content_adapter = "pages"
+        return sample_section
+
+    def test_write_adapter(self, adapter_section, tmp_path):
+        """Test writing the pages as a data file and a content adapter."""
+        stats = adapter_section.write(tmp_path.as_posix())
+
+        assert stats == SectionStats(written=1)
+        assert '"content/pages/.content.json"' in (
+            tmp_path / ADAPTER
+        ).read_text()
+        assert [
+            page["path"]
+            for page in json.loads((tmp_path / ADAPTER_DATA).read_text())
+        ] == list(adapter_section)
+
+    def test_write_adapter_unchanged(self, adapter_section, tmp_path):
+        """Test that an unchanged section is not rewritten."""
+        path = tmp_path.as_posix()
+        adapter_section.write(path)
+
+        assert adapter_section.write(path) == SectionStats(unchanged=1)
+
+    def test_write_adapter_switch(self, adapter_section, tmp_path):
+        """Test that switching output removes the files of the other one."""
+        path = tmp_path.as_posix()
+        adapter_section.content_adapter = None
+        adapter_section.write(path)
+        adapter_section.content_adapter = "pages"
+
+        assert adapter_section.write(path).removed == 2
+        assert not list(tmp_path.glob("*.md"))
+
+        adapter_section.content_adapter = None
+
+        assert adapter_section.write(path).removed == 2
+        assert not (tmp_path / ADAPTER).exists()
@@ -0,0 +1,182 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for images module."""
+
+import io
+import json
+import time
+
+import pytest
+from PIL import Image
+
+from files import read_json
+from images import MAX_AGE, ImageStore
+from probe import ImageProbe, ImageUrl
+
+IMAGE_URL = "https://example.com/image.png"
+COPY_URL = "https://example.com/copy.png"
+SVG_URL = "https://example.com/image.svg"
+IMAGES = "images"
+WIDTHS = (8, 16, 32)
+WIDE = 24
+NARROW = 12
+MANIFEST = ".images.json"
+WEBP_FILES = "*.webp"
+SRCSETS = "srcsets"
+
+
+def png(width):
+    """Return PNG bytes of a square image."""
+    image_bytes = io.BytesIO()
+    Image.new("P", (width, width)).save(image_bytes, "PNG")
+    return image_bytes.getvalue()
+
+
+def reopen(store):
+    """Return a store of the same images, as in a later run."""
+    return ImageStore(store.path, store.manifest, widths=WIDTHS)
+
+
+@pytest.fixture
+def path(tmp_path):
+    """Return the directory of the stored images."""
+    return tmp_path / IMAGES
+
+
+@pytest.fixture
+def store(path, tmp_path):
+    """Return an image store with small variants."""
+    return ImageStore(str(path), str(tmp_path / MANIFEST), widths=WIDTHS)
+
+
+class TestImageStore:
+    """Tests for ImageStore class."""
+
+    def test_localize(self, store, mock_requests, path):
+        """Test rewriting front matter to WebP variants."""
+        mock_requests.content = png(WIDE)
+        front_matter = {IMAGES: [IMAGE_URL]}
+
+        store.localize([front_matter])
+        src = front_matter[IMAGES][0]
+        srcset = front_matter[SRCSETS][0]["webp"].split(", ")
+
+        assert src.startswith("/images/") and src.endswith("-24.webp")
+        assert front_matter["thumbnails"][0].endswith("-16.webp")
+        assert [entry.split()[1] for entry in srcset] == ["8w", "16w", "24w"]
+        assert front_matter["dimensions"] == [{"width": WIDE, "height": WIDE}]
+        with Image.open(path / src.split("/")[-1]) as variant:
+            assert variant.size == (WIDE, WIDE)
+
+    def test_localize_deduplicates(self, store, mock_requests, path):
+        """Test that identical images at several URLs are stored once."""
+        mock_requests.content = png(NARROW)
+        front_matters = [{IMAGES: [IMAGE_URL]}, {IMAGES: [COPY_URL]}]
+
+        store.localize(front_matters, jobs=2)
+
+        assert front_matters[0][IMAGES] == front_matters[1][IMAGES]
+        assert len(list(path.glob(WEBP_FILES))) == 2
+
+    def test_localize_cached(self, store, mock_requests, mocker):
+        """Test that images stored by a previous run are not downloaded."""
+        mock_requests.content = png(NARROW)
+        store.localize([{IMAGES: [IMAGE_URL]}])
+        mock_get = mocker.patch("requests.Session.get")
+        front_matter = {IMAGES: [IMAGE_URL]}
+
+        reopen(store).localize([front_matter])
+
+        mock_get.assert_not_called()
+        assert front_matter[IMAGES][0].endswith("-12.webp")
+
+    def test_localize_expired(self, store, mock_requests, mocker):
+        """Test that images without entity tag are downloaded again."""
+        mock_requests.content = png(NARROW)
+        store.localize([{IMAGES: [COPY_URL]}])
+        mocker.patch("images.time.time", return_value=time.time() + MAX_AGE)
+        mock_get = mocker.patch(
+            "requests.Session.get", return_value=mock_requests,
+        )
+
+        reopen(store).localize([{IMAGES: [COPY_URL]}])
+
+        mock_get.assert_called_once()
+
+    def test_localize_prunes(self, store, mock_requests, path):
+        """Test that images no page uses are removed from the store."""
+        mock_requests.content = png(NARROW)
+        store.localize([{IMAGES: [IMAGE_URL]}])
+        mock_requests.content = png(WIDE)
+
+        reopen(store).localize([{IMAGES: [COPY_URL]}])
+
+        assert list(read_json(store.manifest)) == [COPY_URL]
+        # Only the three variants of the wide image are left.
+        assert len(list(path.glob(WEBP_FILES))) == 3
+
+    def test_localize_changed(self, store, mock_requests):
+        """Test that stored images are downloaded again if they changed."""
+        mock_requests.content = png(NARROW)
+        ImageUrl.probes[IMAGE_URL] = ImageProbe(NARROW, NARROW, '"v1"')
+        store.localize([{IMAGES: [IMAGE_URL]}])
+        # Pages reused from the last build did not probe their images.
+        ImageUrl.probes.clear()
+        mock_requests.headers = {"ETag": '"v2"'}
+        mock_requests.content = png(WIDE)
+        front_matter = {IMAGES: [IMAGE_URL]}
+
+        reopen(store).localize([front_matter])
+
+        assert front_matter[IMAGES][0].endswith("-24.webp")
+
+    def test_localize_failure(self, store, mock_requests):
+        """Test that images which can not be decoded stay remote."""
+        mock_requests.content = b"<svg/>"
+        front_matter = {IMAGES: [SVG_URL, IMAGE_URL]}
+
+        store.localize([front_matter])
+
+        assert front_matter[IMAGES] == [SVG_URL, IMAGE_URL]
+        assert front_matter[SRCSETS] == [{}, {}]
+        assert front_matter["dimensions"] == [{}, {}]
+
+
+class TestVectorImages:
+    """Tests for SVG images in ImageStore class."""
+
+    def test_localize_svg(self, store, mock_requests, path):
+        """Test that SVG images stay remote, with their dimensions."""
+        mock_requests.content = b'<svg width="10" height="20"></svg>'
+        front_matter = {IMAGES: [SVG_URL]}
+
+        store.localize([front_matter])
+
+        assert front_matter[IMAGES] == [SVG_URL]
+        assert front_matter[SRCSETS] == [{}]
+        assert front_matter["dimensions"] == [{"width": 10, "height": 20}]
+        assert not list(path.glob("*.svg"))
+
+    def test_localize_stored_svg(self, store, mock_requests, path):
+        """Test that SVG images stored by earlier runs are removed."""
+        path.mkdir()
+        svg = path / "stored-10.svg"
+        svg.write_bytes(b"<svg/>")
+        with open(store.manifest, "w") as manifest_file:
+            json.dump({SVG_URL: {
+                "src": "/images/stored-10.svg",
+                "thumbnail": "/images/stored-10.svg",
+                SRCSETS: {},
+                "width": 10,
+                "height": 20,
+            }}, manifest_file)
+        mock_requests.content = b'<svg width="10" height="20"></svg>'
+        front_matter = {IMAGES: [SVG_URL]}
+
+        store.localize([front_matter])
+
+        assert front_matter[IMAGES] == [SVG_URL]
+        assert read_json(store.manifest) == {}
+        assert not svg.exists()
@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for isolation module."""
+
+import logging
+import sys
+import time
+import warnings
+
+import pytest
+
+from isolation import MIB, Isolation
+
+MEMORY = 64
+MESSAGE = "Failed to generate 'page' page"
+
+
+class TestIsolation:
+    """Tests for Isolation class."""
+
+    def test_run(self):
+        """Test that workers return their results in input order."""
+        isolation = Isolation(jobs=2, timeout=10)
+
+        assert isolation.run(pow, {"second": 2, "first": 1}, 3) == {
+            "second": 8,
+            "first": 1,
+        }
+
+    @pytest.mark.parametrize(("work", "argument", "message"), [
+        (time.sleep, 10, "Timed out after 0.5 s."),
+        (bytearray, 2 * MEMORY * MIB, "Exceeded the memory limit of 64 MiB."),
+        (int, "invalid", "invalid literal"),
+    ])
+    def test_run_failure(self, work, argument, message, caplog):
+        """Test that failed workers are reported while others go on."""
+        isolation = Isolation(jobs=2, timeout=0.5, memory=MEMORY)
+
+        with caplog.at_level(logging.ERROR):
+            outcomes = isolation.run(
+                work, {"failed": argument, "done": 0},
+            )
+
+        assert list(outcomes) == ["done"]
+        assert "Failed to run 'failed' worker" in caplog.text
+        assert message in caplog.text
+
+    def test_run_exit(self, caplog):
+        """Test that a worker which exits without a result is reported."""
+        with caplog.at_level(logging.ERROR):
+            assert not Isolation().run(sys.exit, {"exit": 1})
+
+        assert "Worker exited without a result." in caplog.text
+
+    @pytest.mark.parametrize(("work", "level", "message"), [
+        (logging.error, logging.ERROR, MESSAGE),
+        (logging.info, logging.INFO, MESSAGE),
+        (warnings.warn, logging.WARNING, "Warning: {0}".format(MESSAGE)),
+    ])
+    def test_run_logging(self, work, level, message, caplog):
+        """Test that records logged by a worker reach the build handlers."""
+        with caplog.at_level(logging.INFO):
+            assert Isolation().run(work, {"logged": MESSAGE}) == {
+                "logged": None,
+            }
+
+        assert caplog.record_tuples == [("root", level, message)]
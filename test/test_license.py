@@ -97,6 +97,13 @@ class TestSpdxLicenseList:
         SpdxLicenseList.from_file(str(file_path))
         assert len(SpdxLicenseList._spdx_license_list) == 1
 
+    def test_from_list(self):
+        """Test loading license data already parsed."""
+        licenses = [self._create_license("CERN-OHL-S-2.0")]
+        SpdxLicenseList.from_list(licenses)
+        assert SpdxLicenseList.licenses() == licenses
+        assert SpdxLicenseList.get_license("CERN-OHL-S-2.0") is licenses[0]
+
     @pytest.mark.parametrize("license_id,should_exist", [
         ("Apache-2.0", True),
         ("MISSING", False),
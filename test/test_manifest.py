@@ -2,10 +2,13 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import struct
+
 import pytest
 from pydantic import ValidationError
 from typing import Dict, Any
 from manifest import Manifest, Link
+from probe import PARTIAL_CONTENT, ImageUrl
 
 
 VERSION = "1.0.0"
@@ -14,6 +17,14 @@ DESC_URL = "https://example.com/description.md"
 SITE_URL = "https://example.com"
 REPO_NAME = "GitHub"
 REPO_URL = "https://github.com/example"
+IMAGE_URL = "https://example.com/image1.png"
+WIDTH = 640
+HEIGHT = 480
+IHDR_LENGTH = 13
+# First bytes of a PNG image, up to its dimensions.
+PNG_HEADER = struct.pack(
+    ">8sI4sII", b"\x89PNG\r\n\x1a\n", IHDR_LENGTH, b"IHDR", WIDTH, HEIGHT,
+)
 
 
 @pytest.fixture
@@ -33,7 +44,7 @@ def valid_manifest_data(minimal_manifest_data) -> Dict[str, Any]:
     return {
         **minimal_manifest_data,
         "licenses": ("BSD-3-Clause",),
-        "images": ("https://example.com/image1.png",),
+        "images": (IMAGE_URL,),
         "documentation": "https://example.com/docs",
         "issues": "https://example.com/issues",
         "latest_release": "https://example.com/release",
@@ -54,17 +65,17 @@ def mock_requests(mocker):
         mock.return_value.status_code = 200
         mock.return_value.raise_for_status.return_value = None
 
-    mock_get = mocker.patch("url.Url._get")
-    mock_strict_get = mocker.patch("url.StrictUrl._get")
-
-    for mock in (mock_get, mock_strict_get):
-        mock.return_value.status_code = 200
-        mock.return_value.text = "Sample content"
-        mock.return_value.json.return_value = {"content": "Wiki content"}
-        mock.return_value.headers = {"Content-Type": "text/plain"}
-        mock.return_value.raise_for_status.return_value = None
+    # Images are probed with range requests of their first bytes.
+    mock_get = mocker.patch("requests.Session.get")
+    mock_get.return_value.status_code = PARTIAL_CONTENT
+    mock_get.return_value.text = "Sample content"
+    mock_get.return_value.content = PNG_HEADER
+    mock_get.return_value.iter_content.return_value = iter([PNG_HEADER])
+    mock_get.return_value.json.return_value = {"content": "Wiki content"}
+    mock_get.return_value.headers = {"Content-Type": "image/png"}
+    mock_get.return_value.raise_for_status.return_value = None
 
-    return mock_head, mock_strict_head, mock_get, mock_strict_get
+    return mock_head, mock_strict_head, mock_get
 
 
 class TestManifest:
@@ -84,6 +95,9 @@ class TestManifest:
     def test_images(self, valid_manifest_data, mock_requests):
         manifest = Manifest(**valid_manifest_data)
         assert len(manifest.images) == 1
+        assert ImageUrl.dimensions([IMAGE_URL]) == [
+            {"width": WIDTH, "height": HEIGHT},
+        ]
 
     def test_invalid_version(self, valid_manifest_data, mock_requests):
         test_data = dict(valid_manifest_data, version="2.0.0")
@@ -4,6 +4,9 @@
 
 """Tests for news content generation."""
 
+import datetime
+import json
+
 import pytest
 import logging
 
@@ -12,31 +15,45 @@ from news import NewsPage, NewsSection
 
 
 NEWS_ID = "test-news"
+NEWS_URL = "/news/test-news/"
 BAD_NEWS_ID = "bad-news"
 PROJ_ID = "test-prj"
 BAD_PROJ_ID = "bad-prj"
-NEWS_PAGE_FORMAT = "{0}-1"
+NEWS_PAGE_FORMAT = "{0}-2025-01-01-test-news"
+NEWS_DATE = datetime.date.fromisoformat("2025-01-01")
+PROJ_NAME = "Test Project"
+RELEASE = "Release"
+THUMBNAIL = "/images/a-640.webp"
 
 
-@pytest.fixture
-def sample_news_config(mocker):
-    """Fixture providing a mocked News configuration."""
+def news_config(
+    mocker, title="Test News", description="Test news description",
+):
+    """Return a mocked News configuration."""
     mock_news = mocker.Mock(spec=News)
     mock_news.model_dump.return_value = {
-        "title": "Test News",
+        "title": title,
         "date": "2025-01-01",
-        "description": "Test news description"
+        "description": description
     }
 
-    mock_news.description = "Test news description"
+    mock_news.title = title
+    mock_news.date = NEWS_DATE
+    mock_news.description = description
     mock_project = mocker.Mock()
     mock_project.id = PROJ_ID
-    mock_project.manifest.name = "Test Project"
+    mock_project.manifest.name = PROJ_NAME
     mock_news.project = mock_project
 
     return mock_news
 
 
+@pytest.fixture
+def sample_news_config(mocker):
+    """Fixture providing a mocked News configuration."""
+    return news_config(mocker)
+
+
 @pytest.fixture
 def sample_project_configs(mocker, sample_news_config):
     """Fixture providing multiple project configs with news."""
@@ -48,6 +65,8 @@ def sample_project_configs(mocker, sample_news_config):
     bad_news_project.id = BAD_PROJ_ID
 
     bad_news = mocker.Mock(spec=News)
+    bad_news.title = "Test News"
+    bad_news.date = NEWS_DATE
     bad_news.description = "Bad news description"
     bad_project_mock = mocker.Mock()
     bad_project_mock.id = BAD_PROJ_ID
@@ -69,17 +88,44 @@ class TestNewsPage:
 
     def test_from_config_success(self, sample_news_config):
         """Test successful news page creation from config."""
-        page = NewsPage.from_config(sample_news_config)
+        page = NewsPage.from_config(sample_news_config, NEWS_ID)
 
         assert isinstance(page, NewsPage)
         assert page.front_matter["title"] == "Test News"
-        assert page.front_matter["project"] == "Test Project"
+        assert page.front_matter["project"] == PROJ_NAME
+        assert page.front_matter["project_id"] == PROJ_ID
         assert page.markdown == "Test news description"
 
         sample_news_config.model_dump.assert_called_once_with(
             exclude_none=True
         )
 
+    def test_from_config_url_and_summary(self, sample_news_config):
+        """Test setting the URL and summary shared with Hugo."""
+        front_matter = NewsPage.from_config(
+            sample_news_config, NEWS_ID,
+        ).front_matter
+
+        assert front_matter["url"] == NEWS_URL
+        assert front_matter["summary"] == "Test news description"
+
+    def test_from_config_images(self, sample_news_config, mocker, caplog):
+        """Test probing the images of a news once its page is created."""
+        images = ["https://example.com/a.png", "https://example.com/b.png"]
+        sample_news_config.model_dump.return_value["images"] = images
+        probe = mocker.patch("news.ImageUrl.probe", side_effect=[
+            None, ValueError("Failed to probe"),
+        ])
+        mocker.patch("news.ImageUrl.dimensions", return_value=[{}, {}])
+
+        front_matter = NewsPage.from_config(
+            sample_news_config, NEWS_ID,
+        ).front_matter
+
+        assert probe.call_count == 2
+        assert front_matter["dimensions"] == [{}, {}]
+        assert "Failed to probe" in caplog.text
+
     def test_from_config_validation_error(self, mocker):
         """Test handling of validation errors during page creation."""
         mock_news = mocker.Mock(spec=News)
@@ -88,7 +134,7 @@ class TestNewsPage:
         mock_news.model_dump.side_effect = ValueError("Validation failed")
 
         with pytest.raises(ValueError, match="Validation failed"):
-            NewsPage.from_config(mock_news)
+            NewsPage.from_config(mock_news, NEWS_ID)
 
 
 class TestNewsSection:
@@ -114,6 +160,85 @@ class TestNewsSection:
         assert NEWS_PAGE_FORMAT.format(BAD_PROJ_ID) not in section
         assert all(msg in log_msg for msg in expected_logs)
 
+    def test_from_config_retention(self, mocker):
+        """Test keeping the newest news of a project."""
+        news_list = [
+            news_config(mocker, title)
+            for title in ("First", "Second", "Third")
+        ]
+
+        from_config = mocker.spy(NewsPage, "from_config")
+
+        section = NewsSection._from_config(news_list, retention=2)
+
+        assert list(section) == [
+            "{0}-2025-01-01-second".format(PROJ_ID),
+            "{0}-2025-01-01-third".format(PROJ_ID),
+        ]
+        # Older news are dropped before their page is created.
+        assert from_config.call_count == 2
+
+    def test_from_config_aliases(self, sample_news_config):
+        """Test redirecting the former numbered names."""
+        section = NewsSection._from_config([sample_news_config])
+
+        assert section[NEWS_PAGE_FORMAT.format(PROJ_ID)].front_matter[
+            "aliases"
+        ] == ["/news/{0}-1/".format(PROJ_ID)]
+
+    def test_timelines(self):
+        """Test ordering the news of each project newest first."""
+        section = NewsSection({
+            name: NewsPage(
+                front_matter=dict(project_id=project, date=date),
+                markdown="",
+            )
+            for name, project, date in (
+                ("a-old", "a", "2024-01-01"),
+                ("b-new", "b", "2025-02-01"),
+                ("a-new", "a", "2025-01-01"),
+            )
+        })
+
+        assert {
+            project: [name for _, name in timeline]
+            for project, timeline in section.timelines().items()
+        } == {"a": ["a-new", "a-old"], "b": ["b-new"]}
+
+    def test_write_archive(self, tmp_path):
+        """Test archiving the pages as search page items."""
+        section = NewsSection({
+            NEWS_ID: NewsPage(
+                front_matter=dict(
+                    title=RELEASE,
+                    project=PROJ_NAME,
+                    project_id=PROJ_ID,
+                    date="2025-01-02",
+                    images=["https://example.com/a.png"],
+                    thumbnails=[THUMBNAIL],
+                    url=NEWS_URL,
+                    summary="New release.",
+                ),
+                markdown="New **release**.",
+            ),
+        })
+
+        section.write_archive(str(tmp_path))
+
+        assert json.loads((tmp_path / "latest.json").read_text()) == {
+            "index": [dict(
+                name=NEWS_ID,
+                title=RELEASE,
+                filter=PROJ_NAME,
+                text="New release.",
+                url=NEWS_URL,
+                date="Jan 2, 2025",
+                image=THUMBNAIL,
+            )],
+            "shards": [],
+            "total": 1,
+        }
+
     def test_from_config_success_internal(self, sample_news_config):
         """Test successful _from_config method."""
         news_list = [sample_news_config]
@@ -122,3 +247,35 @@ class TestNewsSection:
         assert len(section) == 1
         assert NEWS_PAGE_FORMAT.format(PROJ_ID) in section
         assert isinstance(section[NEWS_PAGE_FORMAT.format(PROJ_ID)], NewsPage)
+
+
+class TestNewsNames:
+    """Tests for the names of the news pages."""
+
+    def test_from_config_names(self, mocker, sample_news_config):
+        """Test telling apart news of the same date and title."""
+        news_list = [
+            sample_news_config,
+            news_config(mocker, description="Other description"),
+            news_config(mocker, "Other news"),
+        ]
+
+        names = list(NewsSection._from_config(news_list))
+
+        assert len(names) == 3
+        assert names[0] == NEWS_PAGE_FORMAT.format(PROJ_ID)
+        assert names[1].startswith("{0}-".format(names[0]))
+        assert names[2] == "{0}-2025-01-01-other-news".format(PROJ_ID)
+
+    def test_from_config_names_stable(self, mocker, sample_news_config):
+        """Test that a news keeps its name once a duplicate arrives."""
+        name = list(NewsSection._from_config([sample_news_config]))
+
+        names = list(NewsSection._from_config([
+            sample_news_config, news_config(mocker),
+            news_config(mocker),
+        ]))
+
+        assert names[0] == name[0]
+        assert len(set(names)) == 3
+        assert names[2] == "{0}-2".format(names[1])
@@ -0,0 +1,211 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for probe module."""
+
+import io
+
+import pytest
+from PIL import Image
+
+from probe import (
+    HEADER_SIZES,
+    NOT_MODIFIED,
+    PARTIAL_CONTENT,
+    ImageProbe,
+    ImageUrl,
+    image_size,
+)
+
+IMAGE_URL = "https://example.com/image.jpg"
+REQUESTS_GET = "requests.Session.get"
+WIDTH = 40
+HEIGHT = 30
+ETAG = '"v1"'
+MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+TRUNCATED = 20
+PNG = "PNG"
+JPEG = "JPEG"
+# EXIF segment which pushes the JPEG frame past the first header size.
+EXIF = b"Exif\x00\x00".ljust(HEADER_SIZES[0] * 5, b"\x00")
+
+
+def encode(image_format, size=(WIDTH, HEIGHT), **options):
+    """Return the bytes of a blank image."""
+    image_bytes = io.BytesIO()
+    Image.new("RGB", size).save(image_bytes, image_format, **options)
+    return image_bytes.getvalue()
+
+
+@pytest.mark.parametrize("header", [
+    encode(PNG),
+    encode("GIF"),
+    encode(JPEG),
+    encode("WEBP"),
+    encode("WEBP", lossless=True),
+    encode("WEBP", exif=b"Exif\x00\x00"),
+    b'<?xml version="1.0"?><svg width="40" height="30px">',
+    b'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 40.2 30">',
+])
+def test_image_size(header):
+    """Test parsing the dimensions of supported formats."""
+    assert image_size(header) == (WIDTH, HEIGHT)
+
+
+@pytest.mark.parametrize("header", [
+    b"",
+    b"<svg/>",
+    b"\x89PNG\r\n\x1a\n",
+    encode(JPEG)[:TRUNCATED],
+    b"RIFF\x00\x00\x00\x00WEBPVP8Z",
+])
+def test_image_size_unknown(header):
+    """Test that truncated or unsupported images have no dimensions."""
+    assert image_size(header) is None
+
+
+class TestImageUrl:
+    """Tests for ImageUrl class."""
+
+    def test_validate(self, mock_requests, mocker):
+        """Test that validation probes with a range request only."""
+        mock_requests.content = encode(PNG)
+        mock_requests.headers = {"ETag": ETAG}
+        mock_head = mocker.patch("requests.Session.head")
+
+        ImageUrl._validate(IMAGE_URL)
+
+        mock_head.assert_not_called()
+        assert ImageUrl.probes[IMAGE_URL] == ImageProbe(WIDTH, HEIGHT, ETAG)
+        assert mock_requests.raise_for_status.called
+        assert ImageUrl.dimensions([IMAGE_URL, "other"]) == [
+            {"width": WIDTH, "height": HEIGHT}, {},
+        ]
+
+    def test_probe_last_modified(self, mock_requests):
+        """Test that images without entity tag are checked by date."""
+        mock_requests.content = encode(PNG)
+        mock_requests.headers = {"Last-Modified": MODIFIED}
+
+        assert ImageUrl.probe(IMAGE_URL).etag == MODIFIED
+
+    def test_probe_more_bytes(self, mocker):
+        """Test fetching more bytes if the frame is past the first ones."""
+        image = encode(JPEG, comment=bytes(HEADER_SIZES[0] * 2))
+        responses = [
+            mocker.Mock(
+                status_code=PARTIAL_CONTENT,
+                iter_content=mocker.Mock(
+                    return_value=iter([image[:HEADER_SIZES[0]]]),
+                ),
+                headers={},
+            ),
+            mocker.Mock(
+                status_code=PARTIAL_CONTENT,
+                iter_content=mocker.Mock(return_value=iter([image])),
+                headers={},
+            ),
+        ]
+        mock_get = mocker.patch(REQUESTS_GET, side_effect=responses)
+
+        assert ImageUrl.probe(IMAGE_URL) == ImageProbe(WIDTH, HEIGHT)
+        assert mock_get.call_count == 2
+        assert mock_get.call_args.kwargs["headers"] == {
+            "Range": "bytes=0-65535",
+        }
+
+    def test_probe_failure(self, mock_requests):
+        """Test that a full response without dimensions fails once."""
+        mock_requests.content = b"not an image"
+
+        with pytest.warns(UserWarning):
+            ImageUrl._validate(IMAGE_URL)
+
+        assert IMAGE_URL not in ImageUrl.probes
+
+    def test_probe_cached(self, mocker):
+        """Test that each image is only probed once."""
+        mock_get = mocker.patch(REQUESTS_GET)
+        mock_get.return_value.iter_content.return_value = iter([
+            encode("GIF"),
+        ])
+
+        ImageUrl.probe(IMAGE_URL)
+        ImageUrl.probe(IMAGE_URL)
+
+        mock_get.assert_called_once()
+
+    @pytest.mark.parametrize(("probed", "stored", "changed"), [
+        (ETAG, ETAG, False),
+        (ETAG, '"v0"', True),
+        (ETAG, "", False),
+        ("", ETAG, False),
+    ])
+    def test_changed(self, mocker, probed, stored, changed):
+        """Test comparing entity tags of probed images."""
+        mocker.patch.dict(ImageUrl.probes, {
+            IMAGE_URL: ImageProbe(WIDTH, HEIGHT, probed),
+        })
+
+        assert ImageUrl.changed(IMAGE_URL, stored) == changed
+
+
+class TestFullResponses:
+    """Tests for probing images of hosts which ignore the range."""
+
+    def test_probe_full_response(self, mock_requests):
+        """Test that a full response is read until the dimensions only."""
+        chunks = iter([encode("GIF"), bytes(HEADER_SIZES[0]), b"rest"])
+        mock_requests.iter_content.side_effect = None
+        mock_requests.iter_content.return_value = chunks
+        mock_requests.status_code = 200
+
+        assert ImageUrl.probe(IMAGE_URL).width == WIDTH
+        assert next(chunks) == bytes(HEADER_SIZES[0])
+        assert mock_requests.close.called
+
+    def test_probe_full_response_exif(self, mock_requests, mocker):
+        """Test reading a full response past a large EXIF segment."""
+        image = encode(JPEG, exif=EXIF)
+        mock_requests.iter_content.side_effect = None
+        mock_requests.iter_content.return_value = iter([
+            image[start:start + HEADER_SIZES[0]]
+            for start in range(0, len(image), HEADER_SIZES[0])
+        ])
+        mock_requests.status_code = 200
+        mock_get = mocker.patch(REQUESTS_GET, return_value=mock_requests)
+
+        ImageUrl._validate(IMAGE_URL)
+
+        assert ImageUrl.probes[IMAGE_URL] == ImageProbe(WIDTH, HEIGHT)
+        assert mock_get.call_count == 1
+
+
+class TestStoredProbes:
+    """Tests for revalidating the probes of the last build."""
+
+    def test_probe_not_modified(self, mock_requests, mocker):
+        """Test reusing a stored probe of an unchanged image."""
+        stored = ImageProbe(WIDTH, HEIGHT, ETAG)
+        mocker.patch.object(ImageUrl, "stored", {IMAGE_URL: stored})
+        mock_requests.status_code = NOT_MODIFIED
+        mock_get = mocker.patch(REQUESTS_GET, return_value=mock_requests)
+
+        assert ImageUrl.probe(IMAGE_URL) is stored
+        mock_get.assert_called_once()
+        assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == ETAG
+
+    def test_probe_modified(self, mock_requests, mocker):
+        """Test probing again a changed image in the same request."""
+        mocker.patch.object(ImageUrl, "stored", {
+            IMAGE_URL: ImageProbe(WIDTH, HEIGHT, MODIFIED),
+        })
+        mock_requests.content = encode(PNG, size=(HEIGHT, WIDTH))
+        mock_get = mocker.patch(REQUESTS_GET, return_value=mock_requests)
+
+        assert ImageUrl.probe(IMAGE_URL) == ImageProbe(HEIGHT, WIDTH)
+        mock_get.assert_called_once()
+        assert mock_get.call_args.kwargs["headers"][
+            "If-Modified-Since"
+        ] == MODIFIED
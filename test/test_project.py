@@ -106,3 +106,22 @@ class TestProjectSection:
         assert PROJ_ID in section
         assert BAD_ID not in section
         assert all(msg in log_msg for msg in expected_logs)
+
+    def test_relate(self):
+        """Test listing related projects in the front matter."""
+        section = ProjectSection({
+            name: ProjectPage(
+                front_matter={"title": name, ID_KEY: name},
+                markdown=markdown,
+            )
+            for name, markdown in (
+                ("receiver", "Timing receiver"),
+                ("switch", "Timing switch"),
+                ("supply", "Power supply"),
+            )
+        })
+
+        section.relate(2)
+
+        assert section["receiver"].front_matter["related"] == ["switch"]
+        assert "related" not in section["supply"].front_matter
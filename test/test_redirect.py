@@ -4,25 +4,41 @@
 
 """Tests for redirect module."""
 
+import json
+
 import pytest
+from requests.exceptions import TooManyRedirects
 
-from config import Redirect
-from redirect import RedirectPage, RedirectSection
+from config import Redirect, RedirectRule
+from redirect import RedirectMap, RedirectPage, RedirectSection
+from url import Url
 
 
 @pytest.fixture(autouse=True)
 def mock_requests(mocker):
-    """Mock requests.head to avoid real HTTP calls."""
+    """Mock the HEAD requests to avoid real HTTP calls."""
     mock_response = mocker.Mock()
     mock_response.status_code = 200
-    mock_head = mocker.patch('requests.head', return_value=mock_response)
+    mock_head = mocker.patch(
+        'requests.Session.head', return_value=mock_response,
+    )
     return mock_head
 
 
+TARGET = "https://example.com/new/path"
+RESOLVED = "https://example.org/final"
+HOP = "https://example.net/hop"
+RULES = (RedirectRule(
+    url="docs/*",
+    target="https://example.com/docs/:splat",
+    paths=["docs/a", "docs/b/c"],
+),)
+
+
 @pytest.fixture
 def sample_redirect_config():
     """Return a sample Redirect configuration."""
-    return Redirect(url="old/path", target="https://example.com/new/path")
+    return Redirect(url="old/path", target=TARGET)
 
 
 @pytest.fixture
@@ -42,7 +58,7 @@ class TestRedirectPage:
         """Test creating a RedirectPage from config."""
         page = RedirectPage.from_config(sample_redirect_config)
 
-        assert page.front_matter["target"] == "https://example.com/new/path"
+        assert page.front_matter["target"] == TARGET
         assert page.markdown == ""
 
     def test_from_config_minimal(self, mock_requests):
@@ -58,16 +74,69 @@ class TestRedirectPage:
             timeout=10
         )
 
+    def test_from_config_resolved(
+        self, sample_redirect_config, mock_requests, mocker,
+    ):
+        """Test recording and collapsing the redirect chain of a target."""
+        mock_requests.return_value.url = RESOLVED
+        mock_requests.return_value.history = [
+            mocker.Mock(url=TARGET), mocker.Mock(url=HOP),
+        ]
+        page = RedirectPage.from_config(sample_redirect_config, max_hops=2)
+        collapsed = RedirectPage.from_config(
+            sample_redirect_config, max_hops=2, collapse=True,
+        )
+
+        assert page.front_matter["resolved"] == RESOLVED
+        assert page.front_matter["hops"] == 2
+        assert list(page.front_matter.values()).count(RESOLVED) == 1
+        assert list(collapsed.front_matter.values()).count(RESOLVED) == 2
+
+    def test_from_config_chain_too_long(
+        self, sample_redirect_config, mock_requests, mocker, caplog,
+    ):
+        """Test reporting a redirect chain over the hop limit."""
+        mock_requests.return_value.history = [
+            mocker.Mock(url=TARGET), mocker.Mock(url=HOP),
+        ]
+        page = RedirectPage.from_config(
+            sample_redirect_config, max_hops=1, collapse=True,
+        )
+
+        assert "Redirect chain too long: 2 > 1" in caplog.text
+        assert "resolved" not in page.front_matter
+
+    @pytest.mark.parametrize("endless", [False, True])
+    def test_from_config_loop(
+        self, sample_redirect_config, mock_requests, mocker, caplog, endless,
+    ):
+        """Test reporting a redirect chain back to a visited URL."""
+        hops = [mocker.Mock(url=TARGET), mocker.Mock(url=HOP)]
+        mock_requests.reset_mock()
+        mock_requests.return_value = mocker.Mock(url=TARGET, history=hops)
+        if endless:
+            mock_requests.side_effect = TooManyRedirects(
+                response=mocker.Mock(history=hops[1:] + hops),
+            )
+        Url.heads.clear()
+
+        RedirectPage.from_config(sample_redirect_config, max_hops=5)
+
+        assert "Redirect loop: {0} -> {1} -> {0}.".format(
+            TARGET, HOP,
+        ) in caplog.text
+        assert mock_requests.call_count == 1
+
 
 class MockFromConfigHelper:
     def __init__(self, invalid_config, original_from_config):
         self.invalid_config = invalid_config
         self.original_from_config = original_from_config
 
-    def __call__(self, config):
+    def __call__(self, config, *args):
         if config == self.invalid_config:
             raise ValueError("Test error")
-        return self.original_from_config(config)
+        return self.original_from_config(config, *args)
 
 
 class TestRedirectSection:
@@ -114,7 +183,8 @@ class TestRedirectSection:
             "/output/path"
         )
 
-        assert mock_open.call_count == sample_redirect_configs_length
+        # One file per page plus the section manifest.
+        assert mock_open.call_count == sample_redirect_configs_length + 1
         assert mock_requests.call_count == sample_redirect_configs_length
 
     def test_write_failure(
@@ -130,5 +200,117 @@ class TestRedirectSection:
         section.write("/output/path")
 
         assert "Failed to write" in caplog.text
-        assert mock_open.call_count == sample_redirect_configs_length
+        # One file per page plus the section manifest.
+        assert mock_open.call_count == sample_redirect_configs_length + 1
         assert mock_requests.call_count == sample_redirect_configs_length
+
+    def test_from_config_grouped(self, sample_redirect_configs, mock_requests):
+        """Test that redirects sharing a target become one page."""
+        alias = sample_redirect_configs[0].model_copy(update={"url": "/a/"})
+        section = RedirectSection.from_config(
+            [*sample_redirect_configs, alias],
+        )
+
+        assert len(section) == mock_requests.call_count == 3
+        assert section["0"].front_matter["aliases"] == ["/a/index.html"]
+        assert "aliases" not in section["1"].front_matter
+
+    def test_from_config_with_rules(self, mock_requests):
+        """Test that rule paths become redirect pages, left unresolved."""
+        section = RedirectSection.from_config([], RULES, max_hops=3)
+        targets = [page.front_matter["target"] for page in section.values()]
+
+        assert targets == [
+            "https://example.com/docs/a",
+            "https://example.com/docs/b/c",
+        ]
+        assert "resolved" not in section["0"].front_matter
+        mock_requests.assert_not_called()
+
+
+class TestRedirectMap:
+    """Tests for RedirectMap class."""
+
+    def test_from_config(self, sample_redirect_configs):
+        """Test compiling redirects into a single map."""
+        redirect_map = RedirectMap.from_config(sample_redirect_configs)
+
+        assert redirect_map == {
+            "/old/path1": "https://example.com/new/path1",
+            "/old/path2": "https://example.com/new/path2",
+            "/old/path3": "https://example.com/new/path3",
+        }
+
+    def test_from_config_validation(self, sample_redirect_configs, caplog):
+        """Test that invalid and conflicting redirects are dropped."""
+        configs = sample_redirect_configs + [
+            Redirect(
+                url="/old/path1/", target="https://example.com/new/path1",
+            ),
+            Redirect(url="old/path2", target="https://example.com/other"),
+            Redirect(url="../escape", target=TARGET),
+        ]
+        redirect_map = RedirectMap.from_config(configs)
+
+        assert len(redirect_map) == len(sample_redirect_configs)
+        assert redirect_map["/old/path2"] == "https://example.com/new/path2"
+        assert "Conflicting targets" in caplog.text
+        assert "Invalid path '../escape'" in caplog.text
+
+    @pytest.mark.parametrize(("map_format", "expected"), [
+        ("netlify", "/a https://example.com/a 301\n"),
+        ("nginx", 'map $uri $redirect_target {\n'
+            '    "/a" "https://example.com/a";\n'
+            '    "/a/" "https://example.com/a";\n}\n'),
+    ])
+    def test_render(self, map_format, expected):
+        """Test rendering the text redirect map formats."""
+        redirect_map = RedirectMap({"/a": "https://example.com/a"})
+
+        assert redirect_map.render(map_format) == expected
+
+    def test_write_json(self, sample_redirect_configs, tmp_path):
+        """Test writing the JSON redirect map."""
+        redirect_map = RedirectMap.from_config(sample_redirect_configs)
+        redirect_map.write(str(tmp_path / "static"), "json")
+
+        with open(tmp_path / "static" / "redirects.json") as map_file:
+            assert json.load(map_file)["redirects"] == dict(redirect_map)
+
+    def test_write_unsupported(self, caplog, tmp_path):
+        """Test writing an unsupported format."""
+        RedirectMap().write(str(tmp_path), "apache")
+
+        assert "Unsupported format 'apache'" in caplog.text
+
+    def test_from_config_with_rules(self, sample_redirect_configs):
+        """Test that rules are emitted and replace the redirects they match."""
+        configs = sample_redirect_configs + [
+            Redirect(url="docs/a", target="https://example.com/docs/a"),
+            Redirect(url="docs/wiki/", target=TARGET),
+        ]
+        redirect_map = RedirectMap.from_config(configs, RULES)
+        nginx_rule = '"~^/docs/(?<splat>.+)$" "https://example.com/docs/$splat'
+        nginx = redirect_map.render("nginx")
+
+        assert "/docs/a" not in redirect_map
+        assert len(redirect_map) == len(sample_redirect_configs) + 1
+        assert redirect_map.render("netlify").endswith(
+            "\n/docs/* https://example.com/docs/:splat 301\n",
+        )
+        assert nginx_rule in nginx
+        # nginx tries the exact keys first, so the trailing slash URL is
+        # not left to the rule.
+        assert '"/docs/wiki/" "{0}";'.format(TARGET) in nginx
+
+    def test_from_config_collapse(
+        self, sample_redirect_configs, mock_requests, mocker,
+    ):
+        """Test compiling collapsed redirect targets."""
+        mock_requests.return_value.url = RESOLVED
+        mock_requests.return_value.history = [mocker.Mock(url=TARGET)]
+        redirect_map = RedirectMap.from_config(
+            sample_redirect_configs, max_hops=1, collapse=True,
+        )
+
+        assert set(redirect_map.values()) == {RESOLVED}
@@ -0,0 +1,89 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for related module."""
+
+import numpy
+import pytest
+from scipy import sparse
+
+from project import ProjectPage, ProjectSection
+from related import neighbours, related_pages, tfidf
+from search import SearchIndex
+
+FPGA = "FPGA"
+SWITCH = "switch"
+NODE = "node"
+SUPPLY = "supply"
+AMPLIFIER = "amplifier"
+
+
+def project(name, tags, markdown):
+    """Return a project page."""
+    return ProjectPage(
+        front_matter={"title": name, "id": name, "tags": tags},
+        markdown=markdown,
+    )
+
+
+@pytest.fixture
+def project_section():
+    """Return a projects section with two pairs of similar pages."""
+    return ProjectSection({
+        SWITCH: project(SWITCH, [FPGA], "White Rabbit timing switch"),
+        NODE: project(NODE, [FPGA], "White Rabbit timing node"),
+        SUPPLY: project(SUPPLY, [], "Linear power supply"),
+        AMPLIFIER: project(AMPLIFIER, [], "Power amplifier"),
+    })
+
+
+def test_tfidf(project_section):
+    """Test that rows are unit vectors weighting rare tokens more."""
+    search_index = SearchIndex.from_section(project_section)
+    vectors = tfidf(search_index)
+    tokens = list(search_index)
+    row = vectors.getrow(search_index.docs.index(NODE)).toarray()[0]
+
+    assert numpy.allclose(sparse.linalg.norm(vectors, axis=1), 1)
+    assert row[tokens.index(NODE)] > row[tokens.index("timing")]
+
+
+def test_tfidf_terms(project_section):
+    """Test keeping the heaviest tokens of each page."""
+    vectors = tfidf(SearchIndex.from_section(project_section), 1)
+
+    assert vectors.getnnz(axis=1).tolist() == [1, 1, 1, 1]
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 8])
+def test_neighbours(block_size):
+    """Test ordering by similarity, then by row, across blocks."""
+    vectors = sparse.csr_matrix(numpy.array([
+        [1, 0, 0],
+        [0.8, 0.6, 0],
+        [0.8, 0.6, 0],
+        [0, 0, 1],
+    ]))
+
+    assert neighbours(vectors, 2, block_size) == [
+        [1, 2],
+        [2, 0],
+        [1, 0],
+        [],
+    ]
+
+
+def test_related_pages(project_section):
+    """Test finding the related pages of each page."""
+    assert related_pages(project_section, 1) == {
+        AMPLIFIER: [SUPPLY],
+        NODE: [SWITCH],
+        SUPPLY: [AMPLIFIER],
+        SWITCH: [NODE],
+    }
+
+
+def test_related_pages_empty():
+    """Test that pages without tokens have no related pages."""
+    assert not related_pages(ProjectSection(), 1)
@@ -17,6 +17,7 @@ TEST_INVALID_URL = "https://unsupported.com/repo.git"
 TEST_FILE_PATH = "path/to/file.txt"
 TEST_FILE_CONTENT = "file content"
 TEST_DEFAULT_BRANCH = "main"
+TEST_REVISION = "0123456789abcdef"
 MOCK_GET_PATH = "repository.Repository._get"
 
 
@@ -82,6 +83,17 @@ class TestGitHubRepository:
         )
         assert file_content == TEST_FILE_CONTENT
 
+    def test_revision(self, mocker):
+        """Test getting the revision of the default branch from GitHub."""
+        mock_get = mocker.patch(MOCK_GET_PATH)
+        mock_get.return_value.text = "{0}\n".format(TEST_REVISION)
+
+        assert GitHubRepository(TEST_GITHUB_URL).revision() == TEST_REVISION
+        mock_get.assert_called_once_with(
+            "https://api.github.com/repos/owner/repo/commits/HEAD",
+            headers={"Accept": "application/vnd.github.sha"},
+        )
+
 
 class TestGitLabRepository:
     """Test GitLabRepository functionality."""
@@ -127,6 +139,25 @@ class TestGitLabRepository:
             repository.fetch(TEST_FILE_PATH)
         assert "Failed to load JSON" in str(excinfo.value)
 
+    def test_revision(self, mocker):
+        """Test getting the revision of the default branch from GitLab."""
+        mock_get = mocker.patch(MOCK_GET_PATH)
+        mock_get.return_value.json.return_value = [{"id": TEST_REVISION}]
+
+        assert GitLabRepository(TEST_GITLAB_URL).revision() == TEST_REVISION
+        mock_get.assert_called_once_with(
+            "{0}/repository/commits?per_page=1".format(
+                self._get_expected_urls(TEST_GITLAB_URL)[0],
+            ),
+        )
+
+    def test_revision_empty(self, mocker):
+        """Test handling of a repository without commits."""
+        mocker.patch(MOCK_GET_PATH).return_value.json.return_value = []
+
+        with pytest.raises(ValueError, match="Failed to load JSON"):
+            GitLabRepository(TEST_GITLAB_URL).revision()
+
     def _get_expected_urls(self, repo_url):
         """Generate expected URLs for GitLab API calls."""
         match = re.search(r"^https://([^/]+)/(.+?)\.git", repo_url)
@@ -0,0 +1,169 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for search module."""
+
+import pytest
+
+from files import read_json, write_json
+from news import NewsPage, NewsSection
+from project import ProjectPage, ProjectSection
+from search import SearchIndex, check_indexes, tokenize, write_indexes
+
+PAGE = "a-1"
+# Project IDs with uppercase letters, which Hugo lowercases in page paths.
+PROJECTS = ("WR2RF-VME", "10G-wr-nic")
+RABBIT = "rabbit"
+
+
+@pytest.fixture
+def news_section():
+    """Return a news section with two pages."""
+    return NewsSection({
+        "b-1": NewsPage(
+            front_matter={"title": "Rabbit release", "project": "White"},
+            markdown="New rabbit gateware.",
+        ),
+        PAGE: NewsPage(
+            front_matter={"title": "Switch update", "project": "Switch"},
+            markdown="Rabbit switch firmware.",
+        ),
+    })
+
+
+class TestSearchIndex:
+    """Tests for SearchIndex class."""
+
+    def test_tokenize(self):
+        """Test splitting text into lowercase tokens."""
+        assert tokenize("White-Rabbit v2_0, Ünïcode!") == [
+            "white", RABBIT, "v2_0", "ünïcode",
+        ]
+
+    def test_from_section(self, news_section):
+        """Test that scores sum the weights of the fields of each token."""
+        search_index = SearchIndex.from_section(news_section)
+
+        assert search_index.docs == [PAGE, "b-1"]
+        assert search_index[RABBIT] == {0: 1, 1: 4}
+        assert search_index["switch"] == {0: 6}
+        assert search_index["white"] == {1: 2}
+
+    def test_shards(self, news_section):
+        """Test splitting the postings by token prefix."""
+        shards = SearchIndex.from_section(news_section).shards(2)
+
+        assert shards["ra"] == {RABBIT: [(0, 1), (1, 4)]}
+        assert set(shards["re"]) == {"release"}
+
+    def test_write(self, news_section, tmp_path):
+        """Test writing the manifest and shards, and pruning stale ones."""
+        shard_path = tmp_path / "search"
+        shard_path.mkdir()
+        (shard_path / "zz.json").write_text("{}")
+        SearchIndex.from_section(news_section).write(str(tmp_path))
+
+        manifest = read_json(str(tmp_path / "search.json"))
+        shard = read_json(str(shard_path / "ra.json"))
+        shards = sorted(path.stem for path in shard_path.iterdir())
+
+        assert manifest["docs"] == [PAGE, "b-1"]
+        assert manifest["shards"] == shards
+        assert shard == {RABBIT: [[0, 1], [1, 4]]}
+
+    def test_write_failure(self, news_section, tmp_path, caplog):
+        """Test that write errors are logged."""
+        (tmp_path / "search").write_text("")
+        SearchIndex.from_section(news_section).write(str(tmp_path))
+
+        assert "Failed to write" in caplog.text
+
+
+def publish(path, section):
+    """Write index.json as Hugo would publish the section, named by ID."""
+    write_json(str(path / "index.json"), {
+        "keys": [
+            {"name": name, "weight": weight}
+            for name, weight in section.fuse_keys
+        ],
+        "index": [
+            {
+                "name": page.front_matter.get("id", name),
+                "url": "/{0}/".format(name.lower()),
+            } | page.search_record()
+            for name, page in reversed(list(section.items()))
+        ],
+    })
+
+
+class TestCheckIndexes:
+    """Tests for the search index check."""
+
+    def test_consistent(self, news_section, tmp_path):
+        """Test that indexes written by compose match Hugo's pages."""
+        path = str(tmp_path)
+        write_indexes(news_section, path)
+        publish(tmp_path, news_section)
+
+        check_indexes(path)
+
+    def test_stale(self, news_section, tmp_path):
+        """Test that a changed page is detected."""
+        path = str(tmp_path)
+        write_indexes(news_section, path)
+        news_section[PAGE].front_matter["title"] = "Switch release"
+        publish(tmp_path, news_section)
+
+        with pytest.raises(ValueError, match="is stale"):
+            check_indexes(path)
+
+    def test_pages_differ(self, news_section, tmp_path):
+        """Test that a missing page is detected."""
+        path = str(tmp_path)
+        write_indexes(news_section, path)
+        news_section.pop(PAGE)
+        publish(tmp_path, news_section)
+
+        with pytest.raises(ValueError, match="differ from index.json"):
+            check_indexes(path)
+
+    def test_archive(self, news_section, tmp_path):
+        """Test checking the pages of an archive named by index.json."""
+        path = str(tmp_path)
+        for page in news_section.values():
+            page.front_matter.update(
+                date="2025-01-01",
+                project_id=page.front_matter["project"],
+                url="/news/",
+                summary=page.markdown,
+            )
+        write_indexes(news_section, path)
+        news_section.write_archive(path, latest=1)
+        write_json(str(tmp_path / "index.json"), {
+            "keys": [
+                {"name": name, "weight": weight}
+                for name, weight in news_section.fuse_keys
+            ],
+            "archive": "latest.json",
+        })
+
+        check_indexes(path)
+
+    def test_mixed_case(self, tmp_path):
+        """Test that pages of mixed-case project IDs keep their names."""
+        path = str(tmp_path)
+        projects = ProjectSection({
+            project_id: ProjectPage(
+                front_matter=dict(title=project_id, id=project_id),
+                markdown="Project.",
+            )
+            for project_id in PROJECTS
+        })
+        write_indexes(projects, path)
+        publish(tmp_path, projects)
+
+        check_indexes(path)
+        assert read_json(str(tmp_path / "search.json"))["docs"] == sorted(
+            PROJECTS,
+        )
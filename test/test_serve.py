@@ -0,0 +1,186 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for serve module."""
+
+import argparse
+import hmac
+import json
+import logging
+import threading
+from http import HTTPStatus
+from types import MappingProxyType
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from serve import Refresher, WebhookServer
+from state import BuildState
+
+PROJECT = "project"
+REPOSITORY = "https://github.com/example/project.git"
+SECRET = "secret"
+BRANCH = "refs/heads/main"
+PUSH = json.dumps({"ref": BRANCH, "repository": {
+    "clone_url": REPOSITORY, "default_branch": "main",
+}}).encode()
+SIGNATURE = "sha256={0}".format(
+    hmac.new(SECRET.encode(), PUSH, "sha256").hexdigest(),
+)
+GITHUB = MappingProxyType({
+    "X-GitHub-Event": "push", "X-Hub-Signature-256": SIGNATURE,
+})
+GITLAB = MappingProxyType({
+    "X-Gitlab-Event": "Push Hook", "X-Gitlab-Token": SECRET,
+})
+
+
+def gitlab_push(repository, ref=BRANCH):
+    """Return the payload of a GitLab push."""
+    return json.dumps({"ref": ref, "project": {
+        "git_http_url": repository, "default_branch": "main",
+    }}).encode()
+
+
+@pytest.fixture
+def refresher(mocker):
+    """Return a refresher of one project, which does not refresh."""
+    project = mocker.Mock(id=PROJECT)
+    project.repository.url = REPOSITORY
+    refresher = Refresher(
+        argparse.Namespace(projects=[project], sources="hugo"),
+        argparse.Namespace(hugo=None),
+        BuildState(),
+        [],
+    )
+    mocker.patch.object(refresher, "request")
+    mocker.patch.object(refresher, "run")
+    return refresher
+
+
+@pytest.fixture
+def server(refresher):
+    """Serve webhooks on a free port."""
+    server = WebhookServer("127.0.0.1:0", refresher, SECRET)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestWebhookServer:
+    """Tests for WebhookServer class."""
+
+    @pytest.mark.parametrize(("path", "headers", "body", "status"), [
+        ("/", GITHUB, PUSH, HTTPStatus.ACCEPTED),
+        ("/", {**GITHUB, "X-Hub-Signature-256": "sha256=0"}, PUSH, (
+            HTTPStatus.UNAUTHORIZED
+        )),
+        ("/", GITLAB, gitlab_push(REPOSITORY), HTTPStatus.ACCEPTED),
+        ("/", GITLAB, gitlab_push("HTTP://GitHub.com/example/project/"), (
+            HTTPStatus.ACCEPTED
+        )),
+        ("/", GITLAB, b"{", HTTPStatus.BAD_REQUEST),
+        ("/", GITLAB, gitlab_push("https://gitlab.com/other.git"), (
+            HTTPStatus.NOT_FOUND
+        )),
+        ("/", GITLAB, gitlab_push(REPOSITORY, "refs/heads/feature"), (
+            HTTPStatus.NOT_FOUND
+        )),
+        ("/", {**GITLAB, "X-Gitlab-Event": "Tag Push Hook"}, gitlab_push(
+            REPOSITORY,
+        ), HTTPStatus.NOT_FOUND),
+        ("/", {**GITLAB, "Content-Length": "-1"}, b"", (
+            HTTPStatus.BAD_REQUEST
+        )),
+        ("/", {**GITLAB, "Content-Length": "26214401"}, b"", (
+            HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        )),
+        ("/refresh/project", GITLAB, b"", HTTPStatus.ACCEPTED),
+        ("/refresh/project", {}, b"", HTTPStatus.UNAUTHORIZED),
+        ("/refresh/other", GITLAB, b"", HTTPStatus.NOT_FOUND),
+    ])
+    def test_post(self, server, path, headers, body, status):
+        """Test requesting refreshes with webhooks and local triggers."""
+        request = Request(
+            "http://127.0.0.1:{0}{1}".format(server.server_address[1], path),
+            data=body,
+            headers=headers,
+            method="POST",
+        )
+        try:
+            with urlopen(request) as response:
+                code = response.status
+        except HTTPError as http_error:
+            code = http_error.code
+
+        accepted = status == HTTPStatus.ACCEPTED
+        assert code == status
+        assert server.refresher.request.called == accepted
+        if accepted:
+            server.refresher.request.assert_called_once_with({PROJECT})
+
+    def test_invalid_address(self, refresher):
+        """Test that an address without port is rejected."""
+        with pytest.raises(ValueError, match="Invalid address"):
+            WebhookServer("localhost", refresher)
+
+    def test_no_secret(self, refresher, caplog):
+        """Test that only a loopback address is served without secret."""
+        with pytest.raises(ValueError, match="No webhook secret"):
+            WebhookServer("0.0.0.0:0", refresher)  # noqa: S104
+        with caplog.at_level(logging.WARNING):
+            WebhookServer("127.0.0.1:0", refresher).server_close()
+
+        assert "without a secret" in caplog.text
+
+
+class TestRefresher:
+    """Tests for Refresher class."""
+
+    def test_refresh(self, refresher, mocker):
+        """Test refreshing projects, then running Hugo."""
+        build_graph = mocker.patch("serve.build_graph")
+        run = mocker.patch("serve.subprocess.run")
+        refresher.args.hugo = "public"
+
+        refresher.refresh({PROJECT})
+
+        build_graph.assert_called_once_with(
+            refresher.config, refresher.args, refresher.build_state,
+            {PROJECT}, refresher.licenses,
+        )
+        build_graph.return_value.run.assert_called_once()
+        assert run.call_args.args[0][-1] == "public"
+
+    def test_refresh_failure(self, refresher, mocker, caplog):
+        """Test that a failed refresh is logged and Hugo is not run."""
+        build_graph = mocker.patch("serve.build_graph")
+        build_graph.return_value.run.side_effect = ValueError("failed")
+        run = mocker.patch("serve.subprocess.run")
+        refresher.args.hugo = "public"
+
+        with caplog.at_level(logging.ERROR):
+            refresher.refresh({PROJECT})
+
+        assert "Failed to refresh:\nfailed" in caplog.text
+        run.assert_not_called()
+
+    def test_run_failure(self, refresher, mocker, caplog):
+        """Test that the refreshes go on after an unexpected failure."""
+        refresh = mocker.patch.object(refresher, "refresh", side_effect=[
+            RuntimeError("failed"), SystemExit,
+        ])
+        # Each wait for a refresh gets a request at once.
+        refresher.condition = mocker.MagicMock()
+        refresher.condition.wait.side_effect = (
+            lambda: refresher.pending.add(PROJECT)
+        )
+
+        with caplog.at_level(logging.ERROR), pytest.raises(SystemExit):
+            Refresher.run(refresher)
+
+        assert refresh.call_count == 2
+        assert "Failed to refresh project:" in caplog.text
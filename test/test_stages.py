@@ -0,0 +1,169 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for stages module."""
+
+import argparse
+
+import pytest
+
+from config import Redirect
+from hugo import ADAPTER, Page, Section
+from stages import (
+    generate_redirects,
+    generate_sections,
+    load_config,
+    load_licenses,
+    store_images,
+    write_section,
+)
+from state import BuildState, ProjectState
+
+GENERATED = "generated"
+
+
+@pytest.fixture
+def args():
+    """Return the default command line arguments of the stages."""
+    return argparse.Namespace(
+        jobs=1,
+        processes=False,
+        front_matter="yaml",
+        content="files",
+        redirects="pages",
+        max_redirect_hops=None,
+        collapse_redirects=False,
+        remote_images=False,
+        related=0,
+        news_retention=0,
+        project_timeout=10,
+        project_memory=None,
+    )
+
+
+@pytest.fixture
+def config(tmp_path, mocker):
+    """Return a configuration of one redirect."""
+    return argparse.Namespace(
+        check_targets=mocker.Mock(),
+        sources=str(tmp_path),
+        licenses=str(tmp_path / "licenses.json"),
+        redirects=[Redirect(url="old", target="https://example.com/new")],
+        redirect_rules=None,
+        projects=[],
+    )
+
+
+class TestLoadConfig:
+    """Tests for load_config function."""
+
+    def test_load_config_invalid(self, tmp_path):
+        """Test loading an invalid configuration."""
+        path = tmp_path / "config.yaml"
+        path.write_text("sources: 1\n")
+
+        with pytest.raises(ValueError, match="Failed to load configuration"):
+            load_config(str(path))
+
+    def test_load_config_deferred(self, tmp_path, mocker):
+        """Test that the redirect targets are left to the redirects task."""
+        from_yaml = mocker.patch("stages.Config.from_yaml")
+        path = tmp_path / "config.yaml"
+        path.write_text("sources: 1\n")
+
+        assert load_config(str(path)) is from_yaml.return_value
+        from_yaml.assert_called_once_with("sources: 1\n", deferred=True)
+
+
+class TestStages:
+    """Tests for the build stages."""
+
+    def test_load_licenses_invalid(self, config):
+        """Test loading an invalid SPDX license list."""
+        with pytest.raises(ValueError, match="Failed to load SPDX"):
+            load_licenses(config)
+
+    def test_generate_sections(self, config, args, mocker, tmp_path):
+        """Test that workers get the last state of their project alone."""
+        config.projects = [mocker.Mock(id=GENERATED), mocker.Mock(id="new")]
+        mocker.patch("stages.SpdxLicenseList.from_file")
+        from_config = mocker.patch(
+            "stages.ProjectState.from_config",
+            side_effect=lambda project, *_: ProjectState("config", pages={
+                "projects": [{
+                    "name": project.id, "front_matter": {}, "markdown": "",
+                }],
+            }),
+        )
+        # Workers run in this process, on the inputs they would get.
+        mocker.patch(
+            "stages.Isolation.run",
+            side_effect=lambda work, inputs, *work_args: {
+                name: work(argument, *work_args)
+                for name, argument in inputs.items()
+            },
+        )
+        build_state = BuildState(str(tmp_path / "state.json"))
+        build_state.projects = {GENERATED: ProjectState("last")}
+
+        sections = generate_sections(config, args, build_state)
+
+        assert list(sections[0]) == list(build_state.projects) == [
+            GENERATED, "new",
+        ]
+        assert not sections[1]
+        assert [call.args[2] for call in from_config.call_args_list] == [
+            {GENERATED: ProjectState("last")}, {},
+        ]
+
+    def test_generate_sections_licenses(self, config, args, mocker):
+        """Test that workers get the license list parsed by the build."""
+        run = mocker.patch("stages.Isolation.run", return_value={})
+        licenses = [mocker.Mock()]
+
+        generate_sections(config, args, BuildState(), {GENERATED}, licenses)
+
+        assert run.call_args.args[3] is licenses
+
+    def test_generate_redirects_map(self, config, args, tmp_path):
+        """Test writing the redirects as a map instead of pages."""
+        (tmp_path / "static").mkdir()
+        args.redirects = "json"
+
+        assert not generate_redirects(config, args)
+        assert (tmp_path / "static" / "redirects.json").exists()
+        config.check_targets.assert_called_once_with(args.jobs)
+
+    def test_store_images(self, config, args, mocker, tmp_path):
+        """Test that each section has a store, with a manifest out of it."""
+        image_store = mocker.patch("stages.ImageStore")
+        page = Page({"title": "Page"}, "Text.")
+        section = Section({"project": page})
+
+        assert store_images(config, args, "projects", section) is section
+        image_store.assert_called_once_with(
+            str(tmp_path / "static" / "images" / "projects"),
+            str(tmp_path / ".images-projects.json"),
+            "/images/projects",
+        )
+        image_store.return_value.localize.assert_called_once_with(
+            [page.front_matter], args.jobs,
+        )
+
+    def test_store_images_remote(self, config, args, mocker):
+        """Test that remote images are not stored."""
+        image_store = mocker.patch("stages.ImageStore")
+        section = Section()
+        args.remote_images = True
+
+        assert store_images(config, args, "news", section) is section
+        image_store.assert_not_called()
+
+    def test_write_section(self, config, args, tmp_path):
+        """Test writing a section as a content adapter."""
+        args.content = "adapters"
+        section = Section({"page": Page({"title": "Page"}, "Text.")})
+
+        assert write_section(config, args, "pages", section) is section
+        assert (tmp_path / "content" / "pages" / ADAPTER).exists()
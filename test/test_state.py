@@ -0,0 +1,228 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for state module."""
+
+import argparse
+import datetime
+from dataclasses import replace
+
+import pytest
+
+from news import NewsPage, NewsSection
+from probe import ImageProbe
+from project import ProjectPage, ProjectSection
+from state import BuildState, ProjectState
+
+PROJECT = "project"
+NEWS = "project-2024-01-02-news"
+DESCRIPTION = "https://example.com/description.md"
+DATE = datetime.date.fromisoformat("2024-01-02")
+OTHER = "other"
+GENERATE = "state.ProjectSection.from_config"
+REVISION = "revision"
+IMAGE_URL = "https://example.com/image.png"
+STATE_FILE = "state.json"
+
+
+@pytest.fixture
+def project(mocker):
+    """Return a mocked project configuration."""
+    config = mocker.Mock(id=PROJECT, news=[])
+    config.model_dump_json.return_value = "{}"
+    config.repository.revision.return_value = REVISION
+    config.manifest_yaml = "name: Project"
+    config.manifest.description.url = DESCRIPTION
+    config.manifest.description.text = "Description."
+    config.manifest.newsfeed = None
+    mocker.patch("state.StrictUrl.etag", return_value="etag")
+    mocker.patch(GENERATE, return_value=ProjectSection({
+        PROJECT: ProjectPage({"title": "Project"}, "Text."),
+    }))
+    mocker.patch("state.NewsSection.from_config", return_value=NewsSection({
+        NEWS: NewsPage({"date": DATE}, "News."),
+    }))
+    return config
+
+
+def news_state(*names):
+    """Return the state of a project with news numbered from the oldest."""
+    return ProjectState(OTHER, pages={"news": [
+        {
+            "name": name,
+            "front_matter": {
+                "date": str(DATE),
+                "aliases": ["/news/project-{0}/".format(number)],
+            },
+            "markdown": "News.",
+        }
+        for number, name in enumerate(names, 1)
+    ]})
+
+
+class TestProjectState:
+    """Tests for ProjectState class."""
+
+    def test_from_config(self, project):
+        """Test that a build which is not incremental generates pages."""
+        project_state = ProjectState.from_config(project)
+        ProjectState.from_config(project, states={OTHER: project_state})
+
+        assert not project_state.revision
+        assert project_state.manifest
+        assert project_state.sources == {DESCRIPTION: "etag"}
+        project.repository.revision.assert_not_called()
+
+    def test_from_config_unchanged(self, project, mocker):
+        """Test reusing the pages of a project whose inputs are unchanged."""
+        previous = ProjectState.from_config(project, states={})
+        generate = mocker.patch(GENERATE)
+
+        project_state = ProjectState.from_config(
+            project, states={PROJECT: previous},
+        )
+
+        generate.assert_not_called()
+        assert not previous.revision
+        assert project_state == replace(previous, revision=REVISION)
+        assert list(project_state.sections()[0]) == [PROJECT]
+
+    @pytest.mark.parametrize("change", [
+        {"revision": OTHER, "manifest": OTHER},
+        {"config": OTHER},
+        {"sources": {DESCRIPTION: OTHER}},
+        {"manifest": ""},
+    ])
+    def test_from_config_changed(self, project, change):
+        """Test generating the pages of a project whose inputs changed."""
+        previous = ProjectState.from_config(project, states={})
+        previous.__dict__.update(change)
+        previous.pages = {}
+
+        project_state = ProjectState.from_config(
+            project, states={PROJECT: previous},
+        )
+
+        assert project_state.pages
+
+    def test_from_config_config_changed(self, project):
+        """Test that a changed configuration entry skips the revision."""
+        previous = ProjectState.from_config(project, states={})
+        previous.config = OTHER
+
+        ProjectState.from_config(project, states={PROJECT: previous})
+
+        project.repository.revision.assert_not_called()
+
+    def test_from_config_revision_only(self, project):
+        """Test reusing the pages if only the revision changed."""
+        previous = ProjectState.from_config(project, states={})
+        previous.revision = OTHER
+        previous.pages = {}
+
+        project_state = ProjectState.from_config(
+            project, states={PROJECT: previous},
+        )
+
+        assert project_state.revision == REVISION
+        assert not project_state.pages
+
+    @pytest.mark.parametrize(("text", "reused"), [
+        ("Description.", True),
+        ("Changed.", False),
+    ])
+    def test_from_config_without_etag(self, project, mocker, text, reused):
+        """Test checking sources without entity tag by their digest."""
+        mocker.patch("state.StrictUrl.etag", return_value="")
+        previous = ProjectState.from_config(project, states={})
+        previous.pages = {}
+        create = mocker.patch("state.UrlContent.create")
+        create.return_value.text = text
+
+        project_state = ProjectState.from_config(
+            project, states={PROJECT: previous},
+        )
+
+        create.assert_called_once_with(DESCRIPTION)
+        assert bool(project_state.pages) != reused
+
+    def test_generate_failed(self, project, mocker):
+        """Test that a failed project is generated again next time."""
+        mocker.patch(GENERATE, return_value=ProjectSection())
+
+        assert not ProjectState.from_config(project).manifest
+
+
+class TestBuildState:
+    """Tests for BuildState class."""
+
+    def test_save(self, project, tmp_path):
+        """Test loading the saved state of a build."""
+        path = str(tmp_path / STATE_FILE)
+        config = argparse.Namespace(licenses=str(tmp_path / "licenses.json"))
+        build_state = BuildState.from_config(path, config)
+        build_state.projects = {
+            PROJECT: ProjectState.from_config(project, states={}),
+        }
+        build_state.save()
+
+        loaded = BuildState.from_config(path, config).sections()
+        changed = BuildState.from_config(path, config, retention=1)
+
+        assert list(loaded[0]) == [PROJECT]
+        assert loaded[1][NEWS].front_matter == {"date": DATE}
+        assert changed.previous() == {}
+
+    def test_save_probes(self, tmp_path):
+        """Test keeping the image probes, whatever the build inputs."""
+        path = str(tmp_path / STATE_FILE)
+        build_state = BuildState(path)
+        build_state.save({IMAGE_URL: ImageProbe(1, 2, '"v1"')})
+        build_state = BuildState(path, inputs="changed")
+        build_state.load()
+
+        assert ImageProbe.load(build_state.probes) == {
+            IMAGE_URL: ImageProbe(1, 2, '"v1"'),
+        }
+
+        build_state.update({})
+
+        assert not build_state.probes
+
+    def test_frozen_aliases(self, tmp_path):
+        """Test that numbered news paths survive dropped news."""
+        path = str(tmp_path / STATE_FILE)
+        build_state = BuildState(path)
+        build_state.projects = {PROJECT: news_state(OTHER, NEWS)}
+        build_state.sections()
+        build_state.save()
+        # The other news was dropped, and a new one added since.
+        build_state = BuildState(path, inputs="changed")
+        build_state.load()
+        build_state.projects = {PROJECT: news_state(NEWS, "new")}
+
+        news = build_state.sections()[1]
+
+        assert news[NEWS].front_matter["aliases"] == ["/news/project-2/"]
+        assert "aliases" not in news["new"].front_matter
+
+    def test_previous(self):
+        """Test that a build without state file is not incremental."""
+        assert BuildState().previous() is None
+
+    def test_refresh(self, project, tmp_path):
+        """Test that a refresh only replaces the refreshed project states."""
+        build_state = BuildState(str(tmp_path / STATE_FILE))
+        build_state.projects = {
+            PROJECT: ProjectState("config"),
+            OTHER: ProjectState("config"),
+        }
+        refreshed = ProjectState("refreshed")
+
+        previous = build_state.previous({PROJECT})
+        build_state.update({PROJECT: refreshed}, {PROJECT})
+
+        assert list(previous) == [OTHER]
+        assert build_state.projects[PROJECT] is refreshed
+        assert OTHER in build_state.projects
@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for tasks module."""
+
+import threading
+
+import pytest
+
+from tasks import TaskGraph
+
+TIMEOUT = 5
+FIRST = "first"
+SECOND = "second"
+JOINED = "joined"
+
+
+@pytest.fixture
+def graph():
+    """Return a graph of two tasks joined by a third one."""
+    task_graph = TaskGraph()
+    task_graph.add(FIRST, lambda: 1)
+    task_graph.add(SECOND, lambda: 2)
+    task_graph.add(JOINED, lambda first, second: first + second, FIRST, SECOND)
+    return task_graph
+
+
+class TestTaskGraph:
+    """Tests for TaskGraph class."""
+
+    def test_run(self, graph):
+        """Test that tasks get the results of the tasks they need."""
+        assert graph.run() == {FIRST: 1, SECOND: 2, JOINED: 3}
+
+    def test_run_concurrently(self):
+        """Test that independent tasks run at the same time."""
+        barrier = threading.Barrier(2, timeout=TIMEOUT)
+        task_graph = TaskGraph()
+        task_graph.add(FIRST, barrier.wait)
+        task_graph.add(SECOND, barrier.wait)
+
+        assert sorted(task_graph.run().values()) == [0, 1]
+
+    def test_run_failure(self, graph):
+        """Test that a failed task stops the tasks which need it."""
+        graph.add("failed", lambda _: int("invalid"), JOINED)
+        joined = []
+        graph.add("after", joined.append, "failed")
+
+        with pytest.raises(ValueError, match="invalid"):
+            graph.run()
+        assert not joined
+
+    @pytest.mark.parametrize("needs", [(FIRST,), ("unknown",)])
+    def test_add_invalid(self, graph, needs):
+        """Test adding a duplicate task or a task with unknown needs."""
+        with pytest.raises(ValueError, match="Invalid"):
+            graph.add(needs[0], print, *needs)
+
+    def test_critical_path(self, graph):
+        """Test that the critical path goes through the slowest need."""
+        graph.run()
+        graph.tasks[SECOND].end = graph.tasks[FIRST].end - 1
+
+        assert [task.name for task in graph.critical_path()] == [
+            FIRST, JOINED,
+        ]
+        assert "Critical path: first -> joined" in graph.summary()
@@ -0,0 +1,67 @@
+# SPDX-FileCopyrightText: 2025 CERN (home.cern)
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Tests for trie module."""
+
+import pytest
+
+from trie import RedirectTrie
+
+PROJECT = "https://example.com/project/:splat"
+UPLOADS = "https://example.com/:name/-/uploads/:splat"
+WIKI = "https://example.com/wiki"
+
+
+@pytest.fixture
+def trie():
+    """Return a trie with overlapping rules."""
+    return RedirectTrie.from_rules([
+        ("project/*", PROJECT),
+        ("project/:name/uploads/*", UPLOADS),
+        ("project/wiki", WIKI),
+    ])
+
+
+class TestRedirectTrie:
+    """Tests for RedirectTrie class."""
+
+    @pytest.mark.parametrize(("path", "expected"), [
+        ("/project/a/b", "https://example.com/project/a/b"),
+        ("project/a/uploads/b.pdf", "https://example.com/a/-/uploads/b.pdf"),
+        ("/project/wiki/", WIKI),
+        ("/project/wiki/uploads/x", "https://example.com/wiki/-/uploads/x"),
+        ("/other/a", None),
+        ("/project", None),
+    ])
+    def test_match(self, trie, path, expected):
+        """Test that literals win over placeholders and splats."""
+        assert trie.match(path) == expected
+
+    def test_backtracking(self):
+        """Test falling back when a literal branch does not match."""
+        trie = RedirectTrie.from_rules([
+            ("a/b/c", "https://example.com/c"),
+            ("a/:name/d", "https://example.com/:name"),
+        ])
+
+        assert trie.match("/a/b/d") == "https://example.com/b"
+
+    def test_rules_order(self, trie):
+        """Test that the most specific rules come first."""
+        assert [path for path, _ in trie.rules] == [
+            "/project/wiki",
+            "/project/:name/uploads/*",
+            "/project/*",
+        ]
+
+    @pytest.mark.parametrize(("pattern", "target", "message"), [
+        ("project/*", WIKI, "Duplicate rule"),
+        ("a/*/b", WIKI, "Splat not last"),
+        ("a/:1", WIKI, "Invalid placeholder ':1'"),
+        ("a/:name", "https://example.com/:other", "Unknown placeholders"),
+    ])
+    def test_add_invalid(self, trie, pattern, target, message):
+        """Test that invalid rules are rejected."""
+        with pytest.raises(ValueError, match=message):
+            trie.add(pattern, target)
@@ -8,6 +8,7 @@ from requests.exceptions import RequestException
 from pydantic import BaseModel, ValidationError
 from url import (
     StrictUrl,
+    Url,
     UrlContent,
     GitLabWikiPage,
     GenericUrlContent,
@@ -22,8 +23,8 @@ GITLAB_DOMAIN = "gitlab.com"
 PAGE_NAME = "page"
 PROJECT_NAME = "project"
 CONTENT_TEXT = "content"
-REQUESTS_HEAD = "requests.head"
-REQUESTS_GET = "requests.get"
+REQUESTS_HEAD = "requests.Session.head"
+REQUESTS_GET = "requests.Session.get"
 RE_SEARCH = "re.search"
 
 
@@ -52,6 +53,20 @@ class TestStrictUrl:
         with pytest.raises(ValueError):
             StrictUrl._validate("http://invalid.com")
 
+    def test_url_head_cached(self, mocker):
+        mock_head = mocker.patch(REQUESTS_HEAD)
+
+        StrictUrl._validate(EXAMPLE_URL)
+        StrictUrl._validate(EXAMPLE_URL)
+        StrictUrl._validate(EXAMPLE_ORG_URL)
+        assert mock_head.call_count == 2
+
+    def test_url_etag(self, mocker):
+        mock_response = mocker.Mock(headers={"ETag": '"etag"'})
+        mocker.patch(REQUESTS_HEAD, return_value=mock_response)
+
+        assert StrictUrl(EXAMPLE_URL).etag() == '"etag"'
+
     def test_url_serialization(self):
         url_obj = StrictUrl(EXAMPLE_URL)
         assert StrictUrl._serialize(url_obj) == EXAMPLE_URL
@@ -71,6 +86,24 @@ class TestStrictUrl:
             StrictUrl._get("http://invalid.com")
 
 
+class TestSessions:
+    """Test the sessions shared by the requests."""
+
+    def test_sessions(self):
+        """Test that a session in use by a request is not shared."""
+        StrictUrl._get(EXAMPLE_URL)
+        busy = Url.sessions.pop()
+        StrictUrl._get(EXAMPLE_URL)
+
+        assert Url.sessions
+        assert Url.sessions[0] is not busy
+
+        Url.sessions.append(busy)
+        StrictUrl._get(EXAMPLE_URL)
+
+        assert len(Url.sessions) == 2
+
+
 class TestUrlContent:
     """Test the UrlContent abstract class and its implementations."""
 